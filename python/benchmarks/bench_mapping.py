@@ -0,0 +1,49 @@
+"""Compare per-item Company mapping + model_dump() with the bulk mapper on a 5000-row page.
+
+cd python
+GBIZINFO_API_TOKEN=dummy uv run python benchmarks/bench_mapping.py
+"""
+
+from __future__ import annotations
+
+import timeit
+from typing import Any, Dict, List
+
+from gbizinfo_mcp.services.adapters.gbizinfo_adapter import (
+    companies_to_dicts,
+    map_api_companies_to_domain,
+    map_api_company_to_domain,
+)
+
+
+def synthetic_page(n: int = 5000) -> List[Dict[str, Any]]:
+    return [
+        {
+            "corporate_number": f"{i:013d}",
+            "name": f"サンプル{i}株式会社",
+            "location": "東京都千代田区丸の内1-1-1",
+            "postal_code": "1000005",
+            "update_date": "2024-01-01T00:00:00+09:00",
+        }
+        for i in range(n)
+    ]
+
+
+def per_item(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [map_api_company_to_domain(i).model_dump() for i in items]
+
+
+def bulk(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return companies_to_dicts(map_api_companies_to_domain(items))
+
+
+def main() -> None:
+    items = synthetic_page()
+    assert per_item(items) == bulk(items)
+    for label, fn in (("per-item", per_item), ("bulk", bulk)):
+        best = min(timeit.repeat(lambda fn=fn: fn(items), number=5, repeat=5)) / 5
+        print(f"{label:>8}: {best * 1000:8.2f} ms / {len(items)} items")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Measure MCP server cold start: module import plus the first ``tools/list``.
+
+Each sample runs in a fresh interpreter, as MCP hosts spawn the server per session.
+
+    cd python
+    GBIZINFO_API_TOKEN=dummy uv run python benchmarks/bench_startup.py
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SAMPLES = 7
+
+_PROBE = """
+import asyncio, json, time
+t0 = time.perf_counter()
+from gbizinfo_mcp.mcp_fastmcp import mcp
+t1 = time.perf_counter()
+tools = asyncio.run(mcp.list_tools())
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "tools_list": t2 - t1, "tools": len(tools)}))
+"""
+
+
+def sample() -> dict:
+    env = {"GBIZINFO_API_TOKEN": "dummy", **os.environ}
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    runs = [sample() for _ in range(SAMPLES)]
+    for key in ("import", "tools_list"):
+        median = statistics.median(r[key] for r in runs)
+        print(f"{key:>10}: {median * 1000:8.1f} ms (median of {SAMPLES})")
+    total = statistics.median(r["import"] + r["tools_list"] for r in runs)
+    print(f"{'total':>10}: {total * 1000:8.1f} ms, {runs[0]['tools']} tools")
+
+
+if __name__ == "__main__":
+    main()
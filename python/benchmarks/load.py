@@ -0,0 +1,293 @@
+"""Drive ``GBizInfoService`` or the MCP tools at a target request rate and report latency.
+
+    cd python
+    uv run python benchmarks/load.py --target service --qps 50 --duration 30
+    uv run python benchmarks/load.py --target mcp --qps 20 --latency lognormal:80,0.5 \\
+        --error-rate 0.02 --mix basic=4,finance=2,search=1
+    uv run python benchmarks/load.py --base-url http://127.0.0.1:8089/hojin/v1/hojin ...
+
+Without ``--base-url`` a ``stub_server`` runs in-process and takes the same
+latency / error / corpus options. Arrivals are open-loop: request ``i`` is
+due at ``i / qps`` seconds whether or not earlier ones have finished, and
+its latency is measured from that due time, so a saturated client shows up
+as growing latency instead of a silently lower rate.
+
+The response caches are disabled unless ``RESPONSE_CACHE_MAX_ENTRIES`` /
+``SEARCH_CACHE_MAX_ENTRIES`` are set, so every call reaches the server;
+other settings (rate limit, retries, pool size) come from the environment.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from stub_server import add_stub_arguments, corporate_number, serve, stub_config
+
+OPERATIONS = (
+    "basic",
+    "certification",
+    "commendation",
+    "finance",
+    "patent",
+    "procurement",
+    "subsidy",
+    "workplace",
+    "search",
+    "update",
+)
+# operations without an MCP tool
+_SERVICE_ONLY = frozenset(("update",))
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """``basic=4,finance=2,search=1`` -> operation weights."""
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"unknown operation {name!r}; expected one of {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+@dataclass
+class Recorder:
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    pool: Dict[str, int] = field(default_factory=dict)  # client's connection pool at the end
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, operation: str, seconds: float, error: Optional[str]) -> None:
+        with self.lock:
+            self.latencies.setdefault(operation, []).append(seconds)
+            if error is not None:
+                errors = self.errors.setdefault(operation, {})
+                errors[error] = errors.get(error, 0) + 1
+
+    def report(self, wall_seconds: float) -> Dict[str, Any]:
+        def summary(values: List[float], errors: Dict[str, int]) -> Dict[str, Any]:
+            ordered = sorted(values)
+            return {
+                "requests": len(ordered),
+                "errors": dict(sorted(errors.items())),
+                "p50_ms": percentile(ordered, 50) * 1000,
+                "p95_ms": percentile(ordered, 95) * 1000,
+                "p99_ms": percentile(ordered, 99) * 1000,
+                "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+            }
+
+        all_errors: Dict[str, int] = {}
+        for errors in self.errors.values():
+            for name, n in errors.items():
+                all_errors[name] = all_errors.get(name, 0) + n
+        everything = [v for values in self.latencies.values() for v in values]
+        return {
+            "achieved_qps": len(everything) / wall_seconds if wall_seconds else 0.0,
+            "overall": summary(everything, all_errors),
+            "operations": {
+                name: summary(values, self.errors.get(name, {}))
+                for name, values in sorted(self.latencies.items())
+            },
+            "connection_pool": self.pool,
+        }
+
+
+def _error_label(exc: BaseException) -> str:
+    status = getattr(exc, "status_code", None)
+    return f"HTTP {status}" if status is not None else type(exc).__name__
+
+
+def _schedule(qps: float, duration: float, mix: Dict[str, float], seed: int) -> List[str]:
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    return rng.choices(names, weights, k=max(1, int(qps * duration)))
+
+
+def _service_calls(service: Any) -> Dict[str, Callable[[str, random.Random], Any]]:
+    def detail(getter: Callable[[str], Any]) -> Callable[[str, random.Random], Any]:
+        return lambda cn, _rng: getter(cn)
+
+    calls = {
+        name: detail(getattr(service, "get_basic_info" if name == "basic" else f"get_{name}"))
+        for name in OPERATIONS
+        if name not in ("search", "update")
+    }
+    calls["search"] = lambda _cn, rng: service.search_companies(
+        name=f"サンプル商事{rng.randint(1, 99)}", limit=100
+    )
+    calls["update"] = lambda _cn, rng: service.get_update_info(
+        from_="20240101", to="20240131", page=rng.randint(1, 3)
+    )
+    return calls
+
+
+def run_service(
+    ops: List[str], qps: float, concurrency: int, companies: int, seed: int
+) -> Tuple[Recorder, float]:
+    from gbizinfo_mcp.services.gbizinfo_service import GBizInfoService
+
+    service = GBizInfoService()
+    service.warm_up()  # HTTP_WARMUP_CONNECTIONS, like the server at startup
+    calls = _service_calls(service)
+    recorder = Recorder()
+    local = threading.local()
+
+    def job(operation: str, due: float, cn: str) -> None:
+        rng = getattr(local, "rng", None)
+        if rng is None:
+            rng = local.rng = random.Random(f"{seed}:{threading.get_ident()}")
+        error: Optional[str] = None
+        try:
+            calls[operation](cn, rng)
+        except Exception as exc:  # noqa: BLE001 (counted, not raised)
+            error = _error_label(exc)
+        recorder.record(operation, time.perf_counter() - due, error)
+
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for i, operation in enumerate(ops):
+            due = start + i / qps
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(job, operation, due, corporate_number(rng.randrange(companies)))
+    wall = time.perf_counter() - start
+    recorder.pool = service.metrics_snapshot()["connection_pool"]
+    return recorder, wall
+
+
+async def _run_mcp(
+    ops: List[str], qps: float, concurrency: int, companies: int, seed: int
+) -> Tuple[Recorder, float]:
+    from fastmcp import Client
+
+    from gbizinfo_mcp.mcp_fastmcp import get_service, mcp
+
+    recorder = Recorder()
+    rng = random.Random(seed)
+    limit = asyncio.Semaphore(concurrency)
+
+    def arguments(operation: str) -> Tuple[str, Dict[str, Any]]:
+        if operation == "search":
+            return "search", {"name": f"サンプル商事{rng.randint(1, 99)}", "limit": 100}
+        tool = "get_basic_info" if operation == "basic" else f"get_{operation}"
+        return tool, {"corporateNumber": corporate_number(rng.randrange(companies))}
+
+    async with Client(mcp) as client:
+
+        async def call(operation: str, due: float) -> None:
+            tool, args = arguments(operation)
+            error: Optional[str] = None
+            async with limit:
+                try:
+                    result = await client.call_tool(tool, args, raise_on_error=False)
+                    if result.is_error:
+                        error = "ToolError"
+                except Exception as exc:  # noqa: BLE001 (counted, not raised)
+                    error = _error_label(exc)
+            recorder.record(operation, time.perf_counter() - due, error)
+
+        tasks = []
+        start = time.perf_counter()
+        for i, operation in enumerate(ops):
+            due = start + i / qps
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(call(operation, due)))
+        await asyncio.gather(*tasks)
+        wall = time.perf_counter() - start
+        recorder.pool = get_service().metrics_snapshot()["connection_pool"]
+        return recorder, wall
+
+
+def _print_report(report: Dict[str, Any], target_qps: float) -> None:
+    print(f"target {target_qps:.1f} qps, achieved {report['achieved_qps']:.1f} qps")
+    header = (
+        f"{'operation':>14} {'requests':>9} {'errors':>7}"
+        f" {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    )
+    print(header)
+    rows = [*report["operations"].items(), ("overall", report["overall"])]
+    for name, s in rows:
+        print(
+            f"{name:>14} {s['requests']:>9} {sum(s['errors'].values()):>7} "
+            f"{s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f} {s['max_ms']:>9.1f}"
+        )
+    if report["overall"]["errors"]:
+        print("errors:", ", ".join(f"{k}: {v}" for k, v in report["overall"]["errors"].items()))
+    if report["connection_pool"]:
+        print("pool:", json.dumps(report["connection_pool"]))
+    if "upstream" in report:
+        print("stub:", json.dumps(report["upstream"]))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=("service", "mcp"), default="service")
+    parser.add_argument("--qps", type=float, default=20.0)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=64, help="max calls in flight")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("basic=4,finance=2,search=1"))
+    parser.add_argument("--base-url", help="use a running server instead of an in-process stub")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+    unsupported = _SERVICE_ONLY & set(args.mix) if args.target == "mcp" else set()
+    if unsupported:
+        parser.error(f"no MCP tool for: {', '.join(sorted(unsupported))}")
+
+    os.environ.setdefault("GBIZINFO_API_TOKEN", "dummy")
+    os.environ.setdefault("RESPONSE_CACHE_MAX_ENTRIES", "0")
+    os.environ.setdefault("SEARCH_CACHE_MAX_ENTRIES", "0")
+    ops = _schedule(args.qps, args.duration, args.mix, args.seed)
+    with ExitStack() as stack:
+        server = None
+        if args.base_url:
+            os.environ["GBIZINFO_BASE_URL"] = args.base_url
+        else:
+            server = stack.enter_context(serve(stub_config(args)))
+            os.environ["GBIZINFO_BASE_URL"] = server.base_url
+        run_args = (ops, args.qps, args.concurrency, args.companies, args.seed)
+        if args.target == "service":
+            recorder, wall = run_service(*run_args)
+        else:
+            recorder, wall = asyncio.run(_run_mcp(*run_args))
+        report = recorder.report(wall)
+        if server is not None:
+            stats = server.stub.stats
+            report["upstream"] = {
+                "requests": stats.requests,
+                "injected_errors": stats.injected_errors,
+                "by_status": {str(k): v for k, v in sorted(stats.by_status.items())},
+            }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report, args.qps)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
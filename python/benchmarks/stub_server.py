@@ -0,0 +1,482 @@
+"""A local stand-in for gBizINFO, generated from ``openapi/gbizinfo-openapi.json``.
+
+    cd python
+    uv run python benchmarks/stub_server.py --port 8089 --latency lognormal:80,0.5 \\
+        --error-rate 0.02 --error-status 429,503
+    GBIZINFO_BASE_URL=http://127.0.0.1:8089/hojin/v1/hojin uv run gbizinfo-mcp
+
+Every GET path in the spec is served: search (``/v1/hojin``), the detail
+endpoints (``/{corporate_number}`` and ``/{corporate_number}/<category>``) and
+``/updateInfo[/<category>]``. Bodies are synthesised from the response schemas,
+seeded by the corporate number so that repeated requests agree. Search pages
+through a corpus of ``--companies`` synthetic companies (``name`` and
+``corporate_number`` filter it, other conditions are accepted and ignored) and
+updateInfo pages through ``--update-count`` of them with ``pageNumber`` /
+``totalPage`` / ``totalCount``.
+
+Recorded responses win over synthetic ones: with ``--fixtures DIR`` the file
+``DIR/<path below /v1/hojin>.json`` (``DIR/search.json`` for the search
+endpoint, ``DIR/<key>.page<N>.json`` for a specific page) is returned as-is.
+
+``--latency`` is ``constant:MS``, ``uniform:LOW_MS,HIGH_MS`` or
+``lognormal:MEDIAN_MS,SIGMA``; ``--error-rate`` answers that fraction of the
+requests with one of ``--error-status`` (429 and 503 carry ``Retry-After``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import http.server
+import json
+import math
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_SPEC = Path(__file__).resolve().parents[2] / "openapi" / "gbizinfo-openapi.json"
+TOKEN_HEADER = "X-hojinInfo-api-token"
+
+_PATH_PARAM = re.compile(r"\{([^}]+)\}")
+_YMD = re.compile(r"^[0-9]{8}$")
+_CORPORATE_NUMBER = re.compile(r"^[0-9]{13}$")
+_RETRY_AFTER_STATUSES = frozenset((429, 503))
+
+
+def corporate_number(index: int) -> str:
+    """The ``index``-th synthetic corporate number, with a valid check digit."""
+    base = f"{index + 1:012d}"
+    # check digit: 9 - (sum of digits weighted 1, 2, 1, ... from the right) mod 9
+    total = sum(int(d) * (1 if i % 2 == 0 else 2) for i, d in enumerate(reversed(base)))
+    return f"{9 - total % 9}{base}"
+
+
+def company_name(index: int) -> str:
+    return f"サンプル{('商事', '工業', '製作所', '興産')[index % 4]}{index}株式会社"
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    kind: str = "constant"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> LatencyModel:
+        """``constant:MS``, ``uniform:LOW_MS,HIGH_MS`` or ``lognormal:MEDIAN_MS,SIGMA``."""
+        kind, _, args = spec.partition(":")
+        if not args and kind.replace(".", "", 1).isdigit():
+            kind, args = "constant", kind
+        values = [float(v) for v in args.split(",")] if args else []
+        expected = {"constant": 1, "uniform": 2, "lognormal": 2}.get(kind)
+        if expected is None or len(values) != expected:
+            raise ValueError(f"invalid latency spec: {spec!r}")
+        return cls(kind, *values)
+
+    def sample(self, rng: random.Random) -> float:
+        """One delay in seconds."""
+        if self.kind == "uniform":
+            ms = rng.uniform(self.a, self.b)
+        elif self.kind == "lognormal":
+            ms = rng.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+        else:
+            ms = self.a
+        return ms / 1000
+
+
+@dataclass
+class StubConfig:
+    spec_path: Path = DEFAULT_SPEC
+    companies: int = 10_000
+    update_count: int = 2_500
+    update_page_size: int = 1_000
+    array_items: int = 3
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (429, 500, 503)
+    retry_after: int = 1
+    fixtures: Optional[Path] = None
+    require_token: bool = True
+    seed: int = 0
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    injected_errors: int = 0
+    by_status: Dict[int, int] = field(default_factory=dict)
+
+
+class SchemaFaker:
+    """Synthetic JSON values for the component schemas of an OpenAPI document."""
+
+    def __init__(self, spec: Dict[str, Any], *, array_items: int = 3) -> None:
+        self._schemas: Dict[str, Any] = spec.get("components", {}).get("schemas", {})
+        self._array_items = array_items
+
+    def resolve(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        ref = schema.get("$ref")
+        return self._schemas[ref.rsplit("/", 1)[-1]] if ref else schema
+
+    def value(self, schema: Dict[str, Any], rng: random.Random, name: str = "") -> Any:
+        schema = self.resolve(schema)
+        kind = schema.get("type", "object" if "properties" in schema else "string")
+        if kind == "object":
+            props = schema.get("properties")
+            if props is None:
+                extra = schema.get("additionalProperties") or {"type": "string"}
+                return {f"{name}_{i}": self.value(extra, rng, name) for i in range(2)}
+            return {k: self.value(v, rng, k) for k, v in props.items()}
+        if kind == "array":
+            count = rng.randint(0, self._array_items)
+            return [self.value(schema.get("items", {}), rng, name) for _ in range(count)]
+        if kind == "integer":
+            if schema.get("format") == "int32" or name.endswith("year"):
+                return rng.randint(1900, 2024)
+            if "employee" in name or "size" in name or name.startswith("number"):
+                return rng.randint(0, 5_000)
+            return rng.randint(0, 10**10)
+        if kind == "number":
+            return round(rng.uniform(0, 100), 1)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        return self._string(schema, rng, name)
+
+    @staticmethod
+    def _string(schema: Dict[str, Any], rng: random.Random, name: str) -> str:
+        pattern = schema.get("pattern", "")
+        if r"\d{7}" in pattern:
+            return f"{rng.randint(0, 9_999_999):07d}"
+        if r"\d{13}" in pattern:
+            return corporate_number(rng.randint(0, 10**9))
+        if "ァ-ヶ" in pattern:
+            return "サンプル"
+        if "date" in name:
+            return f"{rng.randint(1990, 2024)}-{rng.randint(1, 12):02d}-01T00:00:00+09:00"
+        if "url" in name:
+            return f"https://example.com/{rng.randint(0, 9999)}"
+        if "a-zA-Z" in pattern:
+            return f"Sample {rng.randint(0, 9999)} Co., Ltd."
+        return f"{schema.get('description') or name}{rng.randint(0, 999)}"
+
+
+class _Route:
+    __slots__ = ("pattern", "kind", "category", "schema")
+
+    def __init__(self, path: str, schema: Dict[str, Any]) -> None:
+        self.pattern = re.compile("^" + _PATH_PARAM.sub(r"(?P<\1>[^/]+)", path) + "$")
+        segments = [s for s in path.split("/") if s][2:]  # drop "v1", "hojin"
+        if not segments:
+            self.kind, self.category = "search", None
+        elif segments[0] == "updateInfo":
+            self.kind, self.category = "update", (segments[1] if len(segments) > 1 else None)
+        else:
+            self.kind, self.category = "detail", (segments[1] if len(segments) > 1 else None)
+        self.schema = schema
+
+
+class GBizInfoStub:
+    """Routes and synthetic responses; transport independent so it can also be called directly."""
+
+    def __init__(self, config: StubConfig) -> None:
+        self.config = config
+        spec = json.loads(config.spec_path.read_text(encoding="utf-8"))
+        self.base_path = (spec.get("servers") or [{"url": ""}])[0]["url"].rstrip("/")
+        self._faker = SchemaFaker(spec, array_items=config.array_items)
+        self._routes: List[_Route] = []
+        for path, item in spec["paths"].items():
+            get = item.get("get")
+            if get is None:
+                continue
+            content = get["responses"]["200"]["content"]
+            schema = next(iter(content.values()))["schema"]
+            self._routes.append(_Route(path, self._faker.resolve(schema)))
+        # literal segments (updateInfo) before {corporate_number}
+        self._routes.sort(key=lambda r: r.pattern.pattern.count("(?P<"))
+        hojin = self._faker.resolve(self._routes[0].schema["properties"]["hojin-infos"]["items"])
+        self._hojin_properties: Dict[str, Any] = hojin["properties"]
+        self._basic_fields = [
+            name
+            for name, prop in self._hojin_properties.items()
+            if name not in self._category_fields()
+        ]
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.stats = StubStats()
+
+    def _category_fields(self) -> List[str]:
+        categories = {r.category for r in self._routes if r.category}
+        return [self._category_field(c) for c in categories]
+
+    def _category_field(self, category: str) -> str:
+        # /{corporate_number}/workplace -> workplace_info
+        return category if category in self._hojin_properties else f"{category}_info"
+
+    @functools.lru_cache(maxsize=65_536)  # noqa: B019 (one stub per process)
+    def _basic(self, number: str) -> Dict[str, Any]:
+        rng = random.Random(f"{self.config.seed}:{number}")
+        props = self._hojin_properties
+        info = {k: self._faker.value(props[k], rng, k) for k in self._basic_fields}
+        info["corporate_number"] = number
+        info["name"] = company_name(int(number[1:]) - 1)
+        return info
+
+    def basic(self, number: str) -> Dict[str, Any]:
+        """The basic ``HojinInfo`` fields of ``number`` (a fresh dict)."""
+        return dict(self._basic(number))
+
+    @functools.lru_cache(maxsize=65_536)  # noqa: B019 (one stub per process)
+    def category(self, number: str, field_name: str) -> Any:
+        """The synthetic value of one category field (``finance``, ``patent``, ...)."""
+        rng = random.Random(f"{self.config.seed}:{number}:{field_name}")
+        return self._faker.value(self._hojin_properties[field_name], rng, field_name)
+
+    def match(self, path: str) -> Tuple[Optional[_Route], Dict[str, str]]:
+        for route in self._routes:
+            m = route.pattern.match(path)
+            if m:
+                return route, m.groupdict()
+        return None, {}
+
+    def handle(
+        self, method: str, target: str, headers: Dict[str, str]
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Answer one request: ``(status, headers, body)``."""
+        status, extra, body = self._handle(method, target, headers)
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.by_status[status] = self.stats.by_status.get(status, 0) + 1
+        return status, extra, body
+
+    def _handle(
+        self, method: str, target: str, headers: Dict[str, str]
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        url = urlsplit(target)
+        path = url.path
+        if self.base_path and path.startswith(self.base_path):
+            path = path[len(self.base_path) :]
+        route, params = self.match(path.rstrip("/") or "/")
+        if route is None:
+            return _error(404, "Not Found")
+        if method != "GET":
+            return _error(405, "Method Not Allowed")
+        if self.config.require_token and not headers.get(TOKEN_HEADER.lower()):
+            return _error(401, "Unauthorized")
+        with self._lock:
+            inject = self._rng.random() < self.config.error_rate
+            status = self._rng.choice(self.config.error_statuses) if inject else 200
+            if inject:
+                self.stats.injected_errors += 1
+        if inject:
+            status, extra, body = _error(status, "injected error")
+            if status in _RETRY_AFTER_STATUSES:
+                extra["Retry-After"] = str(self.config.retry_after)
+            return status, extra, body
+        return self._render(
+            route.kind, route.category, path, url.query, params.get("corporate_number")
+        )
+
+    @functools.lru_cache(maxsize=4_096)  # noqa: B019 (one stub per process)
+    def _render(
+        self,
+        kind: str,
+        category: Optional[str],
+        path: str,
+        query: str,
+        number: Optional[str],
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        args = {k: v[-1] for k, v in parse_qs(query).items()}
+        try:
+            page = int(args.get("page") or 1)
+        except ValueError:
+            return _error(400, "page must be a positive integer")
+        if page < 1:
+            return _error(400, "page must be a positive integer")
+        fixture = self._fixture(path, page)
+        if fixture is not None:
+            return 200, {}, fixture
+        if kind == "detail":
+            if number is None or not _CORPORATE_NUMBER.match(number):
+                return _error(400, "corporate_number must be 13 digits")
+            info = self.basic(number)
+            if category is not None:
+                field_name = self._category_field(category)
+                info[field_name] = self.category(number, field_name)
+            return _json(200, {"hojin-infos": [info], "id": "stub", "message": "200 - OK."})
+        if kind == "update":
+            if not _YMD.match(args.get("from", "")) or not _YMD.match(args.get("to", "")):
+                return _error(400, "from and to must be yyyyMMdd")
+            size = self.config.update_page_size
+            total = self.config.update_count
+            pages = max(1, -(-total // size))
+            indexes = range((page - 1) * size, min(page * size, total))
+            items = [self.basic(corporate_number(i % self.config.companies)) for i in indexes]
+            if category is not None:
+                field_name = self._category_field(category)
+                for item in items:
+                    item[field_name] = self.category(item["corporate_number"], field_name)
+            return _json(
+                200,
+                {
+                    "hojin-infos": items,
+                    "id": "stub",
+                    "message": "200 - OK.",
+                    "pageNumber": str(page),
+                    "totalCount": str(total),
+                    "totalPage": str(pages),
+                },
+            )
+        try:
+            limit = int(args.get("limit") or 1000)
+        except ValueError:
+            return _error(400, "limit must be an integer")
+        numbers = self._search(args.get("name"), args.get("corporate_number"))
+        chosen = numbers[(page - 1) * limit : page * limit]
+        return _json(
+            200,
+            {"hojin-infos": [self.basic(n) for n in chosen], "id": "stub", "message": "200 - OK."},
+        )
+
+    def _search(self, name: Optional[str], number: Optional[str]) -> List[str]:
+        if number:
+            index = int(number[1:]) - 1 if _CORPORATE_NUMBER.match(number) else -1
+            return [number] if 0 <= index < self.config.companies else []
+        indexes = range(self.config.companies)
+        return [corporate_number(i) for i in indexes if not name or name in company_name(i)]
+
+    def _fixture(self, path: str, page: int) -> Optional[bytes]:
+        root = self.config.fixtures
+        if root is None:
+            return None
+        key = path.strip("/").replace("v1/hojin", "", 1).strip("/") or "search"
+        for name in (f"{key}.page{page}.json", f"{key}.json") if page > 1 else (f"{key}.json",):
+            candidate = root / name
+            if candidate.is_file():
+                return candidate.read_bytes()
+        return None
+
+
+def _json(status: int, payload: Any) -> Tuple[int, Dict[str, str], bytes]:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return status, {"Content-Type": "application/json;charset=UTF-8"}, body
+
+
+def _error(status: int, message: str) -> Tuple[int, Dict[str, str], bytes]:
+    return _json(status, {"errors": [], "id": "stub", "message": f"{status} - {message}"})
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    stub: GBizInfoStub
+
+    def _respond(self) -> None:
+        stub = self.stub
+        if self.command != "GET":
+            # drain a request body so the connection stays usable
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        started = time.perf_counter()
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        status, extra, body = stub.handle(self.command, self.path, headers)
+        delay = stub.config.latency.sample(stub._rng) - (time.perf_counter() - started)  # noqa: SLF001
+        if delay > 0:
+            time.sleep(delay)
+        self.send_response(status)
+        for name, value in extra.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = _respond  # noqa: N815
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class StubServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, stub: GBizInfoStub, host: str = "127.0.0.1", port: int = 0) -> None:
+        handler = type("Handler", (_Handler,), {"stub": stub})
+        super().__init__((host, port), handler)
+        self.stub = stub
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{self.stub.base_path}/v1/hojin"
+
+
+@contextmanager
+def serve(config: Optional[StubConfig] = None, *, port: int = 0) -> Iterator[StubServer]:
+    """Run a stub in a background thread; ``server.base_url`` is the ``GBIZINFO_BASE_URL``."""
+    server = StubServer(GBizInfoStub(config or StubConfig()), port=port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--spec", type=Path, default=DEFAULT_SPEC)
+    parser.add_argument("--companies", type=int, default=10_000)
+    parser.add_argument("--update-count", type=int, default=2_500)
+    parser.add_argument("--update-page-size", type=int, default=1_000)
+    parser.add_argument("--array-items", type=int, default=3, help="max items per list field")
+    parser.add_argument("--latency", type=LatencyModel.parse, default=LatencyModel())
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--error-status",
+        type=lambda s: tuple(int(v) for v in s.split(",")),
+        default=(429, 500, 503),
+    )
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--fixtures", type=Path)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def stub_config(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(
+        spec_path=args.spec,
+        companies=args.companies,
+        update_count=args.update_count,
+        update_page_size=args.update_page_size,
+        array_items=args.array_items,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_statuses=args.error_status,
+        retry_after=args.retry_after,
+        fixtures=args.fixtures,
+        seed=args.seed,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+    server = StubServer(GBizInfoStub(stub_config(args)), host=args.host, port=args.port)
+    print(f"GBIZINFO_BASE_URL={server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
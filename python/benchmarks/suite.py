@@ -0,0 +1,239 @@
+"""Micro-benchmarks for the hot paths, with a JSON baseline to catch regressions.
+
+    cd python
+    GBIZINFO_API_TOKEN=dummy uv run python benchmarks/suite.py                      # print results
+    GBIZINFO_API_TOKEN=dummy uv run python benchmarks/suite.py --save benchmarks/baseline.json
+    GBIZINFO_API_TOKEN=dummy uv run python benchmarks/suite.py --compare benchmarks/baseline.json
+
+``--compare`` exits with status 1 when a case is slower than the baseline by
+more than ``--tolerance`` (default 0.25, i.e. 25 %); cases that look slower are
+re-run once before failing. Baselines are machine specific: re-save one on the
+machine that runs the gate.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.server
+import json
+import os
+import statistics
+import sys
+import threading
+import timeit
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+os.environ.setdefault("GBIZINFO_API_TOKEN", "dummy")
+# keep the stub case about the client itself, not about the caches / limiter
+os.environ.setdefault("REQUEST_COALESCING", "false")
+os.environ.pop("RATE_LIMIT_PER_SEC", None)
+
+from bench_mapping import synthetic_page  # noqa: E402
+
+from gbizinfo_mcp.model.hojin_info import HojinInfoResponse  # noqa: E402
+from gbizinfo_mcp.model.lazy_hojin_info import LazyHojinInfoResponse  # noqa: E402
+from gbizinfo_mcp.model.search import CompanySearchQuery  # noqa: E402
+from gbizinfo_mcp.services.adapters.gbizinfo_adapter import (  # noqa: E402
+    map_api_companies_to_domain,
+    map_api_company_to_domain,
+)
+from gbizinfo_mcp.services.gbizinfo_service import (  # noqa: E402
+    GBizInfoService,
+    build_search_params,
+    canonical_search_query,
+)
+from gbizinfo_mcp.services.http import HttpClient  # noqa: E402
+from gbizinfo_mcp.utils.preflight import check_search  # noqa: E402
+
+SEARCH_PARAMS: Dict[str, Any] = {
+    "name": "サンプル",
+    "corporate_type": "301,302,305",
+    "prefecture": "13",
+    "business_item": "101,206,301",
+    "unified_qualification": "A,B",
+    "capital_stock_from": 10_000_000,
+    "capital_stock_to": 1_000_000_000,
+    "employee_number_from": 10,
+    "establishment_from": "2000-01-01",
+    "page": 2,
+    "limit": 1000,
+}
+
+
+def large_hojin_payload(n: int = 2000) -> Dict[str, Any]:
+    """One company with ``n`` patents, ``n`` procurements and 10 years of finance."""
+    return {
+        "hojin-infos": [
+            {
+                "corporate_number": "1234567890123",
+                "name": "サンプル株式会社",
+                "location": "東京都千代田区丸の内1-1-1",
+                "capital_stock": 100_000_000,
+                "employee_number": 1200,
+                "patent": [
+                    {
+                        "application_number": f"2020-{i:06d}",
+                        "application_date": "2020-04-01",
+                        "patent_type": "特許",
+                        "title": f"発明{i}",
+                        "classifications": [{"code_value": "G06F", "code_name": "電気的デジタル"}],
+                    }
+                    for i in range(n)
+                ],
+                "procurement": [
+                    {
+                        "amount": 1_000_000 + i,
+                        "date_of_order": "2021-06-01",
+                        "government_departments": "経済産業省",
+                        "title": f"調達{i}",
+                    }
+                    for i in range(n)
+                ],
+                "finance": {
+                    "accounting_standards": "日本基準",
+                    "management_index": [
+                        {
+                            "period": f"{2014 + y}",
+                            "net_sales_summary_of_business_results": 1_000_000_000 + y,
+                            "total_assets_summary_of_business_results": 5_000_000_000,
+                        }
+                        for y in range(10)
+                    ],
+                },
+            }
+        ]
+    }
+
+
+class _StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True  # otherwise delayed ACKs dominate the timing
+    body = b""
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@contextmanager
+def local_stub(payload: Any) -> Iterator[str]:
+    """Serve ``payload`` for every GET on a loopback port; yields the base URL."""
+    handler = type("Handler", (_StubHandler,), {"body": json.dumps(payload).encode("utf-8")})
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/hojin/v1/hojin"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+Case = Tuple[str, Callable[[], Any], int]
+
+
+def cases(stub_url: str) -> List[Case]:
+    page = synthetic_page(5000)
+    hojin = large_hojin_payload()
+    service = GBizInfoService(http_client=HttpClient())
+    client = HttpClient()
+    detail_url = f"{stub_url}/1234567890123"
+
+    def search_url() -> str:
+        query = CompanySearchQuery(**SEARCH_PARAMS).model_dump(exclude_none=True)
+        page_no, limit = query.pop("page"), query.pop("limit")
+        key = canonical_search_query(build_search_params(query, page=page_no, limit=limit))
+        return service._build_search_url(key)  # noqa: SLF001
+
+    # (name, callable, calls per timing)
+    return [
+        ("search_query_validation", lambda: CompanySearchQuery(**SEARCH_PARAMS), 2000),
+        ("search_preflight", lambda: check_search(SEARCH_PARAMS), 2000),
+        ("search_url_build", search_url, 1000),
+        ("map_per_item_5000", lambda: [map_api_company_to_domain(i) for i in page], 10),
+        ("map_bulk_5000", lambda: map_api_companies_to_domain(page), 10),
+        ("hojin_validate_large", lambda: HojinInfoResponse.model_validate(hojin), 10),
+        ("hojin_lazy_first_access", lambda: LazyHojinInfoResponse(hojin).hojin_infos[0].name, 1000),
+        ("http_request_stub", lambda: client.request(detail_url), 200),
+    ]
+
+
+def run(repeat: int = 7, only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    with local_stub(large_hojin_payload(50)) as stub_url:
+        for name, fn, number in cases(stub_url):
+            if only and name not in only:
+                continue
+            fn()  # warm up caches, adapters and connections
+            times = [t / number for t in timeit.repeat(fn, number=number, repeat=repeat)]
+            results[name] = {
+                "min_ms": min(times) * 1000,
+                "median_ms": statistics.median(times) * 1000,
+            }
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float
+) -> List[str]:
+    """Names of the cases whose best time regressed beyond ``tolerance``."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = result["min_ms"] / base["min_ms"] if base["min_ms"] else 1.0
+        flag = "REGRESSION" if ratio > 1 + tolerance else "ok"
+        print(
+            f"{name:>26}: {result['min_ms']:10.4f} ms vs {base['min_ms']:10.4f} ms"
+            f" ({ratio:5.2f}x) {flag}"
+        )
+        if flag != "ok":
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--only", nargs="*", help="run only these cases")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run(repeat=args.repeat, only=args.only)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            # a busy machine slows whole runs down; confirm before failing the gate
+            print(f"re-running {', '.join(regressions)}")
+            for name, result in run(repeat=args.repeat, only=regressions).items():
+                if result["min_ms"] < results[name]["min_ms"]:
+                    results[name] = result
+            regressions = compare({n: results[n] for n in regressions}, baseline, args.tolerance)
+        if regressions:
+            print(
+                f"slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}"
+            )
+            return 1
+        return 0
+    print(json.dumps(results, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import threading
+from typing import Any, Dict, Literal, cast
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -15,9 +18,101 @@ class Settings(BaseSettings):
     request_timeout_seconds: float = Field(default=10.0, alias="REQUEST_TIMEOUT_SECONDS")
     connect_timeout_seconds: float = Field(default=3.0, alias="CONNECT_TIMEOUT_SECONDS")
     retries: int = Field(default=1, alias="HTTP_RETRIES")
+    # retries wait a random time up to backoff * 2^(attempt-1), capped at the max
+    retry_backoff_seconds: float = Field(default=0.5, alias="HTTP_RETRY_BACKOFF_SECONDS")
+    retry_backoff_max_seconds: float = Field(default=8.0, alias="HTTP_RETRY_BACKOFF_MAX_SECONDS")
+    # a 429/503 whose Retry-After is longer than this is returned instead of retried
+    retry_after_max_seconds: float = Field(default=30.0, alias="HTTP_RETRY_AFTER_MAX_SECONDS")
+    # consecutive failures (5xx / connection errors) that open an endpoint's breaker; 0 disables
+    circuit_breaker_threshold: int = Field(default=5, alias="CIRCUIT_BREAKER_THRESHOLD")
+    circuit_breaker_reset_seconds: float = Field(
+        default=30.0, alias="CIRCUIT_BREAKER_RESET_SECONDS"
+    )
+    # hedged GETs: race a second request when the first is slower than the endpoint's
+    # recent percentile; the initial delay applies until enough latencies are known
+    hedge_requests: bool = Field(default=False, alias="HEDGE_REQUESTS")
+    hedge_percentile: float = Field(default=95.0, alias="HEDGE_PERCENTILE")
+    hedge_initial_delay_seconds: float = Field(default=1.0, alias="HEDGE_INITIAL_DELAY_SECONDS")
+    hedge_min_delay_seconds: float = Field(default=0.05, alias="HEDGE_MIN_DELAY_SECONDS")
+    # hedges allowed per primary request (0.05 = at most 5 % extra upstream requests)
+    hedge_budget_ratio: float = Field(default=0.05, alias="HEDGE_BUDGET_RATIO")
     user_agent: str = Field(default="gbizinfo-mcp/0.1 (+https://info.gbiz.go.jp/)")
     debug_http: bool = Field(default=False, alias="DEBUG_HTTP")
     rate_limit_per_sec: float | None = Field(default=None, alias="RATE_LIMIT_PER_SEC")
+    # token bucket size; defaults to 1 (no bursts)
+    rate_limit_burst: float | None = Field(default=None, alias="RATE_LIMIT_BURST")
+    # "file" shares one budget between all processes on the host, "process" does not
+    rate_limit_backend: Literal["file", "process"] = Field(
+        default="file", alias="RATE_LIMIT_BACKEND"
+    )
+    rate_limit_state_path: str | None = Field(default=None, alias="RATE_LIMIT_STATE_PATH")
+    # bulk corporate-number lookups
+    bulk_max_workers: int = Field(default=8, alias="BULK_MAX_WORKERS")
+    bulk_max_items: int = Field(default=5000, alias="BULK_MAX_ITEMS")
+    # exhaustive searches: concurrent sub-search requests and the tool's item cap
+    exhaustive_search_workers: int = Field(default=4, alias="EXHAUSTIVE_SEARCH_WORKERS")
+    exhaustive_search_max_items: int = Field(default=100_000, alias="EXHAUSTIVE_SEARCH_MAX_ITEMS")
+    # pages of an updateInfo range fetched ahead of the consumer
+    update_info_page_window: int = Field(default=4, alias="UPDATE_INFO_PAGE_WINDOW")
+    # share one upstream GET between concurrent identical requests
+    request_coalescing: bool = Field(default=True, alias="REQUEST_COALESCING")
+    # connection pool of the asyncio client
+    http_max_connections: int = Field(default=100, alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(default=20, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    # connection pool of the blocking client (also the number of hedge threads); a blocking
+    # pool makes callers wait for a free connection instead of opening one that is thrown
+    # away afterwards
+    http_pool_maxsize: int = Field(default=20, alias="HTTP_POOL_MAXSIZE")
+    http_pool_block: bool = Field(default=False, alias="HTTP_POOL_BLOCK")
+    # keep-alive connections idle longer than this are closed (both clients; 0 keeps them)
+    http_pool_idle_seconds: float = Field(default=30.0, alias="HTTP_POOL_IDLE_SECONDS")
+    # keep-alive connections opened to the API when the server starts
+    http_warmup_connections: int = Field(default=0, alias="HTTP_WARMUP_CONNECTIONS")
+
+    # in-memory response cache for the per-company detail endpoints
+    response_cache_max_entries: int = Field(default=1024, alias="RESPONSE_CACHE_MAX_ENTRIES")
+    response_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024, alias="RESPONSE_CACHE_MAX_BYTES"
+    )
+    response_cache_ttl_seconds: float = Field(default=3600.0, alias="RESPONSE_CACHE_TTL_SECONDS")
+    # per-endpoint TTL (JSON), keyed by sub path; "basic" is the basic-info endpoint
+    # e.g. {"basic": 86400, "finance": 21600}
+    response_cache_ttl_overrides: Dict[str, float] = Field(
+        default_factory=dict, alias="RESPONSE_CACHE_TTL_OVERRIDES"
+    )
+
+    # search results, keyed by the canonical query string
+    search_cache_max_entries: int = Field(default=256, alias="SEARCH_CACHE_MAX_ENTRIES")
+    search_cache_max_bytes: int = Field(default=32 * 1024 * 1024, alias="SEARCH_CACHE_MAX_BYTES")
+    search_cache_ttl_seconds: float = Field(default=300.0, alias="SEARCH_CACHE_TTL_SECONDS")
+
+    # detail lookups that found nothing (404 or empty "hojin-infos"), answered locally
+    # for a short while; 0 entries disables
+    negative_cache_max_entries: int = Field(default=4096, alias="NEGATIVE_CACHE_MAX_ENTRIES")
+    negative_cache_ttl_seconds: float = Field(default=300.0, alias="NEGATIVE_CACHE_TTL_SECONDS")
+
+    # search pages at least this large are decoded while streaming (0 disables)
+    stream_search_min_limit: int = Field(default=2000, alias="STREAM_SEARCH_MIN_LIMIT")
+
+    # detail tools return the validated models ("typed") or the API JSON as received ("raw")
+    detail_output: Literal["raw", "typed"] = Field(default="typed", alias="DETAIL_OUTPUT")
+
+    # optional on-disk (SQLite) store for raw detail / updateInfo payloads
+    disk_cache_path: str | None = Field(default=None, alias="DISK_CACHE_PATH")
+    disk_cache_max_bytes: int = Field(default=256 * 1024 * 1024, alias="DISK_CACHE_MAX_BYTES")
+    disk_cache_ttl_seconds: float = Field(default=86400.0, alias="DISK_CACHE_TTL_SECONDS")
+
+    # local mirror of watched companies, kept fresh by the updateInfo sync engine
+    mirror_path: str | None = Field(default=None, alias="MIRROR_PATH")
+    # how far back the first sync of a feed looks when no start date is given
+    mirror_lookback_days: int = Field(default=7, alias="MIRROR_LOOKBACK_DAYS")
+    # where `search` is answered: the API, the mirror index, or the mirror when it can answer
+    # fully (see mirror_complete) and the API otherwise
+    search_data_source: Literal["local", "remote", "auto"] = Field(
+        default="remote", alias="SEARCH_DATA_SOURCE"
+    )
+    # the mirror holds every company searches target, so "auto" may answer any query locally
+    mirror_complete: bool = Field(default=False, alias="MIRROR_COMPLETE")
 
     class Config:
         populate_by_name = True
@@ -25,4 +120,36 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-settings = Settings()  # will validate at import time
+class _LazySettings:
+    """Stands in for ``Settings`` and builds it on first attribute access.
+
+    Keeps reading ``.env`` and validating the environment off the import path.
+    """
+
+    __slots__ = ("_lock", "_settings")
+
+    def __init__(self) -> None:
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "_settings", None)
+
+    def _load(self) -> Settings:
+        loaded = self._settings
+        if loaded is None:
+            with self._lock:
+                loaded = self._settings
+                if loaded is None:
+                    loaded = Settings()
+                    object.__setattr__(self, "_settings", loaded)
+        return loaded
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._load(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._load(), name)
+
+
+settings: Settings = cast(Settings, _LazySettings())  # validated on first use
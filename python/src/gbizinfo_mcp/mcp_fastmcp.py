@@ -1,17 +1,64 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, Annotated
+import asyncio
+import logging
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Annotated, Any, AsyncIterator, Dict, List, Literal, Optional, Type
 
-from fastmcp import FastMCP
-from pydantic import Field
+from fastmcp import Context, FastMCP
+from pydantic import BaseModel, Field
 
+from .config import settings
 from .errors import InputValidationError
-from .model.search import CompanySearchQuery
-from .services.gbizinfo_service import GBizInfoService
+from .services.cache import json_size
+from .utils.projection import FieldTree, ProjectionMetrics, check_fields, parse_fields, project
 from .utils.validation import validate_corporate_number
 
-mcp = FastMCP(name="gbizinfo-mcp")
-service = GBizInfoService()
+# Models and the HTTP stack are imported on first use: the server is spawned per
+# session, so they stay off the startup path (see benchmarks/bench_startup.py).
+if TYPE_CHECKING:
+    from starlette.requests import Request
+    from starlette.responses import Response
+
+    from .services.async_gbizinfo_service import AsyncGBizInfoService
+
+
+async def _warm_up() -> None:
+    try:
+        if settings.http_warmup_connections > 0:
+            opened = await get_service().warm_up()
+            logging.getLogger(__name__).info("warmed up %d API connections", opened)
+    except Exception:  # startup must not fail over an optimisation
+        logging.getLogger(__name__).warning("connection warm-up failed", exc_info=True)
+
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:  # noqa: ARG001
+    # opens HTTP_WARMUP_CONNECTIONS keep-alive connections without delaying startup
+    task = asyncio.create_task(_warm_up())
+    try:
+        yield {}
+    finally:
+        task.cancel()
+
+
+mcp = FastMCP(name="gbizinfo-mcp", lifespan=_lifespan)
+_service: Optional[AsyncGBizInfoService] = None
+# payload sizes before / after `fields` projection, measured on a sample of calls
+projection_metrics = ProjectionMetrics(json_size)
+
+# the `fields` parameter shared by the search and detail tools
+FieldsParam = Annotated[
+    Optional[List[str]],
+    Field(
+        description=(
+            "返す項目を絞り込みます（ドット区切りで入れ子も指定可。"
+            "get_company_profile では hojin_info に適用。"
+            "例: name, finance.management_index.net_sales_summary_of_business_results）"
+        )
+    ),
+]
 
 
 @mcp.tool(
@@ -20,7 +67,7 @@ service = GBizInfoService()
         "gBizINFO を複合条件で検索します（Swaggerの検索クエリを個別パラメータで受け付け）。"
     ),
 )
-def search(
+async def search(
     # NOTE: 以下のパラメータはCompanySearchQueryと同期する必要があります
     # 基本フィルタ
     name: Annotated[Optional[str], Field(description="企業名（部分一致）")] = None,
@@ -73,81 +120,341 @@ def search(
     # ページング
     page: Annotated[int, Field(description="開始位置(1始まり)", ge=1)] = 1,
     limit: Annotated[int, Field(description="取得件数", ge=1)] = 1000,
+    data_source: Annotated[
+        Optional[Literal["local", "remote", "auto"]],
+        Field(
+            description=(
+                "検索先。remote: gBizINFO API, local: ローカルミラーの索引（監視対象法人のみ。"
+                "ページ上限なし。結果は source=mirror）, auto: 法人番号の指定など"
+                "ミラーで完全に回答できる場合のみローカル、それ以外は API。省略時は設定値"
+            )
+        ),
+    ] = None,
+    exhaustive: Annotated[
+        Optional[bool],
+        Field(
+            description=(
+                "true の場合、10ページ上限を超える検索を条件分割で並行取得し、"
+                "重複を除いた全件を返します（page/limit/data_source は無視）"
+            )
+        ),
+    ] = None,
+    max_items: Annotated[
+        Optional[int], Field(description="exhaustive 時の最大件数（省略時は設定値）", ge=1)
+    ] = None,
+    fields: FieldsParam = None,
 ) -> Dict[str, Any]:
-    """gBizINFO を複合条件で検索します（Swaggerの検索クエリを個別パラメータで受け付け）。"""
     # パラメータをCompanySearchQueryで検証・正規化
     params = locals().copy()
+    from .model.company import Company
+    from .model.search import CompanySearchQuery
+    from .services.adapters.gbizinfo_adapter import companies_to_dicts
+
+    tree = _field_tree(params.pop("fields"), Company)
+    if exhaustive:
+        return await _search_exhaustive(
+            params, max_items or settings.exhaustive_search_max_items, tree
+        )
+    mode = data_source or settings.search_data_source
+    if mode != "remote":
+        # the 10-page cap only applies upstream
+        params["page"] = 1
     query = CompanySearchQuery(**params)
+    options = query.model_dump(exclude_none=True)
+    if mode != "remote":
+        options["page"] = page
     
-    page_result = service.search_companies(**query.model_dump(exclude_none=True))
+    if mode == "remote" and 0 < settings.stream_search_min_limit <= limit:
+        return await _search_streamed(options, tree)
+    page_result = await get_service().search_companies(data_source=data_source, **options)
     return {
-        "items": [i.model_dump() for i in page_result.items],
+        "items": _project_items(companies_to_dicts(page_result.items), tree),
         "total": page_result.total,
         "from": page_result.from_,
         "size": page_result.size,
+        "source": page_result.source,
+    }
+
+
+async def _search_streamed(options: Dict[str, Any], tree: FieldTree) -> Dict[str, Any]:
+    # large pages are decoded while they download instead of being buffered whole
+    stream = get_service().stream_search_companies(**options)
+    try:
+        items = [company.model_dump() async for company in stream]
+    finally:
+        await stream.aclose()
+    return {
+        "items": _project_items(items, tree),
+        "total": stream.total or len(items),
+        "from": options.get("page", 1),
+        "size": options.get("limit", 1000),
     }
 
 
+async def _search_exhaustive(
+    params: Dict[str, Any], max_items: int, tree: FieldTree
+) -> Dict[str, Any]:
+    from .model.search import CompanySearchQuery
+
+    query = CompanySearchQuery(**{**params, "page": 1})
+    options = query.model_dump(exclude_none=True, exclude={"page", "limit"})
+    items: List[Dict[str, Any]] = []
+    truncated = False
+    async with aclosing(get_service().iter_search_exhaustive(**options)) as companies:
+        async for company in companies:
+            if len(items) >= max_items:
+                truncated = True
+                break
+            items.append(company.model_dump())
+    return {
+        "items": _project_items(items, tree),
+        "total": len(items),
+        "from": 1,
+        "size": len(items),
+        "truncated": truncated,
+    }
+
+
+def get_service() -> AsyncGBizInfoService:
+    """The shared service, built on the first tool call rather than at import."""
+    global _service
+    if _service is None:
+        from .services.async_gbizinfo_service import AsyncGBizInfoService
+
+        _service = AsyncGBizInfoService()
+    return _service
+
+
 def _corporate_arg(arg: Optional[str]) -> str:
     if arg is None:
         raise InputValidationError("corporateNumber is required")
     return validate_corporate_number(arg)
 
 
+def _field_tree(fields: Optional[List[str]], model: Type[BaseModel]) -> FieldTree:
+    if not fields:
+        return {}
+    try:
+        tree = parse_fields(fields)
+        check_fields(model, tree)
+    except ValueError as e:
+        raise InputValidationError(str(e), field="fields") from e
+    return tree
+
+
+def _detail_fields(fields: Optional[List[str]]) -> FieldTree:
+    if not fields:
+        return {}
+    from .model.hojin_info import HojinInfo
+
+    return _field_tree(fields, HojinInfo)
+
+
+def _detail_output(res: Any, tree: Optional[FieldTree] = None) -> Any:
+    from .model.lazy_hojin_info import LazyHojinInfoResponse
+
+    # detail responses are validated lazily; only build the models when asked to
+    if not isinstance(res, LazyHojinInfoResponse):
+        return res
+    raw = settings.detail_output == "raw"
+    infos = res.hojin_infos
+    if not tree or infos is None:
+        return res.raw if raw else res.model().model_dump(by_alias=True)
+    if raw:
+        projected: Dict[str, Any] = {
+            **res.raw,
+            "hojin-infos": [project(info.raw, tree) for info in infos],
+        }
+    else:
+        errors = res.errors
+        projected = {
+            "errors": [e.model_dump() for e in errors] if errors is not None else None,
+            "hojin-infos": [info.dump(tree) for info in infos],
+            "id": res.id,
+            "message": res.message,
+        }
+    projection_metrics.record(res.raw, projected)
+    return projected
+
+
+def _project_items(items: List[Dict[str, Any]], tree: FieldTree) -> List[Dict[str, Any]]:
+    if not tree:
+        return items
+    projected = [project(item, tree) for item in items]
+    projection_metrics.record(items, projected)
+    return projected
+
+
 @mcp.tool(name="get_basic_info", description="法人番号で基本情報を取得します。")
-def get_basic_info(
-    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None  # noqa: N803
+async def get_basic_info(
+    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None,  # noqa: N803
+    fields: FieldsParam = None,
 ) -> Any:
-    return service.get_basic_info(_corporate_arg(corporateNumber))
+    tree = _detail_fields(fields)
+    return _detail_output(await get_service().get_basic_info(_corporate_arg(corporateNumber)), tree)
 
 
 @mcp.tool(name="get_certification", description="法人番号で届出・認定情報を取得します。")
-def get_certification(
-    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None  # noqa: N803
+async def get_certification(
+    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None,  # noqa: N803
+    fields: FieldsParam = None,
 ) -> Any:
-    return service.get_certification(_corporate_arg(corporateNumber))
+    tree = _detail_fields(fields)
+    return _detail_output(
+        await get_service().get_certification(_corporate_arg(corporateNumber)), tree
+    )
 
 
 @mcp.tool(name="get_commendation", description="法人番号で表彰情報を取得します。")
-def get_commendation(
-    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None  # noqa: N803
+async def get_commendation(
+    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None,  # noqa: N803
+    fields: FieldsParam = None,
 ) -> Any:
-    return service.get_commendation(_corporate_arg(corporateNumber))
+    tree = _detail_fields(fields)
+    return _detail_output(
+        await get_service().get_commendation(_corporate_arg(corporateNumber)), tree
+    )
 
 
 @mcp.tool(name="get_finance", description="法人番号で財務情報を取得します。")
-def get_finance(
-    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None  # noqa: N803
+async def get_finance(
+    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None,  # noqa: N803
+    fields: FieldsParam = None,
 ) -> Any:
-    return service.get_finance(_corporate_arg(corporateNumber))
+    tree = _detail_fields(fields)
+    return _detail_output(await get_service().get_finance(_corporate_arg(corporateNumber)), tree)
 
 
 @mcp.tool(name="get_patent", description="法人番号で特許情報を取得します。")
-def get_patent(
-    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None  # noqa: N803
+async def get_patent(
+    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None,  # noqa: N803
+    fields: FieldsParam = None,
 ) -> Any:
-    return service.get_patent(_corporate_arg(corporateNumber))
+    tree = _detail_fields(fields)
+    return _detail_output(await get_service().get_patent(_corporate_arg(corporateNumber)), tree)
 
 
 @mcp.tool(name="get_procurement", description="法人番号で調達情報を取得します。")
-def get_procurement(
-    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None  # noqa: N803
+async def get_procurement(
+    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None,  # noqa: N803
+    fields: FieldsParam = None,
 ) -> Any:
-    return service.get_procurement(_corporate_arg(corporateNumber))
+    tree = _detail_fields(fields)
+    return _detail_output(
+        await get_service().get_procurement(_corporate_arg(corporateNumber)), tree
+    )
 
 
 @mcp.tool(name="get_subsidy", description="法人番号で補助金情報を取得します。")
-def get_subsidy(
-    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None  # noqa: N803
+async def get_subsidy(
+    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None,  # noqa: N803
+    fields: FieldsParam = None,
 ) -> Any:
-    return service.get_subsidy(_corporate_arg(corporateNumber))
+    tree = _detail_fields(fields)
+    return _detail_output(await get_service().get_subsidy(_corporate_arg(corporateNumber)), tree)
 
 
 @mcp.tool(name="get_workplace", description="法人番号で職場情報を取得します。")
-def get_workplace(
-    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None  # noqa: N803
+async def get_workplace(
+    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None,  # noqa: N803
+    fields: FieldsParam = None,
+) -> Any:
+    tree = _detail_fields(fields)
+    return _detail_output(await get_service().get_workplace(_corporate_arg(corporateNumber)), tree)
+
+
+@mcp.tool(
+    name="get_company_profile",
+    description=(
+        "法人番号で基本情報・届出認定・表彰・財務・特許・調達・補助金・職場情報を"
+        "並行取得し、1件の法人情報にまとめて返します。取得に失敗した項目は errors に記録します。"
+    ),
+)
+async def get_company_profile(
+    corporateNumber: Annotated[Optional[str], Field(description="法人番号（13桁）")] = None,  # noqa: N803
+    fields: FieldsParam = None,
+) -> Any:
+    tree = _detail_fields(fields)
+    profile = await get_service().get_company_profile(_corporate_arg(corporateNumber))
+    if not tree:
+        return profile
+    full = profile.model_dump()
+    projected = {**full, "hojin_info": project(full["hojin_info"], tree)}
+    projection_metrics.record(full, projected)
+    return projected
+
+
+@mcp.tool(
+    name="get_basic_info_bulk",
+    description=(
+        "複数の法人番号の基本情報を並行して一括取得します。重複は除去し、"
+        "各法人番号の結果を取得完了順に status（ok / invalid / error）付きで返します。"
+    ),
+)
+async def get_basic_info_bulk(
+    corporateNumbers: Annotated[List[str], Field(description="法人番号（13桁）のリスト")],  # noqa: N803
+    concurrency: Annotated[
+        Optional[int], Field(description="同時リクエスト数（省略時は設定値）", ge=1)
+    ] = None,
+    fields: FieldsParam = None,
+    ctx: Optional[Context] = None,
+) -> Dict[str, Any]:
+    tree = _detail_fields(fields)
+    if len(corporateNumbers) > settings.bulk_max_items:
+        raise InputValidationError(
+            f"corporateNumbers must contain at most {settings.bulk_max_items} items",
+            field="corporateNumbers",
+        )
+    results: List[Dict[str, Any]] = []
+    async for result in get_service().iter_basic_info_bulk(
+        corporateNumbers, max_workers=concurrency
+    ):
+        result.data = _detail_output(result.data, tree)
+        results.append(result.model_dump(exclude_none=True))
+        if ctx is not None:
+            await ctx.report_progress(len(results))
+    return {"items": results, "total": len(results)}
+
+
+@mcp.tool(
+    name="get_metrics",
+    description=(
+        "管理用: 上流 API のエンドポイント別レイテンシ分布・ステータスコード・リトライ回数・"
+        "受信バイト数、レート制限の待ち時間、キャッシュのヒット率、"
+        "サーキットブレーカーの状態、接続プールの使用状況を返します。"
+        "output=prometheus で Prometheus テキスト形式になります。"
+    ),
+)
+async def get_metrics(
+    output: Annotated[
+        Literal["json", "prometheus"], Field(description="出力形式（json / prometheus）")
+    ] = "json",
 ) -> Any:
-    return service.get_workplace(_corporate_arg(corporateNumber))
+    snapshot = _metrics_snapshot()
+    if output == "prometheus":
+        from .services.metrics import prometheus_text
+
+        return prometheus_text(snapshot)
+    return snapshot
+
+
+@mcp.custom_route("/metrics", methods=["GET"], include_in_schema=False)
+async def metrics_endpoint(request: Request) -> Response:  # noqa: ARG001
+    # Prometheus scrape target when the server runs over HTTP
+    from starlette.responses import PlainTextResponse
+
+    from .services.metrics import prometheus_text
+
+    return PlainTextResponse(
+        prometheus_text(_metrics_snapshot()), media_type="text/plain; version=0.0.4"
+    )
+
+
+def _metrics_snapshot() -> Dict[str, Any]:
+    snapshot = get_service().metrics_snapshot()
+    projection = projection_metrics.stats()
+    snapshot["projection"] = {**asdict(projection), "bytes_saved": projection.bytes_saved}
+    return snapshot
 
 
 def main() -> None:
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict
+from typing import List, Optional
+
+from .config import settings
+from .services.gbizinfo_service import GBizInfoService
+from .services.mirror import MirrorStore, MirrorSync
+from .utils.validation import validate_corporate_number, validate_yyyymmdd
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Console-script entrypoint: update the local mirror from the updateInfo feeds."""
+    parser = argparse.ArgumentParser(
+        prog="gbizinfo-mirror-sync",
+        description="gBizINFO の期間内更新情報をもとにローカルミラーを差分同期します。",
+    )
+    parser.add_argument("--path", default=settings.mirror_path, help="ミラーの SQLite ファイル")
+    parser.add_argument("--watch", nargs="*", default=[], help="追加で監視する法人番号")
+    parser.add_argument("--unwatch", nargs="*", default=[], help="監視をやめる法人番号")
+    parser.add_argument("--start", help="初回同期の開始日（yyyyMMdd）")
+    parser.add_argument("--reindex", action="store_true", help="検索用索引を再構築して終了")
+    args = parser.parse_args(argv)
+    if not args.path:
+        parser.error("--path or MIRROR_PATH is required")
+
+    store = MirrorStore(args.path)
+    service = GBizInfoService(mirror=store)
+    sync = MirrorSync(service, store)
+    try:
+        if args.reindex:
+            print(json.dumps({"reindexed": store.reindex()}))
+            return
+        store.unwatch(validate_corporate_number(n) for n in args.unwatch)
+        if args.watch:
+            seeded = sync.seed([validate_corporate_number(n) for n in args.watch])
+            print(json.dumps({"seed": asdict(seeded)}, ensure_ascii=False))
+        start = validate_yyyymmdd(args.start) if args.start else None
+        print(json.dumps({"sync": asdict(sync.run(start=start))}, ensure_ascii=False))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
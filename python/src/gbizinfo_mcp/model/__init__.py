@@ -1,13 +1,43 @@
-from .company import Company
-from .company_page import CompanyPage
-from .pagination import PaginatedResult
-from .search import CompanySearchQuery
-from .update_page import UpdateInfoPage
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .bulk import BulkLookupResult
+    from .company import Company
+    from .company_page import CompanyPage
+    from .company_profile import CompanyProfile
+    from .pagination import PaginatedResult
+    from .search import CompanySearchQuery
+    from .update_page import UpdateInfoPage
 
 __all__ = [
+    "BulkLookupResult",
     "Company",
     "PaginatedResult",
     "CompanySearchQuery",
     "CompanyPage",
+    "CompanyProfile",
     "UpdateInfoPage",
 ]
+
+# re-export -> defining submodule; imported on first access to keep startup cheap
+_MODULES = {
+    "BulkLookupResult": ".bulk",
+    "Company": ".company",
+    "PaginatedResult": ".pagination",
+    "CompanySearchQuery": ".search",
+    "CompanyPage": ".company_page",
+    "CompanyProfile": ".company_profile",
+    "UpdateInfoPage": ".update_page",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class BulkLookupResult(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    corporate_number: str
+    status: Literal["ok", "invalid", "error"]
+    data: Optional[Any] = None
+    error: Optional[str] = None
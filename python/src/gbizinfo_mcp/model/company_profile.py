@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from .hojin_info import HojinInfo
+
+
+class CompanyProfile(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+    corporate_number: str
+    hojin_info: Optional[HojinInfo] = None
+    # section name -> error message for sub-requests that failed
+    errors: Dict[str, str] = Field(default_factory=dict)
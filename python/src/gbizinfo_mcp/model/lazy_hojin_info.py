@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import TypeAdapter
+
+from ..utils.projection import FieldTree, project
+from .hojin_info import ApiError, HojinInfo, HojinInfoResponse
+
+# HojinInfo field name -> adapter validating just that field, built on first access
+_FIELD_ADAPTERS: Dict[str, TypeAdapter[Any]] = {}
+_ERRORS: TypeAdapter[Optional[List[ApiError]]] = TypeAdapter(Optional[List[ApiError]])
+
+
+def _field_adapter(name: str) -> TypeAdapter[Any]:
+    adapter = _FIELD_ADAPTERS.get(name)
+    if adapter is None:
+        adapter = _FIELD_ADAPTERS[name] = TypeAdapter(HojinInfo.model_fields[name].annotation)
+    return adapter
+
+
+class LazyHojinInfo:
+    """A ``HojinInfo`` over the raw API item that validates each field on first access.
+
+    Reading ``name`` does not touch the ``patent`` list; ``model()`` validates
+    the whole item when a real ``HojinInfo`` is needed.
+    """
+
+    __slots__ = ("raw", "_fields", "_model")
+
+    def __init__(self, raw: Dict[str, Any]) -> None:
+        self.raw = raw
+        self._fields: Dict[str, Any] = {}
+        self._model: Optional[HojinInfo] = None
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in HojinInfo.model_fields:
+            raise AttributeError(name)
+        fields = self._fields
+        if name not in fields:
+            value = self.raw.get(name)
+            fields[name] = None if value is None else _field_adapter(name).validate_python(value)
+        return fields[name]
+
+    def model(self) -> HojinInfo:
+        if self._model is None:
+            self._model = HojinInfo.model_validate(self.raw)
+        return self._model
+
+    def dump(self, tree: FieldTree) -> Dict[str, Any]:
+        """``model().model_dump()`` restricted to ``tree``, validating only the selected fields."""
+        return {
+            name: project(_field_adapter(name).dump_python(getattr(self, name)), sub)
+            for name, sub in tree.items()
+        }
+
+
+class LazyHojinInfoResponse:
+    """A ``HojinInfoResponse`` that keeps the API JSON and validates sub-trees on demand.
+
+    ``raw`` is the payload as received and can be returned as-is when no typed
+    access is needed; ``model()`` gives the fully validated response.
+    """
+
+    __slots__ = ("raw", "_hojin_infos", "_model")
+
+    def __init__(self, raw: Dict[str, Any]) -> None:
+        self.raw = raw
+        self._hojin_infos: Optional[List[LazyHojinInfo]] = None
+        self._model: Optional[HojinInfoResponse] = None
+
+    @property
+    def hojin_infos(self) -> Optional[List[LazyHojinInfo]]:
+        if self._hojin_infos is None:
+            items = self.raw.get("hojin-infos")
+            if items is None:
+                return None
+            if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+                # let the full validation report the malformed payload
+                self.model()
+            self._hojin_infos = [LazyHojinInfo(item) for item in items]
+        return self._hojin_infos
+
+    @property
+    def errors(self) -> Optional[List[ApiError]]:
+        return _ERRORS.validate_python(self.raw.get("errors"))
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.raw.get("id")
+
+    @property
+    def message(self) -> Optional[str]:
+        return self.raw.get("message")
+
+    def model(self) -> HojinInfoResponse:
+        if self._model is None:
+            self._model = HojinInfoResponse.model_validate(self.raw)
+        return self._model
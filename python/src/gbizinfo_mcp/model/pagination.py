@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Generic, List, TypeVar
+from typing import Generic, List, Literal, TypeVar
 
 from pydantic import BaseModel, ConfigDict
 
@@ -14,3 +14,5 @@ class PaginatedResult(BaseModel, Generic[T]):
     total: int
     from_: int
     size: int
+    # "mirror": answered from the local mirror, which holds only the watched companies
+    source: Literal["remote", "mirror"] = "remote"
@@ -7,6 +7,10 @@ from pydantic import BaseModel, ConfigDict, Field, field_validator, model_valida
 
 from ..utils.validation import validate_corporate_number
 
+# Patterns (module level: underscore class attributes become pydantic private attributes)
+_CSV_DIGITS = re.compile(r"^[0-9]+(,[0-9]+)*$")
+_CSV_AD = re.compile(r"^[ABCD](,[ABCD])*$")
+
 
 class CompanySearchQuery(BaseModel):
     model_config = ConfigDict(from_attributes=True, extra="ignore")
@@ -67,10 +71,6 @@ class CompanySearchQuery(BaseModel):
     page: int = Field(default=1, ge=1, le=10)
     limit: int = Field(default=1000, ge=0, le=5000)
 
-    # Patterns
-    _csv_digits = re.compile(r"^[0-9]+(,[0-9]+)*$")
-    _csv_ad = re.compile(r"^[ABCD](,[ABCD])*$")
-
     @field_validator(
         "net_sales_from",
         "net_sales_to",
@@ -109,7 +109,7 @@ class CompanySearchQuery(BaseModel):
     def _csv_digits_validator(cls, v: Optional[str]) -> Optional[str]:
         if v is None or v == "":
             return None
-        if not cls._csv_digits.fullmatch(v):
+        if not _CSV_DIGITS.fullmatch(v):
             raise ValueError("must be comma-separated digits")
         return v
 
@@ -124,7 +124,7 @@ class CompanySearchQuery(BaseModel):
     def _csv_ad_validator(cls, v: Optional[str]) -> Optional[str]:
         if v is None or v == "":
             return None
-        if not cls._csv_ad.fullmatch(v):
+        if not _CSV_AD.fullmatch(v):
             raise ValueError("must be comma-separated A-D")
         return v
 
@@ -1,10 +1,30 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from pydantic import TypeAdapter
 
 from ...model.company import Company
 from ...utils.normalize import to_optional_str, to_str_or_empty
 
+# Company field -> API keys tried in order (the first truthy value wins)
+_ALIASES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("corporate_number", ("corporate_number", "corporateNumber")),
+    ("name", ("name", "name_jp", "nameJp")),
+    ("prefecture", ("prefecture_name", "prefecture", "prefectureName")),
+    ("city", ("city_name", "city", "cityName")),
+    ("address", ("address", "street", "location")),
+    ("postal_code", ("postal_code", "postalCode", "zip")),
+    ("industry", ("sic", "industry")),
+)
+
+# fields that are "" rather than None when missing
+_REQUIRED = frozenset(("corporate_number", "name"))
+
+_Resolver = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+_COMPANY_LIST: TypeAdapter[List[Company]] = TypeAdapter(List[Company])
+
 
 def map_api_company_to_domain(item: Dict[str, Any]) -> Company:
     return Company(
@@ -22,3 +42,69 @@ def map_api_company_to_domain(item: Dict[str, Any]) -> Company:
         ),
         industry=to_optional_str(item.get("sic") or item.get("industry")),
     )
+
+
+def _build_resolver(keys: Iterable[str]) -> _Resolver:
+    # Keep only the aliases this response shape carries. When none is truthy the
+    # per-item ``or`` chain yields the value of the last alias (``None`` if absent).
+    present = set(keys)
+    plan = [
+        (
+            field,
+            tuple(k for k in aliases if k in present),
+            aliases[-1] if aliases[-1] in present else None,
+            field in _REQUIRED,
+        )
+        for field, aliases in _ALIASES
+    ]
+
+    def resolve(item: Dict[str, Any]) -> Dict[str, Any]:
+        record: Dict[str, Any] = {}
+        for field, candidates, fallback, required in plan:
+            value = None
+            for key in candidates:
+                value = item[key]
+                if value:
+                    break
+            else:
+                value = item[fallback] if fallback is not None else None
+            # inlined to_str_or_empty / to_optional_str
+            if value is None:
+                record[field] = "" if required else None
+                continue
+            text = (value if value.__class__ is str else str(value)).strip()
+            record[field] = text if text or required else None
+        return record
+
+    return resolve
+
+
+def map_api_company_records(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Map API items to plain ``Company``-shaped dicts.
+
+    Same result as ``map_api_company_to_domain(item).model_dump()``, but the
+    alias lookup is resolved once per distinct key set instead of per item.
+    """
+    resolvers: Dict[Tuple[str, ...], _Resolver] = {}
+    records: List[Dict[str, Any]] = []
+    for item in items:
+        shape = tuple(item)
+        resolver = resolvers.get(shape)
+        if resolver is None:
+            resolver = resolvers[shape] = _build_resolver(shape)
+        records.append(resolver(item))
+    return records
+
+
+def map_api_companies_to_domain(items: Iterable[Dict[str, Any]]) -> List[Company]:
+    """Bulk ``map_api_company_to_domain``.
+
+    The records are validated as one list in a single pydantic-core call, which
+    is cheaper than per-item construction (and than ``model_construct``).
+    """
+    return _COMPANY_LIST.validate_python(map_api_company_records(items))
+
+
+def companies_to_dicts(companies: Iterable[Company]) -> List[Dict[str, Any]]:
+    """``model_dump()`` for the flat ``Company`` model without the serializer overhead."""
+    return [dict(company.__dict__) for company in companies]
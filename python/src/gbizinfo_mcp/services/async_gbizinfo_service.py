@@ -0,0 +1,407 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple
+
+from ..config import settings
+from ..model.bulk import BulkLookupResult
+from ..model.company import Company
+from ..model.company_profile import CompanyProfile
+from ..model.lazy_hojin_info import LazyHojinInfoResponse
+from ..model.pagination import PaginatedResult
+from ..model.update_page import UpdateInfoPage
+from ..utils.preflight import check_search, check_update_range, preflight
+from .adapters.gbizinfo_adapter import map_api_company_to_domain
+from .async_http import AsyncHttpClient
+from .cache import TTLCache
+from .disk_cache import DiskCache, extract_update_date
+from .gbizinfo_service import (
+    PROFILE_SECTIONS,
+    SEARCH_MAX_LIMIT,
+    ApiCommunicationError,
+    BaseGBizInfoService,
+    SearchDataSource,
+    build_search_params,
+    canonical_search_query,
+    is_empty_detail,
+    is_not_found,
+    merge_profile,
+    parse_search_result,
+    parse_update_page,
+    plan_exhaustive_pages,
+    split_corporate_numbers,
+)
+from .json_stream import JsonArrayItemDecoder
+from .metrics import MetricsRegistry
+from .mirror import MirrorStore
+
+
+class AsyncCompanyStream:
+    """asyncio counterpart of ``CompanyStream``."""
+
+    def __init__(self, items: AsyncIterator[Any], decoder: JsonArrayItemDecoder) -> None:
+        self._items = items
+        self._decoder = decoder
+
+    async def __aiter__(self) -> AsyncIterator[Company]:
+        try:
+            async for item in self._items:
+                if isinstance(item, dict):
+                    yield map_api_company_to_domain(item)
+        except Exception as e:  # noqa: BLE001
+            raise ApiCommunicationError(str(e)) from e
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self._decoder.meta
+
+    @property
+    def total(self) -> int:
+        meta = self._decoder.meta
+        return int(meta.get("total") or meta.get("totalCount") or meta.get("count") or 0)
+
+    async def aclose(self) -> None:
+        aclose = getattr(self._items, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+
+class AsyncGBizInfoService(BaseGBizInfoService):
+    """asyncio variant of ``GBizInfoService`` sharing its caches, URLs and mapping."""
+
+    def __init__(
+        self,
+        http_client: Optional[AsyncHttpClient] = None,
+        *,
+        cache: Optional[TTLCache] = None,
+        disk_cache: Optional[DiskCache] = None,
+        mirror: Optional[MirrorStore] = None,
+        search_cache: Optional[TTLCache] = None,
+        negative_cache: Optional[TTLCache] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        super().__init__(
+            cache=cache,
+            disk_cache=disk_cache,
+            mirror=mirror,
+            search_cache=search_cache,
+            negative_cache=negative_cache,
+            metrics=metrics,
+        )
+        self._http = http_client or AsyncHttpClient(metrics=self._metrics)
+
+    async def _mirror_get(self, corporate_number: str, sub_path: Optional[str]) -> Any:
+        if self._mirror is None:
+            return None
+        return await asyncio.to_thread(self._mirror.get, corporate_number, sub_path)
+
+    async def _disk_get(self, key: str) -> Any:
+        if self._disk_cache is None:
+            return None
+        return await asyncio.to_thread(self._disk_cache.get, key)
+
+    async def _disk_set(self, key: str, payload: Any, *, update_date: Optional[str] = None) -> None:
+        if self._disk_cache is None:
+            return
+        await asyncio.to_thread(self._disk_cache.set, key, payload, update_date=update_date)
+
+    async def _get_detail(self, corporate_number: str, sub_path: Optional[str] = None) -> Any:
+        cached = self._cached_detail(corporate_number, sub_path)
+        if cached is not None:
+            self._metrics.count_lookup("memory")
+            return LazyHojinInfoResponse(cached)
+        negative = self._answer_negative(corporate_number, sub_path)
+        if negative is not None:
+            return negative
+        url = self._build_detail_url(corporate_number, sub_path)
+        disk_key = self._detail_disk_key(corporate_number, sub_path)
+        try:
+            source = "mirror"
+            res = await self._mirror_get(corporate_number, sub_path)
+            if res is None:
+                source = "disk"
+                res = await self._disk_get(disk_key)
+            if res is None:
+                source = "upstream"
+                res = await self._http.request(url)
+                if isinstance(res, dict) and not is_empty_detail(res):
+                    await self._disk_set(disk_key, res, update_date=extract_update_date(res))
+            self._metrics.count_lookup(source)
+            if isinstance(res, dict):
+                self._remember_detail(corporate_number, sub_path, res)
+                return LazyHojinInfoResponse(res)
+            return res
+        except Exception as e:  # noqa: BLE001
+            if is_not_found(e):
+                self._remember_negative(corporate_number, sub_path, str(e))
+            raise ApiCommunicationError(str(e)) from e
+
+    async def get_basic_info(self, corporate_number: str) -> Any:
+        return await self._get_detail(corporate_number)
+
+    async def get_certification(self, corporate_number: str) -> Any:
+        return await self._get_detail(corporate_number, "certification")
+
+    async def get_commendation(self, corporate_number: str) -> Any:
+        return await self._get_detail(corporate_number, "commendation")
+
+    async def get_finance(self, corporate_number: str) -> Any:
+        return await self._get_detail(corporate_number, "finance")
+
+    async def get_patent(self, corporate_number: str) -> Any:
+        return await self._get_detail(corporate_number, "patent")
+
+    async def get_procurement(self, corporate_number: str) -> Any:
+        return await self._get_detail(corporate_number, "procurement")
+
+    async def get_subsidy(self, corporate_number: str) -> Any:
+        return await self._get_detail(corporate_number, "subsidy")
+
+    async def get_workplace(self, corporate_number: str) -> Any:
+        return await self._get_detail(corporate_number, "workplace")
+
+    async def get_company_profile(self, corporate_number: str) -> CompanyProfile:
+        """Fetch all eight detail endpoints concurrently and merge them into one record.
+
+        A failing section is reported in ``CompanyProfile.errors`` instead of
+        failing the whole call.
+        """
+        sub_paths = [sub_path for sub_path, _, _ in PROFILE_SECTIONS]
+        results = await asyncio.gather(
+            *(self._get_detail(corporate_number, sub_path) for sub_path in sub_paths),
+            return_exceptions=True,
+        )
+        return merge_profile(corporate_number, dict(zip(sub_paths, results, strict=True)))
+
+    async def iter_basic_info_bulk(
+        self, corporate_numbers: Iterable[str], *, max_workers: Optional[int] = None
+    ) -> AsyncIterator[BulkLookupResult]:
+        """asyncio counterpart of ``GBizInfoService.iter_basic_info_bulk``."""
+        valid, invalid = split_corporate_numbers(corporate_numbers)
+        for result in invalid:
+            yield result
+        if not valid:
+            return
+        workers = max(1, max_workers or settings.bulk_max_workers)
+        numbers = iter(valid)
+        pending: Dict[asyncio.Task[Any], str] = {}
+
+        def submit(number: str) -> None:
+            pending[asyncio.create_task(self.get_basic_info(number))] = number
+
+        for number in islice(numbers, workers):
+            submit(number)
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    number = pending.pop(task)
+                    exc = task.exception()
+                    if exc is not None:
+                        yield BulkLookupResult(
+                            corporate_number=number, status="error", error=str(exc)
+                        )
+                    else:
+                        yield BulkLookupResult(
+                            corporate_number=number, status="ok", data=task.result()
+                        )
+                    following = next(numbers, None)
+                    if following is not None:
+                        submit(following)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stream_search_companies(
+        self, *, page: int = 1, limit: int = 1000, **options: Any
+    ) -> AsyncCompanyStream:
+        """asyncio counterpart of ``GBizInfoService.stream_search_companies``."""
+        preflight(check_search(options))
+        key = canonical_search_query(build_search_params(options, page=page, limit=limit))
+        decoder = JsonArrayItemDecoder("hojin-infos")
+        return AsyncCompanyStream(
+            self._http.stream_json(self._build_search_url(key), decoder), decoder
+        )
+
+    def stream_update_info(
+        self, category: Optional[str] = None, *, from_: str, to: str, page: int = 1
+    ) -> AsyncCompanyStream:
+        """asyncio counterpart of ``GBizInfoService.stream_update_info``."""
+        preflight(check_update_range(from_, to))
+        url = self._build_update_query_url(category, from_=from_, to=to, page=page)
+        decoder = JsonArrayItemDecoder("hojin-infos")
+        return AsyncCompanyStream(self._http.stream_json(url, decoder), decoder)
+
+    async def get_update_info(self, *, from_: str, to: str, page: int = 1) -> UpdateInfoPage:
+        return await self._get_update_info_category(None, from_=from_, to=to, page=page)
+
+    async def get_update_info_certification(
+        self, *, from_: str, to: str, page: int = 1
+    ) -> UpdateInfoPage:
+        return await self._get_update_info_category("certification", from_=from_, to=to, page=page)
+
+    async def get_update_info_commendation(
+        self, *, from_: str, to: str, page: int = 1
+    ) -> UpdateInfoPage:
+        return await self._get_update_info_category("commendation", from_=from_, to=to, page=page)
+
+    async def get_update_info_finance(
+        self, *, from_: str, to: str, page: int = 1
+    ) -> UpdateInfoPage:
+        return await self._get_update_info_category("finance", from_=from_, to=to, page=page)
+
+    async def get_update_info_patent(self, *, from_: str, to: str, page: int = 1) -> UpdateInfoPage:
+        return await self._get_update_info_category("patent", from_=from_, to=to, page=page)
+
+    async def get_update_info_procurement(
+        self, *, from_: str, to: str, page: int = 1
+    ) -> UpdateInfoPage:
+        return await self._get_update_info_category("procurement", from_=from_, to=to, page=page)
+
+    async def get_update_info_subsidy(
+        self, *, from_: str, to: str, page: int = 1
+    ) -> UpdateInfoPage:
+        return await self._get_update_info_category("subsidy", from_=from_, to=to, page=page)
+
+    async def get_update_info_workplace(
+        self, *, from_: str, to: str, page: int = 1
+    ) -> UpdateInfoPage:
+        return await self._get_update_info_category("workplace", from_=from_, to=to, page=page)
+
+    async def get_update_info_page(
+        self, category: Optional[str] = None, *, from_: str, to: str, page: int = 1
+    ) -> UpdateInfoPage:
+        return await self._get_update_info_category(category, from_=from_, to=to, page=page)
+
+    async def refresh_update_info_page(
+        self, category: Optional[str] = None, *, from_: str, to: str, page: int = 1
+    ) -> UpdateInfoPage:
+        """asyncio counterpart of ``GBizInfoService.refresh_update_info_page``."""
+        return await self._get_update_info_category(
+            category, from_=from_, to=to, page=page, refresh=True
+        )
+
+    async def iter_update_info(
+        self,
+        category: Optional[str] = None,
+        *,
+        from_: str,
+        to: str,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[Company]:
+        """asyncio counterpart of ``GBizInfoService.iter_update_info``."""
+        first = await self._get_update_info_category(category, from_=from_, to=to, page=1)
+        for item in first.items:
+            yield item
+        pages = iter(range(2, first.totalPage + 1))
+        workers = max(1, window or settings.update_info_page_window)
+        pending: deque[asyncio.Task[UpdateInfoPage]] = deque()
+
+        def submit(page: int) -> None:
+            pending.append(
+                asyncio.create_task(
+                    self._get_update_info_category(category, from_=from_, to=to, page=page)
+                )
+            )
+
+        for page in islice(pages, workers):
+            submit(page)
+        try:
+            while pending:
+                result = await pending.popleft()
+                following = next(pages, None)
+                if following is not None:
+                    submit(following)
+                for item in result.items:
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _get_update_info_category(
+        self, category: Optional[str], *, from_: str, to: str, page: int, refresh: bool = False
+    ) -> UpdateInfoPage:
+        preflight(check_update_range(from_, to))
+        url = self._build_update_query_url(category, from_=from_, to=to, page=page)
+        disk_key = self._update_disk_key(category, from_=from_, to=to, page=page)
+        try:
+            res = None if refresh else await self._disk_get(disk_key)
+            if res is None:
+                res = await self._http.request(url)
+                if self._keeps_update_page(res):
+                    await self._disk_set(disk_key, res)
+            return parse_update_page(res, page=page)
+        except Exception as e:  # noqa: BLE001
+            raise ApiCommunicationError(str(e)) from e
+
+    async def search_companies(
+        self,
+        *,
+        page: int = 1,
+        limit: int = 1000,
+        data_source: Optional[SearchDataSource] = None,
+        **options: Any,
+    ) -> PaginatedResult[Company]:
+        """Same keyword arguments as ``GBizInfoService.search_companies``."""
+        preflight(check_search(options))
+        if (data_source or settings.search_data_source) != "remote":
+            local = await asyncio.to_thread(
+                self._search_local, options, page=page, limit=limit, data_source=data_source
+            )
+            if local is not None:
+                return local
+        key = canonical_search_query(build_search_params(options, page=page, limit=limit))
+        try:
+            res = self._cached_search(key)
+            if res is None:
+                res = await self._http.request(self._build_search_url(key))
+                self._remember_search(key, res)
+            return parse_search_result(res, page=page, limit=limit)
+        except Exception as e:  # noqa: BLE001
+            raise ApiCommunicationError(str(e)) from e
+
+    async def iter_search_exhaustive(
+        self, *, max_workers: Optional[int] = None, **options: Any
+    ) -> AsyncIterator[Company]:
+        """asyncio counterpart of ``GBizInfoService.iter_search_exhaustive``."""
+        preflight(check_search(options))
+        workers = max(1, max_workers or settings.exhaustive_search_workers)
+        semaphore = asyncio.Semaphore(workers)
+        seen: set[str] = set()
+        pending: Dict[asyncio.Task[PaginatedResult[Company]], Tuple[Dict[str, Any], int]] = {}
+
+        async def fetch(opts: Dict[str, Any], page: int) -> PaginatedResult[Company]:
+            async with semaphore:
+                return await self.search_companies(
+                    page=page, limit=SEARCH_MAX_LIMIT, data_source="remote", **opts
+                )
+
+        def submit(opts: Dict[str, Any], page: int) -> None:
+            pending[asyncio.create_task(fetch(opts, page))] = (opts, page)
+
+        submit(dict(options), 1)
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    opts, page = pending.pop(task)
+                    result = task.result()
+                    if page == 1:
+                        for follow_opts, follow_page in plan_exhaustive_pages(opts, result.total):
+                            submit(follow_opts, follow_page)
+                    for company in result.items:
+                        if company.corporate_number not in seen:
+                            seen.add(company.corporate_number)
+                            yield company
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def warm_up(self, count: Optional[int] = None) -> int:
+        """Open keep-alive connections to the API ahead of the first call."""
+        return await self._http.warm_up(count)
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
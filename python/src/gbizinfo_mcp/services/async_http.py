@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..config import settings
+from .hedging import HedgePolicy
+from .http import (
+    ApiServerError,
+    HttpRequestOptions,
+    build_headers,
+    check_circuit,
+    encode_body,
+    is_coalescible,
+    log_request,
+    parse_response,
+    record_outcome,
+)
+from .json_stream import JsonArrayItemDecoder
+from .metrics import MetricsRegistry, default_metrics
+from .pool import PoolStats
+from .rate_limit import TokenBucket, default_rate_limiter
+from .retry import CircuitBreakers, RetryPolicy
+from .singleflight import AsyncSingleFlight, canonical_request_key
+
+
+class AsyncHttpClient:
+    """asyncio counterpart of ``HttpClient`` backed by a pooled ``httpx.AsyncClient``.
+
+    Headers, debug redaction, error mapping, the retry policy and the
+    per-endpoint circuit breakers and request hedging work exactly as in
+    ``HttpClient``. Connection reuse is counted with httpcore's ``trace``
+    extension; idle connections expire after ``HTTP_POOL_IDLE_SECONDS``.
+    """
+
+    def __init__(
+        self,
+        *,
+        debug: bool = False,
+        client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breakers: Optional[CircuitBreakers] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+    ) -> None:
+        self._debug = debug or settings.debug_http
+        self._client = client
+        self._rate_limiter = rate_limiter or default_rate_limiter()
+        self._metrics = metrics or default_metrics()
+        self._single_flight = AsyncSingleFlight() if settings.request_coalescing else None
+        self._retry = retry_policy or RetryPolicy.from_settings()
+        self._breakers = (
+            circuit_breakers if circuit_breakers is not None else CircuitBreakers.from_settings()
+        )
+        self._hedge = hedge_policy if hedge_policy is not None else HedgePolicy.from_settings()
+        self._pool_stats = PoolStats()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # created on first use so that constructing the client never needs a running loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.http_max_connections,
+                    max_keepalive_connections=settings.http_max_keepalive_connections,
+                    keepalive_expiry=settings.http_pool_idle_seconds or None,
+                ),
+                timeout=httpx.Timeout(
+                    settings.request_timeout_seconds, connect=settings.connect_timeout_seconds
+                ),
+            )
+        return self._client
+
+    async def request(self, url: str, options: Optional[HttpRequestOptions] = None) -> Any:
+        if options is None:
+            options = HttpRequestOptions()
+
+        method = options.method or "GET"
+        headers = build_headers(options.headers)
+        data = encode_body(options.body)
+        timeout: Any = httpx.USE_CLIENT_DEFAULT
+        if options.timeout is not None:
+            connect_timeout, read_timeout = options.timeout
+            timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+
+        if not is_coalescible(method, options):
+            return await self._send(method, url, headers, data, timeout)
+        send = self._send_hedged if self._hedge is not None else self._send
+        if self._single_flight is not None:
+            return await self._single_flight.do(
+                canonical_request_key(method, url),
+                lambda: send(method, url, headers, data, timeout),
+            )
+        return await send(method, url, headers, data, timeout)
+
+    @property
+    def coalesced_requests(self) -> int:
+        """Number of calls answered by joining an identical in-flight request."""
+        return self._single_flight.coalesced if self._single_flight is not None else 0
+
+    @property
+    def circuit_breakers(self) -> Optional[CircuitBreakers]:
+        return self._breakers
+
+    @property
+    def hedge_policy(self) -> Optional[HedgePolicy]:
+        return self._hedge
+
+    def pool_snapshot(self) -> Dict[str, int]:
+        """Connections in use / idle, and counts of created and reused ones."""
+        stats = self._pool_stats.snapshot()
+        in_use = idle = 0
+        transport = getattr(self._client, "_transport", None)
+        for connection in getattr(getattr(transport, "_pool", None), "connections", ()):
+            if connection.is_idle():
+                idle += 1
+            elif not connection.is_closed():
+                in_use += 1
+        return {
+            "in_use": in_use,
+            "idle": idle,
+            "created": stats["created"],
+            "reused": stats["reused"],
+        }
+
+    async def warm_up(self, count: Optional[int] = None) -> int:
+        """asyncio counterpart of ``HttpClient.warm_up``.
+
+        httpx cannot open a bare connection, so each one is opened by a
+        concurrent ``HEAD`` of the API host's root; at most
+        ``HTTP_MAX_KEEPALIVE_CONNECTIONS`` are kept.
+        """
+        if count is None:
+            count = settings.http_warmup_connections
+        count = min(count, settings.http_max_keepalive_connections)
+        if count <= 0:
+            return 0
+        client = self._get_client()
+        base = urlsplit(settings.gbizinfo_base_url)
+        origin = f"{base.scheme}://{base.netloc}/"
+
+        async def head() -> bool:
+            try:
+                response = await client.request(
+                    "HEAD",
+                    origin,
+                    headers={"User-Agent": settings.user_agent},
+                    extensions={"trace": _pool_trace(self._pool_stats)},
+                )
+            except httpx.TransportError as exc:
+                logging.getLogger(__name__).warning(
+                    "connection warm-up to %s failed: %s", origin, exc
+                )
+                return False
+            await response.aclose()
+            return True
+
+        return sum(await asyncio.gather(*(head() for _ in range(count))))
+
+    async def _open(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[str],
+        timeout: Any,
+        *,
+        stream: bool = False,
+    ) -> Tuple[httpx.Response, int]:
+        """asyncio counterpart of ``HttpClient._open``; close the response when done."""
+        breaker = check_circuit(self._breakers, url, self._metrics)
+        if self._debug:
+            log_request(method, url, headers, data)
+        client = self._get_client()
+        started = time.perf_counter()
+        retries = 0
+        while True:
+            if self._rate_limiter is not None:
+                self._metrics.observe_rate_limit_wait(await self._rate_limiter.acquire_async())
+            request = client.build_request(
+                method,
+                url,
+                headers=headers,
+                content=data,
+                timeout=timeout,
+                extensions={"trace": _pool_trace(self._pool_stats)},
+            )
+            try:
+                response = await client.send(request, stream=stream)
+            except httpx.TransportError:
+                if retries < self._retry.retries:
+                    retries += 1
+                    await asyncio.sleep(self._retry.backoff(retries))
+                    continue
+                if breaker is not None:
+                    breaker.record_failure()
+                self._metrics.observe_request(
+                    url, status=None, seconds=time.perf_counter() - started, retries=retries
+                )
+                raise
+            except Exception:
+                self._metrics.observe_request(
+                    url, status=None, seconds=time.perf_counter() - started, retries=retries
+                )
+                raise
+            delay = self._retry.delay(
+                retries, response.status_code, response.headers.get("Retry-After")
+            )
+            if delay is None:
+                break
+            retries += 1
+            await response.aclose()
+            await asyncio.sleep(delay)
+        record_outcome(breaker, response.status_code)
+        return response, retries
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[str],
+        timeout: Any,
+    ) -> Any:
+        started = time.perf_counter()
+        response, retries = await self._open(method, url, headers, data, timeout)
+        self._metrics.observe_request(
+            url,
+            status=response.status_code,
+            seconds=time.perf_counter() - started,
+            bytes_received=len(response.content),
+            retries=retries,
+        )
+
+        content_type = (response.headers.get("content-type") or "").lower()
+        text = response.text or ""
+        return parse_response(response.status_code, content_type, text, url=url, debug=self._debug)
+
+    async def _timed_send(
+        self, method: str, url: str, headers: Dict[str, str], data: Optional[str], timeout: Any
+    ) -> Any:
+        started = time.perf_counter()
+        result = await self._send(method, url, headers, data, timeout)
+        self._hedge.record(url, time.perf_counter() - started)  # type: ignore[union-attr]
+        return result
+
+    async def _send_hedged(
+        self, method: str, url: str, headers: Dict[str, str], data: Optional[str], timeout: Any
+    ) -> Any:
+        """asyncio counterpart of ``HttpClient._send_hedged``; the slower request is cancelled."""
+        hedge = self._hedge
+        assert hedge is not None
+        args = (method, url, headers, data, timeout)
+        primary = asyncio.ensure_future(self._timed_send(*args))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge.delay(url))
+            if done or not hedge.try_spend():
+                return await primary
+            backup = asyncio.ensure_future(self._timed_send(*args))
+            pending.add(backup)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._metrics.observe_hedge(url, won=task is backup)
+                        return task.result()
+            self._metrics.observe_hedge(url, won=False)
+            return primary.result()  # raises the primary's error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream_json(self, url: str, decoder: JsonArrayItemDecoder) -> AsyncIterator[Any]:
+        """asyncio counterpart of ``HttpClient.stream_json``."""
+        started = time.perf_counter()
+        response, retries = await self._open(
+            "GET", url, build_headers(), None, httpx.USE_CLIENT_DEFAULT, stream=True
+        )
+        status = response.status_code
+        received = 0
+        try:
+            content_type = (response.headers.get("content-type") or "").lower()
+            if not 200 <= response.status_code < 400 or not content_type.startswith(
+                "application/json"
+            ):
+                received = len(await response.aread())
+                parse_response(
+                    response.status_code,
+                    content_type,
+                    response.text or "",
+                    url=url,
+                    debug=self._debug,
+                )
+                raise ApiServerError(response.status_code, f"expected JSON, got {content_type!r}")
+            async for chunk in response.aiter_bytes():
+                received += len(chunk)
+                for item in decoder.feed(chunk):
+                    yield item
+            for item in decoder.close():
+                yield item
+        finally:
+            await response.aclose()
+            self._metrics.observe_request(
+                url,
+                status=status,
+                seconds=time.perf_counter() - started,
+                bytes_received=received,
+                retries=retries,
+            )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _pool_trace(stats: PoolStats) -> Callable[[str, Dict[str, Any]], Awaitable[None]]:
+    """httpcore ``trace`` callback for one request: counts a new or a reused connection."""
+    connected = False
+
+    async def trace(event: str, info: Dict[str, Any]) -> None:  # noqa: ARG001
+        nonlocal connected
+        if event == "connection.connect_tcp.complete":
+            connected = True
+            stats.add(created=1)
+        elif event.endswith(".send_request_headers.started") and not connected:
+            stats.add(reused=1)
+
+    return trace
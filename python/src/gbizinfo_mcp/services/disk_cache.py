@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    update_date TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+
+@dataclass(frozen=True)
+class DiskCacheEntry:
+    payload: Any
+    fetched_at: float
+    update_date: Optional[str]
+
+
+@dataclass(frozen=True)
+class DiskCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class DiskCache:
+    """SQLite-backed store for raw gBizINFO JSON payloads.
+
+    Payloads are stored zlib-compressed together with the time they were fetched
+    and the ``update_date`` reported by gBizINFO. The database is opened lazily
+    on first access, so constructing the cache never blocks server startup.
+    When the compressed size exceeds ``max_bytes`` the least recently accessed
+    entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_bytes: int,
+        ttl: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = path
+        self._max_bytes = max(0, int(max_bytes))
+        self._ttl = float(ttl)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # caller holds self._lock
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self._path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+            self._total_bytes = int(row[0])
+            self._conn = conn
+        return self._conn
+
+    def get_entry(self, key: str) -> Optional[DiskCacheEntry]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT payload, size, fetched_at, update_date FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            blob, size, fetched_at, update_date = row
+            now = self._clock()
+            if fetched_at + self._ttl <= now:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total_bytes -= int(size)
+                self._misses += 1
+                return None
+            try:
+                payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+            except (zlib.error, ValueError):
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total_bytes -= int(size)
+                self._misses += 1
+                return None
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._hits += 1
+            return DiskCacheEntry(payload=payload, fetched_at=fetched_at, update_date=update_date)
+
+    def get(self, key: str) -> Any:
+        entry = self.get_entry(key)
+        return entry.payload if entry is not None else None
+
+    def set(self, key: str, payload: Any, *, update_date: Optional[str] = None) -> None:
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        blob = zlib.compress(raw)
+        size = len(blob)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            conn = self._connection()
+            now = self._clock()
+            old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries"
+                " (key, payload, size, fetched_at, accessed_at, update_date)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, size, now, now, update_date),
+            )
+            self._total_bytes += size - (int(old[0]) if old else 0)
+            if self._total_bytes > self._max_bytes:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # caller holds self._lock
+        rows = conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC")
+        victims: list[tuple[str]] = []
+        for key, size in rows:
+            if self._total_bytes <= self._max_bytes:
+                break
+            victims.append((key,))
+            self._total_bytes -= int(size)
+        conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self._evictions += len(victims)
+
+    def stats(self) -> DiskCacheStats:
+        with self._lock:
+            entries = 0
+            if self._conn is not None:
+                entries = int(self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+            return DiskCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=entries,
+                bytes=self._total_bytes,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def extract_update_date(payload: Any) -> Optional[str]:
+    """Return the ``update_date`` of the first ``hojin-infos`` item, if any."""
+    if not isinstance(payload, dict):
+        return None
+    items = payload.get("hojin-infos")
+    if isinstance(items, list) and items and isinstance(items[0], dict):
+        value = items[0].get("update_date")
+        return str(value) if value else None
+    return None
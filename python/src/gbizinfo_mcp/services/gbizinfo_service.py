@@ -1,137 +1,842 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import logging
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import quote, urlencode
 
 from ..config import settings
+from ..errors import InputValidationError
+from ..model.bulk import BulkLookupResult
 from ..model.company import Company
-from ..model.hojin_info import HojinInfoResponse
+from ..model.company_profile import CompanyProfile
+from ..model.hojin_info import HojinInfo
+from ..model.lazy_hojin_info import LazyHojinInfo, LazyHojinInfoResponse
 from ..model.pagination import PaginatedResult
 from ..model.update_page import UpdateInfoPage
-from .adapters.gbizinfo_adapter import map_api_company_to_domain
-from .http import HttpClient
+from ..utils.jis import PREFECTURES
+from ..utils.preflight import check_search, check_update_range, preflight
+from ..utils.validation import validate_corporate_number
+from .adapters.gbizinfo_adapter import map_api_companies_to_domain, map_api_company_to_domain
+from .cache import CacheStats, TTLCache, ttl_for
+from .disk_cache import DiskCache, DiskCacheStats, extract_update_date
+from .http import ApiServerError, HttpClient
+from .json_stream import JsonArrayItemDecoder
+from .local_search import UnsupportedLocalQueryError
+from .metrics import MetricsRegistry, cache_snapshot, default_metrics
+from .mirror import MirrorStore, default_mirror_store
 
 
 class ApiCommunicationError(Exception):
     pass
 
 
-class GBizInfoService:
-    def __init__(self, http_client: Optional[HttpClient] = None) -> None:
-        self._http = http_client or HttpClient()
+SearchDataSource = Literal["local", "remote", "auto"]
+
+
+def _default_response_cache() -> Optional[TTLCache]:
+    if (
+        settings.response_cache_max_entries <= 0
+        or settings.response_cache_max_bytes <= 0
+        or settings.response_cache_ttl_seconds <= 0
+    ):
+        return None
+    return TTLCache(
+        max_entries=settings.response_cache_max_entries,
+        max_bytes=settings.response_cache_max_bytes,
+        default_ttl=settings.response_cache_ttl_seconds,
+    )
+
+
+def _default_disk_cache() -> Optional[DiskCache]:
+    # the store is opened lazily on first access; this never touches the disk
+    if not settings.disk_cache_path:
+        return None
+    return DiskCache(
+        settings.disk_cache_path,
+        max_bytes=settings.disk_cache_max_bytes,
+        ttl=settings.disk_cache_ttl_seconds,
+    )
+
+
+def _default_search_cache() -> Optional[TTLCache]:
+    if (
+        settings.search_cache_max_entries <= 0
+        or settings.search_cache_max_bytes <= 0
+        or settings.search_cache_ttl_seconds <= 0
+    ):
+        return None
+    return TTLCache(
+        max_entries=settings.search_cache_max_entries,
+        max_bytes=settings.search_cache_max_bytes,
+        default_ttl=settings.search_cache_ttl_seconds,
+    )
+
+
+# budget per negative-cache entry: empty answers and 404 messages are tiny
+_NEGATIVE_ENTRY_BYTES = 4096
+
+
+def _default_negative_cache() -> Optional[TTLCache]:
+    if settings.negative_cache_max_entries <= 0 or settings.negative_cache_ttl_seconds <= 0:
+        return None
+    return TTLCache(
+        max_entries=settings.negative_cache_max_entries,
+        max_bytes=settings.negative_cache_max_entries * _NEGATIVE_ENTRY_BYTES,
+        default_ttl=settings.negative_cache_ttl_seconds,
+    )
+
+
+def is_empty_detail(res: Any) -> bool:
+    """A detail payload whose ``hojin-infos`` is present but empty."""
+    return isinstance(res, dict) and "hojin-infos" in res and not res["hojin-infos"]
+
+
+def is_not_found(error: BaseException) -> bool:
+    return isinstance(error, ApiServerError) and error.status_code == 404
+
+
+# keyword argument -> gBizINFO query parameter, in the order they are sent upstream
+_SEARCH_PARAMS: Tuple[Tuple[str, str], ...] = (
+    ("name", "name"),
+    ("corporate_number", "corporate_number"),
+    ("corporate_type", "corporate_type"),
+    ("exist_flg", "exist_flg"),
+    ("prefecture", "prefecture"),
+    ("city", "city"),
+    ("address", "address"),
+    ("industry", "industry"),
+    ("business_item", "business_item"),
+    ("founded_year", "founded_year"),
+    ("sales_area", "sales_area"),
+    ("unified_qualification", "unified_qualification"),
+    ("unified_qualification_sub01", "unified_qualification_sub01"),
+    ("unified_qualification_sub02", "unified_qualification_sub02"),
+    ("unified_qualification_sub03", "unified_qualification_sub03"),
+    ("unified_qualification_sub04", "unified_qualification_sub04"),
+    ("net_sales_from", "net_sales_summary_of_business_results_from"),
+    ("net_sales_to", "net_sales_summary_of_business_results_to"),
+    ("net_income_loss_from", "net_income_loss_summary_of_business_results_from"),
+    ("net_income_loss_to", "net_income_loss_summary_of_business_results_to"),
+    ("total_assets_from", "total_assets_summary_of_business_results_from"),
+    ("total_assets_to", "total_assets_summary_of_business_results_to"),
+    ("operating_revenue1_from", "operating_revenue1_summary_of_business_results_from"),
+    ("operating_revenue1_to", "operating_revenue1_summary_of_business_results_to"),
+    ("operating_revenue2_from", "operating_revenue2_summary_of_business_results_from"),
+    ("operating_revenue2_to", "operating_revenue2_summary_of_business_results_to"),
+    ("ordinary_income_loss_from", "ordinary_income_loss_summary_of_business_results_from"),
+    ("ordinary_income_loss_to", "ordinary_income_loss_summary_of_business_results_to"),
+    ("ordinary_income_from", "ordinary_income_summary_of_business_results_from"),
+    ("ordinary_income_to", "ordinary_income_summary_of_business_results_to"),
+    ("capital_stock_from", "capital_stock_from"),
+    ("capital_stock_to", "capital_stock_to"),
+    ("employee_number_from", "employee_number_from"),
+    ("employee_number_to", "employee_number_to"),
+    ("establishment_from", "establishment_from"),
+    ("establishment_to", "establishment_to"),
+    ("name_major_shareholders", "name_major_shareholders"),
+    ("average_continuous_service_years", "average_continuous_service_years"),
+    ("average_age", "average_age"),
+    (
+        "month_average_predetermined_overtime_hours",
+        "month_average_predetermined_overtime_hours",
+    ),
+    ("female_workers_proportion", "female_workers_proportion"),
+    ("year", "year"),
+    ("ministry", "ministry"),
+    ("source", "source"),
+)
+
+
+# query parameters holding an unordered comma-separated set of codes
+_CSV_SET_PARAMS = frozenset(
+    (
+        "corporate_type",
+        "business_item",
+        "founded_year",
+        "sales_area",
+        "unified_qualification",
+        "unified_qualification_sub01",
+        "unified_qualification_sub02",
+        "unified_qualification_sub03",
+        "unified_qualification_sub04",
+        "year",
+        "ministry",
+        "source",
+    )
+)
+
+# values gBizINFO applies when a parameter is omitted
+_SEARCH_DEFAULTS: Dict[str, str] = {"page": "1", "limit": "1000"}
+
+
+# deepest result the search endpoint can page to
+SEARCH_MAX_PAGE = 10
+SEARCH_MAX_LIMIT = 5000
+
+# every corporate_type code gBizINFO assigns, so splitting on it loses nothing
+CORPORATE_TYPES: Tuple[str, ...] = (
+    "101",
+    "201",
+    "301",
+    "302",
+    "303",
+    "304",
+    "305",
+    "399",
+    "401",
+    "499",
+)
+
+# corporate types whose entities all have a head office in Japan, so splitting
+# them by prefecture loses nothing; 401 (foreign) and 499 (other) may have none
+_DOMESTIC_CORPORATE_TYPES = frozenset(("101", "201", "301", "302", "303", "304", "305", "399"))
+
+# numeric ranges an exhaustive search may bisect (keyword prefix of *_from / *_to)
+_BISECT_RANGES: Tuple[str, ...] = (
+    "capital_stock",
+    "employee_number",
+    "net_sales",
+    "total_assets",
+    "net_income_loss",
+    "operating_revenue1",
+    "operating_revenue2",
+    "ordinary_income_loss",
+    "ordinary_income",
+)
+
+
+# detail sub path -> (profile section name, HojinInfo field filled by that endpoint)
+PROFILE_SECTIONS: Tuple[Tuple[Optional[str], str, Optional[str]], ...] = (
+    (None, "basic", None),
+    ("certification", "certification", "certification"),
+    ("commendation", "commendation", "commendation"),
+    ("finance", "finance", "finance"),
+    ("patent", "patent", "patent"),
+    ("procurement", "procurement", "procurement"),
+    ("subsidy", "subsidy", "subsidy"),
+    ("workplace", "workplace", "workplace_info"),
+)
+
+
+def merge_profile(corporate_number: str, results: Mapping[Optional[str], Any]) -> CompanyProfile:
+    """Merge per-endpoint detail responses (or the exceptions they raised) into one profile.
+
+    The basic-info record is used as the base; each section endpoint contributes
+    only its own field, so only that sub-tree of a section response is validated.
+    Failed sections are reported in ``errors``.
+    """
+    base: Optional[HojinInfo] = None
+    updates: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for sub_path, section, field in PROFILE_SECTIONS:
+        res = results.get(sub_path)
+        if isinstance(res, BaseException):
+            errors[section] = str(res) or type(res).__name__
+            continue
+        info = _first_hojin_info(res)
+        if info is None:
+            continue
+        if sub_path is None:
+            base = info.model()
+        elif field is not None:
+            if base is None:
+                base = info.model()
+            updates[field] = getattr(info, field)
+    if base is not None and updates:
+        base = base.model_copy(update=updates)
+    return CompanyProfile(corporate_number=corporate_number, hojin_info=base, errors=errors)
+
+
+def _bulk_result(corporate_number: str, future: Future[Any]) -> BulkLookupResult:
+    try:
+        data = future.result()
+    except Exception as e:  # noqa: BLE001
+        return BulkLookupResult(corporate_number=corporate_number, status="error", error=str(e))
+    return BulkLookupResult(corporate_number=corporate_number, status="ok", data=data)
+
+
+def _first_hojin_info(res: Any) -> Optional[LazyHojinInfo]:
+    if isinstance(res, LazyHojinInfoResponse) and res.hojin_infos:
+        return res.hojin_infos[0]
+    return None
+
+
+def split_corporate_numbers(
+    corporate_numbers: Iterable[str],
+) -> Tuple[List[str], List[BulkLookupResult]]:
+    """De-duplicate corporate numbers (keeping first-seen order) and reject malformed ones."""
+    valid: List[str] = []
+    invalid: List[BulkLookupResult] = []
+    seen: set[str] = set()
+    for raw in corporate_numbers:
+        number = raw.strip() if isinstance(raw, str) else raw
+        if number in seen:
+            continue
+        seen.add(number)
+        try:
+            valid.append(validate_corporate_number(number))
+        except ValueError as e:
+            invalid.append(
+                BulkLookupResult(corporate_number=str(number), status="invalid", error=str(e))
+            )
+    return valid, invalid
+
+
+def build_search_params(
+    options: Mapping[str, Any], *, page: int = 1, limit: int = 1000
+) -> Dict[str, str]:
+    """Translate ``search_companies`` keyword arguments into gBizINFO query parameters.
+
+    Strings are sent only when non-empty, numbers whenever they are not ``None``.
+    """
+    query: Dict[str, str] = {}
+    for key, param in _SEARCH_PARAMS:
+        value = options.get(key)
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            query[param] = "true" if value else "false"
+        elif isinstance(value, int):
+            query[param] = str(value)
+        elif value:
+            query[param] = str(value)
+    query["page"] = str(page)
+    query["limit"] = str(limit)
+    return query
+
+
+def canonical_search_query(query: Mapping[str, str]) -> str:
+    """Encode search parameters so that semantically identical searches compare equal.
+
+    Parameters are sorted by name, comma-separated code sets are de-duplicated and
+    sorted, API defaults are dropped and values are percent-encoded. The result is
+    both the upstream query string and the search cache key.
+    """
+    pairs: List[Tuple[str, str]] = []
+    for key in sorted(query):
+        value = query[key]
+        if key in _CSV_SET_PARAMS:
+            value = ",".join(sorted({v.strip() for v in value.split(",") if v.strip()}))
+            if not value:
+                continue
+        if _SEARCH_DEFAULTS.get(key) == value:
+            continue
+        pairs.append((key, value))
+    return urlencode(pairs, quote_via=quote)
+
+
+def split_search_options(options: Mapping[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Split a search into disjoint sub-searches whose union is the original result set.
+
+    Splits by ``corporate_type`` first, then by ``prefecture`` for corporate
+    types that always have one, then bisects a numeric range the query already
+    bounds on at least one side (an unbounded range would drop companies that
+    report no value). Sub-queries stay within the API's non-negative bounds.
+    Returns ``None`` when no split is possible.
+    """
+    types = [t for t in str(options.get("corporate_type") or "").split(",") if t]
+    if len(types) != 1:
+        return [{**options, "corporate_type": t} for t in (types or CORPORATE_TYPES)]
+    if not options.get("prefecture") and types[0] in _DOMESTIC_CORPORATE_TYPES:
+        return [{**options, "prefecture": code} for code in PREFECTURES]
+    for prefix in _BISECT_RANGES:
+        low, high = options.get(f"{prefix}_from"), options.get(f"{prefix}_to")
+        if low is None and high is None:
+            continue
+        # the API takes only non-negative bounds, so a missing lower bound is 0
+        low = max(low or 0, 0)
+        if high is None:
+            # open upper bound: peel off a doubling slice, the rest stays open
+            mid = low * 2 + 1
+        elif low < high:
+            mid = (low + high) // 2
+        else:
+            continue
+        return [
+            {**options, f"{prefix}_from": low, f"{prefix}_to": mid},
+            {**options, f"{prefix}_from": mid + 1, f"{prefix}_to": high},
+        ]
+    return None
+
+
+def plan_exhaustive_pages(
+    options: Mapping[str, Any], total: int
+) -> List[Tuple[Dict[str, Any], int]]:
+    """Follow-up ``(options, page)`` fetches after page 1 of a search reported ``total``."""
+    if total > SEARCH_MAX_PAGE * SEARCH_MAX_LIMIT:
+        parts = split_search_options(options)
+        if parts is not None:
+            return [(part, 1) for part in parts]
+        logging.getLogger(__name__).warning(
+            "exhaustive search cannot be split further; %s results truncated to %s",
+            total,
+            SEARCH_MAX_PAGE * SEARCH_MAX_LIMIT,
+        )
+    pages = min(SEARCH_MAX_PAGE, -(-total // SEARCH_MAX_LIMIT))
+    return [(dict(options), page) for page in range(2, pages + 1)]
+
+
+def parse_search_result(res: Any, *, page: int, limit: int) -> PaginatedResult[Company]:
+    items: List[dict] = []
+    total: int = 0
+    if isinstance(res, dict):
+        raw_items = res.get("hojin-infos") or res.get("items") or res.get("results") or []
+        if isinstance(raw_items, list):
+            items = [i for i in raw_items if isinstance(i, dict)]
+        total = int(res.get("total") or res.get("count") or res.get("total-count") or len(items))
+    return PaginatedResult[Company](
+        items=map_api_companies_to_domain(items),
+        total=total,
+        from_=page,
+        size=limit,
+    )
+
+
+def parse_update_page(res: Any, *, page: int) -> UpdateInfoPage:
+    items: list[dict] = []
+    if isinstance(res, dict):
+        raw_items = res.get("hojin-infos") or []
+        if isinstance(raw_items, list):
+            items = [i for i in raw_items if isinstance(i, dict)]
+    return UpdateInfoPage(
+        items=map_api_companies_to_domain(items),
+        pageNumber=int((res or {}).get("pageNumber") or page),
+        totalCount=int((res or {}).get("totalCount") or len(items)),
+        totalPage=int((res or {}).get("totalPage") or 1),
+    )
+
+
+class CompanyStream:
+    """Companies mapped one at a time from a streamed search or updateInfo response.
+
+    ``meta`` holds the other top-level fields of the response (``total``,
+    ``totalPage``, ...) read so far; all of them are known once iteration ends.
+    """
+
+    def __init__(self, items: Iterator[Any], decoder: JsonArrayItemDecoder) -> None:
+        self._items = items
+        self._decoder = decoder
+
+    def __iter__(self) -> Iterator[Company]:
+        try:
+            for item in self._items:
+                if isinstance(item, dict):
+                    yield map_api_company_to_domain(item)
+        except Exception as e:  # noqa: BLE001
+            raise ApiCommunicationError(str(e)) from e
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self._decoder.meta
+
+    @property
+    def total(self) -> int:
+        meta = self._decoder.meta
+        return int(meta.get("total") or meta.get("totalCount") or meta.get("count") or 0)
+
+    def close(self) -> None:
+        close = getattr(self._items, "close", None)
+        if close is not None:
+            close()
+
+
+class BaseGBizInfoService:
+    """URL building and caching shared by the blocking and asyncio services."""
+
+    def __init__(
+        self,
+        *,
+        cache: Optional[TTLCache] = None,
+        disk_cache: Optional[DiskCache] = None,
+        mirror: Optional[MirrorStore] = None,
+        search_cache: Optional[TTLCache] = None,
+        negative_cache: Optional[TTLCache] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        self._metrics = metrics or default_metrics()
         self._base_url = settings.gbizinfo_base_url.rstrip("/")
         self._update_base_url = f"{self._base_url}/updateInfo"
+        self._cache = cache if cache is not None else _default_response_cache()
+        self._cache_ttl_overrides = dict(settings.response_cache_ttl_overrides)
+        self._disk_cache = disk_cache if disk_cache is not None else _default_disk_cache()
+        self._mirror = mirror if mirror is not None else default_mirror_store()
+        self._search_cache = search_cache if search_cache is not None else _default_search_cache()
+        self._negative_cache = (
+            negative_cache if negative_cache is not None else _default_negative_cache()
+        )
 
     def _build_detail_url(self, corporate_number: str, sub_path: Optional[str] = None) -> str:
         base = f"{self._base_url}/{corporate_number}"
         return f"{base}/{sub_path}" if sub_path else base
 
-    def get_basic_info(self, corporate_number: str) -> Any:
-        url = self._build_detail_url(corporate_number)
+    # Period-specified update info
+    def _build_update_url(self, sub_path: Optional[str] = None) -> str:
+        return f"{self._update_base_url}/{sub_path}" if sub_path else self._update_base_url
+
+    def _build_update_query_url(
+        self, category: Optional[str], *, from_: str, to: str, page: int
+    ) -> str:
+        query = {
+            "from": from_,
+            "to": to,
+            "page": str(page),
+        }
+        return (
+            self._build_update_url(category) + "?" + "&".join(f"{k}={v}" for k, v in query.items())
+        )
+
+    def _build_search_url(self, canonical_query: str) -> str:
+        return f"{self._base_url}?{canonical_query}" if canonical_query else self._base_url
+
+    def _cached_search(self, canonical_query: str) -> Any:
+        if self._search_cache is None:
+            return None
+        return self._search_cache.get(canonical_query)
+
+    def _remember_search(self, canonical_query: str, res: Any) -> None:
+        if self._search_cache is not None and isinstance(res, dict):
+            self._search_cache.set(canonical_query, res)
+
+    @staticmethod
+    def _detail_disk_key(corporate_number: str, sub_path: Optional[str]) -> str:
+        return f"detail:{corporate_number}/{sub_path or ''}"
+
+    @staticmethod
+    def _update_disk_key(category: Optional[str], *, from_: str, to: str, page: int) -> str:
+        return f"update:{category or ''}?from={from_}&to={to}&page={page}"
+
+    @staticmethod
+    def _keeps_update_page(res: Any) -> bool:
+        """Whether an updateInfo page from upstream goes to the disk cache.
+
+        Empty pages are not kept: a range that is still open may fill later.
+        """
+        return isinstance(res, dict) and not is_empty_detail(res)
+
+    def _cached_detail(self, corporate_number: str, sub_path: Optional[str]) -> Optional[dict]:
+        if self._cache is None:
+            return None
+        return self._cache.get((corporate_number, sub_path))
+
+    def _remember_detail(self, corporate_number: str, sub_path: Optional[str], res: dict) -> None:
+        # empty answers go to the short-lived negative cache instead
+        if is_empty_detail(res):
+            self._remember_negative(corporate_number, sub_path, res)
+            return
+        if self._negative_cache is not None:
+            self._negative_cache.invalidate((corporate_number, sub_path))
+        if self._cache is None:
+            return
+        ttl = ttl_for(sub_path, settings.response_cache_ttl_seconds, self._cache_ttl_overrides)
+        self._cache.set((corporate_number, sub_path), res, ttl=ttl)
+
+    def _cached_negative(self, corporate_number: str, sub_path: Optional[str]) -> Any:
+        """The remembered empty payload (dict) or not-found message (str), if any."""
+        if self._negative_cache is None:
+            return None
+        return self._negative_cache.get((corporate_number, sub_path))
+
+    def _remember_negative(
+        self, corporate_number: str, sub_path: Optional[str], outcome: Union[dict, str]
+    ) -> None:
+        if self._negative_cache is not None:
+            self._negative_cache.set((corporate_number, sub_path), outcome)
+
+    def _answer_negative(self, corporate_number: str, sub_path: Optional[str]) -> Any:
+        """Replay a remembered "not found" / "empty" lookup, or return ``None``."""
+        outcome = self._cached_negative(corporate_number, sub_path)
+        if outcome is None:
+            return None
+        self._metrics.count_lookup("negative")
+        if isinstance(outcome, str):
+            raise ApiCommunicationError(outcome)
+        return LazyHojinInfoResponse(outcome)
+
+    def _search_local(
+        self,
+        options: Mapping[str, Any],
+        *,
+        page: int,
+        limit: int,
+        data_source: Optional[SearchDataSource],
+    ) -> Optional[PaginatedResult[Company]]:
+        """Answer a search from the mirror index, or return ``None`` to go upstream.
+
+        ``local`` fails when the index cannot answer the query and marks its result
+        ``source="mirror"``. The mirror holds only watched companies, so ``auto``
+        answers locally only what it can answer completely: a ``corporate_number``
+        lookup, or any query when ``MIRROR_COMPLETE`` is set. Everything else, and
+        a query the mirror has no match for, goes to the API.
+        """
+        mode = data_source or settings.search_data_source
+        if mode == "remote":
+            return None
+        if self._mirror is None:
+            if mode == "local":
+                raise InputValidationError("local search requires MIRROR_PATH", field="data_source")
+            return None
+        if mode == "auto" and not (settings.mirror_complete or options.get("corporate_number")):
+            return None
         try:
-            res = self._http.request(url)
-            if isinstance(res, dict):
-                return HojinInfoResponse.model_validate(res)
-            return res
-        except Exception as e:  # noqa: BLE001
-            raise ApiCommunicationError(str(e)) from e
+            result = self._mirror.search(options, page=page, limit=limit)
+        except UnsupportedLocalQueryError as e:
+            if mode == "local":
+                raise InputValidationError(str(e), field=e.fields[0]) from e
+            return None
+        if mode == "auto" and result.total == 0:
+            return None
+        return result
 
-    def get_certification(self, corporate_number: str) -> Any:
-        url = self._build_detail_url(corporate_number, "certification")
+    def cache_stats(self) -> Optional[CacheStats]:
+        return self._cache.stats() if self._cache is not None else None
+
+    def search_cache_stats(self) -> Optional[CacheStats]:
+        return self._search_cache.stats() if self._search_cache is not None else None
+
+    def negative_cache_stats(self) -> Optional[CacheStats]:
+        return self._negative_cache.stats() if self._negative_cache is not None else None
+
+    def disk_cache_stats(self) -> Optional[DiskCacheStats]:
+        return self._disk_cache.stats() if self._disk_cache is not None else None
+
+    def all_cache_stats(self) -> Dict[str, Union[CacheStats, DiskCacheStats]]:
+        """Stats of every configured cache: ``response``, ``search``, ``negative``, ``disk``."""
+        stats = {
+            "response": self.cache_stats(),
+            "search": self.search_cache_stats(),
+            "negative": self.negative_cache_stats(),
+            "disk": self.disk_cache_stats(),
+        }
+        return {name: s for name, s in stats.items() if s is not None}
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """Request metrics plus cache and coalescing counters, as plain JSON values."""
+        snapshot = self._metrics.snapshot()
+        snapshot["caches"] = {
+            name: cache_snapshot(stats) for name, stats in self.all_cache_stats().items()
+        }
+        http = getattr(self, "_http", None)
+        snapshot["coalesced_requests"] = getattr(http, "coalesced_requests", 0)
+        breakers = getattr(http, "circuit_breakers", None)
+        snapshot["circuit_breakers"] = breakers.snapshot() if breakers is not None else {}
+        pool_snapshot = getattr(http, "pool_snapshot", None)
+        snapshot["connection_pool"] = pool_snapshot() if pool_snapshot is not None else {}
+        return snapshot
+
+
+class GBizInfoService(BaseGBizInfoService):
+    def __init__(
+        self,
+        http_client: Optional[HttpClient] = None,
+        *,
+        cache: Optional[TTLCache] = None,
+        disk_cache: Optional[DiskCache] = None,
+        mirror: Optional[MirrorStore] = None,
+        search_cache: Optional[TTLCache] = None,
+        negative_cache: Optional[TTLCache] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ) -> None:
+        super().__init__(
+            cache=cache,
+            disk_cache=disk_cache,
+            mirror=mirror,
+            search_cache=search_cache,
+            negative_cache=negative_cache,
+            metrics=metrics,
+        )
+        self._http = http_client or HttpClient(metrics=self._metrics)
+
+    def warm_up(self, count: Optional[int] = None) -> int:
+        """Open keep-alive connections to the API ahead of the first call."""
+        return self._http.warm_up(count)
+
+    def _get_detail(self, corporate_number: str, sub_path: Optional[str] = None) -> Any:
+        cached = self._cached_detail(corporate_number, sub_path)
+        if cached is not None:
+            self._metrics.count_lookup("memory")
+            return LazyHojinInfoResponse(cached)
+        negative = self._answer_negative(corporate_number, sub_path)
+        if negative is not None:
+            return negative
+        url = self._build_detail_url(corporate_number, sub_path)
+        disk_key = self._detail_disk_key(corporate_number, sub_path)
         try:
-            res = self._http.request(url)
+            source = "mirror"
+            res = self._mirror.get(corporate_number, sub_path) if self._mirror is not None else None
+            if res is None and self._disk_cache is not None:
+                source = "disk"
+                res = self._disk_cache.get(disk_key)
+            if res is None:
+                source = "upstream"
+                res = self._http.request(url)
+                if (
+                    self._disk_cache is not None
+                    and isinstance(res, dict)
+                    and not is_empty_detail(res)
+                ):
+                    self._disk_cache.set(disk_key, res, update_date=extract_update_date(res))
+            self._metrics.count_lookup(source)
             if isinstance(res, dict):
-                return HojinInfoResponse.model_validate(res)
+                self._remember_detail(corporate_number, sub_path, res)
+                return LazyHojinInfoResponse(res)
             return res
         except Exception as e:  # noqa: BLE001
+            if is_not_found(e):
+                self._remember_negative(corporate_number, sub_path, str(e))
             raise ApiCommunicationError(str(e)) from e
 
-    def get_commendation(self, corporate_number: str) -> Any:
-        url = self._build_detail_url(corporate_number, "commendation")
+    def refresh_detail(self, corporate_number: str, sub_path: Optional[str] = None) -> Any:
+        """Fetch a detail payload from upstream, bypassing and then updating the caches.
+
+        Returns the raw JSON; used by the mirror sync for companies reported as changed.
+        """
+        url = self._build_detail_url(corporate_number, sub_path)
         try:
             res = self._http.request(url)
-            if isinstance(res, dict):
-                return HojinInfoResponse.model_validate(res)
-            return res
         except Exception as e:  # noqa: BLE001
             raise ApiCommunicationError(str(e)) from e
+        if isinstance(res, dict):
+            if self._disk_cache is not None:
+                self._disk_cache.set(
+                    self._detail_disk_key(corporate_number, sub_path),
+                    res,
+                    update_date=extract_update_date(res),
+                )
+            self._remember_detail(corporate_number, sub_path, res)
+        return res
+
+    def get_basic_info(self, corporate_number: str) -> Any:
+        return self._get_detail(corporate_number)
+
+    def get_certification(self, corporate_number: str) -> Any:
+        return self._get_detail(corporate_number, "certification")
+
+    def get_commendation(self, corporate_number: str) -> Any:
+        return self._get_detail(corporate_number, "commendation")
 
     def get_finance(self, corporate_number: str) -> Any:
-        url = self._build_detail_url(corporate_number, "finance")
-        try:
-            res = self._http.request(url)
-            if isinstance(res, dict):
-                return HojinInfoResponse.model_validate(res)
-            return res
-        except Exception as e:  # noqa: BLE001
-            raise ApiCommunicationError(str(e)) from e
+        return self._get_detail(corporate_number, "finance")
 
     def get_patent(self, corporate_number: str) -> Any:
-        url = self._build_detail_url(corporate_number, "patent")
-        try:
-            res = self._http.request(url)
-            if isinstance(res, dict):
-                return HojinInfoResponse.model_validate(res)
-            return res
-        except Exception as e:  # noqa: BLE001
-            raise ApiCommunicationError(str(e)) from e
+        return self._get_detail(corporate_number, "patent")
 
     def get_procurement(self, corporate_number: str) -> Any:
-        url = self._build_detail_url(corporate_number, "procurement")
-        try:
-            res = self._http.request(url)
-            if isinstance(res, dict):
-                return HojinInfoResponse.model_validate(res)
-            return res
-        except Exception as e:  # noqa: BLE001
-            raise ApiCommunicationError(str(e)) from e
+        return self._get_detail(corporate_number, "procurement")
 
     def get_subsidy(self, corporate_number: str) -> Any:
-        url = self._build_detail_url(corporate_number, "subsidy")
-        try:
-            res = self._http.request(url)
-            if isinstance(res, dict):
-                return HojinInfoResponse.model_validate(res)
-            return res
-        except Exception as e:  # noqa: BLE001
-            raise ApiCommunicationError(str(e)) from e
+        return self._get_detail(corporate_number, "subsidy")
 
     def get_workplace(self, corporate_number: str) -> Any:
-        url = self._build_detail_url(corporate_number, "workplace")
+        return self._get_detail(corporate_number, "workplace")
+
+    def iter_basic_info_bulk(
+        self, corporate_numbers: Iterable[str], *, max_workers: Optional[int] = None
+    ) -> Iterator[BulkLookupResult]:
+        """Look up many corporate numbers with a bounded worker pool.
+
+        Input is de-duplicated and validated first; invalid numbers are yielded
+        immediately. Results are yielded in completion order, with at most
+        ``max_workers`` requests in flight (each still subject to the rate limit).
+        """
+        valid, invalid = split_corporate_numbers(corporate_numbers)
+        yield from invalid
+        if not valid:
+            return
+        workers = max(1, max_workers or settings.bulk_max_workers)
+        pending: Dict[Future[Any], str] = {}
+        numbers = iter(valid)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for number in islice(numbers, workers):
+                pending[pool.submit(self.get_basic_info, number)] = number
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    number = pending.pop(future)
+                    yield _bulk_result(number, future)
+                    following = next(numbers, None)
+                    if following is not None:
+                        pending[pool.submit(self.get_basic_info, following)] = following
+
+    def iter_search_exhaustive(
+        self, *, max_workers: Optional[int] = None, **options: Any
+    ) -> Iterator[Company]:
+        """Yield every company matching a search, past the 10-page cap.
+
+        Takes the filters of ``search_companies``. When a search matches more than
+        the API can page to, it is split into disjoint sub-searches (see
+        ``split_search_options``) that run concurrently under the rate limit.
+        Companies are yielded in completion order, each corporate number once.
+        """
+        preflight(check_search(options))
+        workers = max(1, max_workers or settings.exhaustive_search_workers)
+        seen: set[str] = set()
+        pending: Dict[Future[PaginatedResult[Company]], Tuple[Dict[str, Any], int]] = {}
+        pool = ThreadPoolExecutor(max_workers=workers)
+
+        def submit(opts: Dict[str, Any], page: int) -> None:
+            future = pool.submit(
+                self.search_companies,
+                page=page,
+                limit=SEARCH_MAX_LIMIT,
+                data_source="remote",
+                **opts,
+            )
+            pending[future] = (opts, page)
+
         try:
-            res = self._http.request(url)
-            if isinstance(res, dict):
-                return HojinInfoResponse.model_validate(res)
-            return res
-        except Exception as e:  # noqa: BLE001
-            raise ApiCommunicationError(str(e)) from e
+            submit(dict(options), 1)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    opts, page = pending.pop(future)
+                    result = future.result()
+                    if page == 1:
+                        for follow_opts, follow_page in plan_exhaustive_pages(opts, result.total):
+                            submit(follow_opts, follow_page)
+                    for company in result.items:
+                        if company.corporate_number not in seen:
+                            seen.add(company.corporate_number)
+                            yield company
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
 
-    # Period-specified update info
-    def _build_update_url(self, sub_path: Optional[str] = None) -> str:
-        return f"{self._update_base_url}/{sub_path}" if sub_path else self._update_base_url
+    def stream_search_companies(
+        self, *, page: int = 1, limit: int = 1000, **options: Any
+    ) -> CompanyStream:
+        """Like ``search_companies`` but decodes the response while it downloads.
+
+        Peak memory no longer grows with ``limit``; results bypass the search cache.
+        """
+        preflight(check_search(options))
+        key = canonical_search_query(build_search_params(options, page=page, limit=limit))
+        decoder = JsonArrayItemDecoder("hojin-infos")
+        return CompanyStream(self._http.stream_json(self._build_search_url(key), decoder), decoder)
+
+    def stream_update_info(
+        self, category: Optional[str] = None, *, from_: str, to: str, page: int = 1
+    ) -> CompanyStream:
+        """Streamed counterpart of ``get_update_info_page``; see ``stream_search_companies``."""
+        preflight(check_update_range(from_, to))
+        url = self._build_update_query_url(category, from_=from_, to=to, page=page)
+        decoder = JsonArrayItemDecoder("hojin-infos")
+        return CompanyStream(self._http.stream_json(url, decoder), decoder)
 
     def get_update_info(self, *, from_: str, to: str, page: int = 1) -> UpdateInfoPage:
-        url = self._build_update_url()
-        query = {
-            "from": from_,
-            "to": to,
-            "page": str(page),
-        }
-        url = url + "?" + "&".join(f"{k}={v}" for k, v in query.items())
-        try:
-            res = self._http.request(url)
-            items: list[dict] = []
-            if isinstance(res, dict):
-                raw_items = res.get("hojin-infos") or []
-                if isinstance(raw_items, list):
-                    items = [i for i in raw_items if isinstance(i, dict)]
-            return UpdateInfoPage(
-                items=[map_api_company_to_domain(i) for i in items],
-                pageNumber=int((res or {}).get("pageNumber") or page),
-                totalCount=int((res or {}).get("totalCount") or len(items)),
-                totalPage=int((res or {}).get("totalPage") or 1),
-            )
-        except Exception as e:  # noqa: BLE001
-            raise ApiCommunicationError(str(e)) from e
+        return self._get_update_info_category(None, from_=from_, to=to, page=page)
 
     def get_update_info_certification(
         self, *, from_: str, to: str, page: int = 1
@@ -156,29 +861,74 @@ class GBizInfoService:
     def get_update_info_workplace(self, *, from_: str, to: str, page: int = 1) -> UpdateInfoPage:
         return self._get_update_info_category("workplace", from_=from_, to=to, page=page)
 
+    def get_update_info_page(
+        self, category: Optional[str] = None, *, from_: str, to: str, page: int = 1
+    ) -> UpdateInfoPage:
+        """One page of the basic (``category=None``) or a category updateInfo feed."""
+        return self._get_update_info_category(category, from_=from_, to=to, page=page)
+
+    def refresh_update_info_page(
+        self, category: Optional[str] = None, *, from_: str, to: str, page: int = 1
+    ) -> UpdateInfoPage:
+        """``get_update_info_page`` from upstream, bypassing and then updating the disk cache.
+
+        Used by the mirror sync, whose same-day re-polls must see later updates.
+        """
+        return self._get_update_info_category(category, from_=from_, to=to, page=page, refresh=True)
+
+    def iter_update_info(
+        self,
+        category: Optional[str] = None,
+        *,
+        from_: str,
+        to: str,
+        window: Optional[int] = None,
+    ) -> Iterator[Company]:
+        """Yield every company of an updateInfo range, fetching pages ahead concurrently.
+
+        Page 1 is fetched first to learn ``totalPage``; the remaining pages are
+        fetched with at most ``window`` requests in flight. Items are yielded in
+        page order, so only the pages the consumer has not reached are held.
+        """
+        first = self._get_update_info_category(category, from_=from_, to=to, page=1)
+        yield from first.items
+        pages = iter(range(2, first.totalPage + 1))
+        workers = max(1, window or settings.update_info_page_window)
+        pool = ThreadPoolExecutor(max_workers=workers)
+        pending: deque[Future[UpdateInfoPage]] = deque()
+
+        def submit(page: int) -> None:
+            pending.append(
+                pool.submit(self._get_update_info_category, category, from_=from_, to=to, page=page)
+            )
+
+        try:
+            for page in islice(pages, workers):
+                submit(page)
+            while pending:
+                result = pending.popleft().result()
+                following = next(pages, None)
+                if following is not None:
+                    submit(following)
+                yield from result.items
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
     def _get_update_info_category(
-        self, category: str, *, from_: str, to: str, page: int
+        self, category: Optional[str], *, from_: str, to: str, page: int, refresh: bool = False
     ) -> UpdateInfoPage:
-        url = self._build_update_url(category)
-        query = {
-            "from": from_,
-            "to": to,
-            "page": str(page),
-        }
-        url = url + "?" + "&".join(f"{k}={v}" for k, v in query.items())
+        preflight(check_update_range(from_, to))
+        url = self._build_update_query_url(category, from_=from_, to=to, page=page)
+        disk_key = self._update_disk_key(category, from_=from_, to=to, page=page)
         try:
-            res = self._http.request(url)
-            items: list[dict] = []
-            if isinstance(res, dict):
-                raw_items = res.get("hojin-infos") or []
-                if isinstance(raw_items, list):
-                    items = [i for i in raw_items if isinstance(i, dict)]
-            return UpdateInfoPage(
-                items=[map_api_company_to_domain(i) for i in items],
-                pageNumber=int((res or {}).get("pageNumber") or page),
-                totalCount=int((res or {}).get("totalCount") or len(items)),
-                totalPage=int((res or {}).get("totalPage") or 1),
-            )
+            res = None
+            if self._disk_cache is not None and not refresh:
+                res = self._disk_cache.get(disk_key)
+            if res is None:
+                res = self._http.request(url)
+                if self._disk_cache is not None and self._keeps_update_page(res):
+                    self._disk_cache.set(disk_key, res)
+            return parse_update_page(res, page=page)
         except Exception as e:  # noqa: BLE001
             raise ApiCommunicationError(str(e)) from e
 
@@ -232,128 +982,21 @@ class GBizInfoService:
         source: Optional[str] = None,
         page: int = 1,
         limit: int = 1000,
+        data_source: Optional[SearchDataSource] = None,
     ) -> PaginatedResult[Company]:
-        query: Dict[str, str] = {}
-        if name:
-            query["name"] = name
-        if corporate_number:
-            query["corporate_number"] = corporate_number
-        if corporate_type:
-            query["corporate_type"] = corporate_type
-        if exist_flg is not None:
-            query["exist_flg"] = "true" if exist_flg else "false"
-        if prefecture:
-            query["prefecture"] = prefecture
-        if city:
-            query["city"] = city
-        if address:
-            query["address"] = address
-        if industry:
-            query["industry"] = industry
-        if business_item:
-            query["business_item"] = business_item
-        if founded_year:
-            query["founded_year"] = founded_year
-        if sales_area:
-            query["sales_area"] = sales_area
-        if unified_qualification:
-            query["unified_qualification"] = unified_qualification
-        if unified_qualification_sub01:
-            query["unified_qualification_sub01"] = unified_qualification_sub01
-        if unified_qualification_sub02:
-            query["unified_qualification_sub02"] = unified_qualification_sub02
-        if unified_qualification_sub03:
-            query["unified_qualification_sub03"] = unified_qualification_sub03
-        if unified_qualification_sub04:
-            query["unified_qualification_sub04"] = unified_qualification_sub04
-        if net_sales_from is not None:
-            query["net_sales_summary_of_business_results_from"] = str(net_sales_from)
-        if net_sales_to is not None:
-            query["net_sales_summary_of_business_results_to"] = str(net_sales_to)
-        if net_income_loss_from is not None:
-            query["net_income_loss_summary_of_business_results_from"] = str(net_income_loss_from)
-        if net_income_loss_to is not None:
-            query["net_income_loss_summary_of_business_results_to"] = str(net_income_loss_to)
-        if total_assets_from is not None:
-            query["total_assets_summary_of_business_results_from"] = str(total_assets_from)
-        if total_assets_to is not None:
-            query["total_assets_summary_of_business_results_to"] = str(total_assets_to)
-        if operating_revenue1_from is not None:
-            query["operating_revenue1_summary_of_business_results_from"] = str(
-                operating_revenue1_from
-            )
-        if operating_revenue1_to is not None:
-            query["operating_revenue1_summary_of_business_results_to"] = str(operating_revenue1_to)
-        if operating_revenue2_from is not None:
-            query["operating_revenue2_summary_of_business_results_from"] = str(
-                operating_revenue2_from
-            )
-        if operating_revenue2_to is not None:
-            query["operating_revenue2_summary_of_business_results_to"] = str(operating_revenue2_to)
-        if ordinary_income_loss_from is not None:
-            query["ordinary_income_loss_summary_of_business_results_from"] = str(
-                ordinary_income_loss_from
-            )
-        if ordinary_income_loss_to is not None:
-            query["ordinary_income_loss_summary_of_business_results_to"] = str(
-                ordinary_income_loss_to
-            )
-        if ordinary_income_from is not None:
-            query["ordinary_income_summary_of_business_results_from"] = str(ordinary_income_from)
-        if ordinary_income_to is not None:
-            query["ordinary_income_summary_of_business_results_to"] = str(ordinary_income_to)
-        if capital_stock_from is not None:
-            query["capital_stock_from"] = str(capital_stock_from)
-        if capital_stock_to is not None:
-            query["capital_stock_to"] = str(capital_stock_to)
-        if employee_number_from is not None:
-            query["employee_number_from"] = str(employee_number_from)
-        if employee_number_to is not None:
-            query["employee_number_to"] = str(employee_number_to)
-        if establishment_from:
-            query["establishment_from"] = establishment_from
-        if establishment_to:
-            query["establishment_to"] = establishment_to
-        if name_major_shareholders:
-            query["name_major_shareholders"] = name_major_shareholders
-        if average_continuous_service_years:
-            query["average_continuous_service_years"] = average_continuous_service_years
-        if average_age:
-            query["average_age"] = average_age
-        if month_average_predetermined_overtime_hours:
-            query["month_average_predetermined_overtime_hours"] = (
-                month_average_predetermined_overtime_hours
-            )
-        if female_workers_proportion:
-            query["female_workers_proportion"] = female_workers_proportion
-        if year:
-            query["year"] = year
-        if ministry:
-            query["ministry"] = ministry
-        if source:
-            query["source"] = source
-
-        query["page"] = str(page)
-        query["limit"] = str(limit)
-
-        url = f"{self._base_url}?" + "&".join(f"{k}={v}" for k, v in query.items())
-
+        options = {
+            k: v for k, v in locals().items() if k not in ("self", "page", "limit", "data_source")
+        }
+        preflight(check_search(options))
+        local = self._search_local(options, page=page, limit=limit, data_source=data_source)
+        if local is not None:
+            return local
+        key = canonical_search_query(build_search_params(options, page=page, limit=limit))
         try:
-            res = self._http.request(url)
-            items: List[dict] = []
-            total: int = 0
-            if isinstance(res, dict):
-                raw_items = res.get("hojin-infos") or res.get("items") or res.get("results") or []
-                if isinstance(raw_items, list):
-                    items = [i for i in raw_items if isinstance(i, dict)]
-                total = int(
-                    res.get("total") or res.get("count") or res.get("total-count") or len(items)
-                )
-            return PaginatedResult[Company](
-                items=[map_api_company_to_domain(i) for i in items],
-                total=total,
-                from_=page,
-                size=limit,
-            )
+            res = self._cached_search(key)
+            if res is None:
+                res = self._http.request(self._build_search_url(key))
+                self._remember_search(key, res)
+            return parse_search_result(res, page=page, limit=limit)
         except Exception as e:  # noqa: BLE001
             raise ApiCommunicationError(str(e)) from e
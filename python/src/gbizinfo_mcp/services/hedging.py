@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from ..config import settings
+from .metrics import endpoint_template
+
+_WINDOW = 200  # latencies kept per endpoint
+_REFRESH_EVERY = 20  # samples between threshold recomputations
+_MIN_SAMPLES = 20
+
+
+class _EndpointLatency:
+    __slots__ = ("samples", "threshold", "pending")
+
+    def __init__(self) -> None:
+        self.samples: Deque[float] = deque(maxlen=_WINDOW)
+        self.threshold: Optional[float] = None
+        self.pending = 0
+
+
+class HedgePolicy:
+    """When to send a second copy of a slow idempotent GET, and how many may be sent.
+
+    The hedge delay of an endpoint is the ``percentile`` of its recent
+    successful response times (``initial_delay`` until enough are known),
+    never below ``min_delay``. Every primary request earns ``budget_ratio``
+    of a hedge and every hedge spends one, so hedges add at most that
+    fraction of extra requests; unspent budget is capped at ``max_tokens``.
+    """
+
+    def __init__(
+        self,
+        *,
+        percentile: float = 95.0,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.05,
+        budget_ratio: float = 0.05,
+        max_tokens: float = 10.0,
+    ) -> None:
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.budget_ratio = budget_ratio
+        self.max_tokens = max_tokens
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _EndpointLatency] = {}
+        self._tokens = 0.0
+
+    @classmethod
+    def from_settings(cls) -> Optional[HedgePolicy]:
+        """The configured policy, or ``None`` when hedging is off."""
+        if not settings.hedge_requests:
+            return None
+        return cls(
+            percentile=settings.hedge_percentile,
+            initial_delay=settings.hedge_initial_delay_seconds,
+            min_delay=settings.hedge_min_delay_seconds,
+            budget_ratio=settings.hedge_budget_ratio,
+        )
+
+    def _entry(self, url: str) -> _EndpointLatency:
+        endpoint = endpoint_template(url)
+        entry = self._endpoints.get(endpoint)
+        if entry is None:
+            entry = self._endpoints[endpoint] = _EndpointLatency()
+        return entry
+
+    def delay(self, url: str) -> float:
+        """Seconds to wait for the primary request before hedging; earns budget."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.budget_ratio)
+            threshold = self._entry(url).threshold
+        return max(self.min_delay, self.initial_delay if threshold is None else threshold)
+
+    def try_spend(self) -> bool:
+        """Take one hedge from the budget, if there is one."""
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def record(self, url: str, seconds: float) -> None:
+        """Feed the response time of a successful request."""
+        with self._lock:
+            entry = self._entry(url)
+            entry.samples.append(seconds)
+            entry.pending += 1
+            if entry.pending < _REFRESH_EVERY or len(entry.samples) < _MIN_SAMPLES:
+                return
+            entry.pending = 0
+            ordered = sorted(entry.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        entry.threshold = ordered[index]
+
+    def thresholds(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            return {name: e.threshold for name, e in sorted(self._endpoints.items())}
@@ -4,15 +4,26 @@ import json
 import logging
 import threading
 import time
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+    as_completed,
+)
 from dataclasses import dataclass
-from typing import Any, Dict, Mapping, Optional, Tuple
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
 
 import requests
 from requests import Response
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from ..config import AUTH_HEADER_NAME, settings
+from .hedging import HedgePolicy
+from .json_stream import JsonArrayItemDecoder
+from .metrics import MetricsRegistry, default_metrics, endpoint_template
+from .pool import PooledAdapter
+from .rate_limit import TokenBucket, default_rate_limiter
+from .retry import CircuitBreaker, CircuitBreakers, RetryPolicy
+from .singleflight import SingleFlight, canonical_request_key
 
 
 @dataclass
@@ -33,120 +44,414 @@ class ApiServerError(Exception):
         self.details = details
 
 
+class CircuitOpenError(ApiServerError):
+    """Raised without contacting the API while the endpoint's circuit breaker is open."""
+
+    def __init__(self, endpoint: str, retry_in: float) -> None:
+        super().__init__(
+            503, f"circuit breaker open for {endpoint}; retry in {max(0.0, retry_in):.1f}s"
+        )
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
 class HttpClient:
-    def __init__(self, *, debug: bool = False) -> None:
+    """Blocking client for the gBizINFO API.
+
+    429 and 5xx responses and connection errors are retried per ``RetryPolicy``
+    (``Retry-After`` aware, jittered backoff); each endpoint template has a
+    circuit breaker that fails calls fast while the endpoint keeps failing.
+    With a ``HedgePolicy``, plain GETs that are slower than the endpoint's
+    hedge delay are raced against a second request. Connections come from a
+    ``PooledAdapter`` sized by the settings, which counts them and closes
+    idle ones.
+    """
+
+    def __init__(
+        self,
+        *,
+        debug: bool = False,
+        rate_limiter: Optional[TokenBucket] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breakers: Optional[CircuitBreakers] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        adapter: Optional[PooledAdapter] = None,
+    ) -> None:
         self._debug = debug or settings.debug_http
         self._session = requests.Session()
-        self._lock = threading.Lock()
-        self._last_request_ts: float | None = None
-
-        retry = Retry(
-            total=settings.retries,
-            backoff_factor=0.5,
-            status_forcelist=(500, 502, 503, 504),
-            allowed_methods=("GET", "POST", "PUT", "PATCH", "DELETE"),
-            raise_on_status=False,
+        self._adapter = adapter or PooledAdapter.from_settings()
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+        self._rate_limiter = rate_limiter or default_rate_limiter()
+        self._metrics = metrics or default_metrics()
+        self._single_flight = SingleFlight() if settings.request_coalescing else None
+        self._retry = retry_policy or RetryPolicy.from_settings()
+        self._breakers = (
+            circuit_breakers if circuit_breakers is not None else CircuitBreakers.from_settings()
         )
-        adapter = HTTPAdapter(max_retries=retry)
-        self._session.mount("http://", adapter)
-        self._session.mount("https://", adapter)
+        self._hedge = hedge_policy if hedge_policy is not None else HedgePolicy.from_settings()
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self._hedge_pool_lock = threading.Lock()
+        # one hedge thread per pooled connection; requests submitted and not yet done
+        self._hedge_workers = max(1, settings.http_pool_maxsize)
+        self._hedge_busy = 0
 
     def request(self, url: str, options: Optional[HttpRequestOptions] = None) -> Any:
         if options is None:
             options = HttpRequestOptions()
 
         method = options.method or "GET"
-        connect_timeout = settings.connect_timeout_seconds
-        read_timeout = settings.request_timeout_seconds
-        timeout = options.timeout or (connect_timeout, read_timeout)
-
-        headers: Dict[str, str] = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "User-Agent": settings.user_agent,
-            AUTH_HEADER_NAME: settings.gbizinfo_api_token,
-        }
-        if options.headers:
-            headers.update(dict(options.headers))
-
-        data = None
-        if options.body is not None:
-            data = json.dumps(options.body, ensure_ascii=False)
-
-        # naive rate limiting (per-process)
-        if settings.rate_limit_per_sec:
-            with self._lock:
-                now = time.perf_counter()
-                if self._last_request_ts is not None:
-                    min_interval = 1.0 / float(settings.rate_limit_per_sec)
-                    elapsed = now - self._last_request_ts
-                    if elapsed < min_interval:
-                        time.sleep(min_interval - elapsed)
-                self._last_request_ts = time.perf_counter()
+        timeout = options.timeout or (
+            settings.connect_timeout_seconds,
+            settings.request_timeout_seconds,
+        )
+        headers = build_headers(options.headers)
+        data = encode_body(options.body)
+
+        if not is_coalescible(method, options):
+            return self._send(method, url, headers, data, timeout)
+        send = self._send_hedged if self._hedge is not None else self._send
+        if self._single_flight is not None:
+            return self._single_flight.do(
+                canonical_request_key(method, url),
+                lambda: send(method, url, headers, data, timeout),
+            )
+        return send(method, url, headers, data, timeout)
+
+    @property
+    def coalesced_requests(self) -> int:
+        """Number of calls answered by joining an identical in-flight request."""
+        return self._single_flight.coalesced if self._single_flight is not None else 0
+
+    @property
+    def hedge_policy(self) -> Optional[HedgePolicy]:
+        return self._hedge
+
+    @property
+    def circuit_breakers(self) -> Optional[CircuitBreakers]:
+        return self._breakers
 
+    def pool_snapshot(self) -> Dict[str, int]:
+        """Connections in use / idle, and counts of created, reused, discarded and reaped ones."""
+        return self._adapter.snapshot()
+
+    def warm_up(self, count: Optional[int] = None) -> int:
+        """Open ``count`` (default: the configured number of) keep-alive connections to the API.
+
+        Returns the number of connections ready for reuse; failures are logged.
+        """
+        if count is None:
+            count = settings.http_warmup_connections
+        url = settings.gbizinfo_base_url
+        # the TLS settings requests will use for the URL (e.g. REQUESTS_CA_BUNDLE) pick the pool
+        env = self._session.merge_environment_settings(url, {}, None, None, None)
+        if requests.utils.select_proxy(url, env["proxies"]):
+            return 0  # proxied requests do not use the direct connection pool
+        return self._adapter.warm_up(
+            url,
+            count,
+            verify=env["verify"],
+            cert=env["cert"],
+            timeout=settings.connect_timeout_seconds,
+        )
+
+    def _open(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[str],
+        timeout: Tuple[float, float],
+        *,
+        stream: bool = False,
+    ) -> Tuple[Response, int]:
+        """Send with retries; returns the final response and the number of retries.
+
+        Failed calls (no response) are recorded in the metrics here.
+        """
+        breaker = check_circuit(self._breakers, url, self._metrics)
         if self._debug:
-            logging.getLogger(__name__).error(
-                "http_request %s %s headers=%s bodyBytes=%s",
-                method,
-                url,
-                _redact_headers(headers),
-                len(data.encode("utf-8")) if isinstance(data, str) else 0,
+            log_request(method, url, headers, data)
+        started = time.perf_counter()
+        retries = 0
+        while True:
+            if self._rate_limiter is not None:
+                self._metrics.observe_rate_limit_wait(self._rate_limiter.acquire())
+            try:
+                response = self._session.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    data=data,
+                    timeout=timeout,
+                    stream=stream,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if retries < self._retry.retries:
+                    retries += 1
+                    time.sleep(self._retry.backoff(retries))
+                    continue
+                if breaker is not None:
+                    breaker.record_failure()
+                self._metrics.observe_request(
+                    url, status=None, seconds=time.perf_counter() - started, retries=retries
+                )
+                raise
+            except Exception:
+                self._metrics.observe_request(
+                    url, status=None, seconds=time.perf_counter() - started, retries=retries
+                )
+                raise
+            delay = self._retry.delay(
+                retries, response.status_code, response.headers.get("Retry-After")
             )
+            if delay is None:
+                break
+            retries += 1
+            response.close()
+            time.sleep(delay)
+        record_outcome(breaker, response.status_code)
+        return response, retries
 
-        response: Response = self._session.request(
-            method=method,
-            url=url,
-            headers=headers,
-            data=data,
-            timeout=timeout,
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[str],
+        timeout: Tuple[float, float],
+    ) -> Any:
+        started = time.perf_counter()
+        response, retries = self._open(method, url, headers, data, timeout)
+        self._metrics.observe_request(
+            url,
+            status=response.status_code,
+            seconds=time.perf_counter() - started,
+            bytes_received=len(response.content or b""),
+            retries=retries,
         )
 
         content_type = (response.headers.get("content-type") or "").lower()
         text = response.text or ""
+        return parse_response(response.status_code, content_type, text, url=url, debug=self._debug)
+
+    def _timed_send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[str],
+        timeout: Tuple[float, float],
+    ) -> Any:
+        started = time.perf_counter()
+        result = self._send(method, url, headers, data, timeout)
+        self._hedge.record(url, time.perf_counter() - started)  # type: ignore[union-attr]
+        return result
 
-        if not response.ok:
-            message = f"HTTP {response.status_code}"
-            err_id: Optional[str] = None
-            details: Any = None
-            if content_type.startswith("application/json"):
-                try:
-                    payload = response.json()
-                    if isinstance(payload, dict):
-                        if payload.get("message"):
-                            message = str(payload["message"])  # type: ignore[index]
-                        if payload.get("id"):
-                            err_id = str(payload["id"])  # type: ignore[index]
-                        if payload.get("errors"):
-                            details = payload.get("errors")
-                except ValueError:
-                    # ignore invalid JSON
-                    pass
-            else:
-                if text:
-                    message = f"{message}: {text[:500]}"
-            if self._debug:
-                logging.getLogger(__name__).error(
-                    "http_response_error %s url=%s status=%s id=%s preview=%s",
-                    message,
-                    url,
-                    response.status_code,
-                    err_id,
-                    (text[:500] if text else ""),
+    def _send_hedged(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[str],
+        timeout: Tuple[float, float],
+    ) -> Any:
+        """``_send``, raced against a second request if it is slower than the hedge delay.
+
+        The first successful answer wins; the slower request finishes in the
+        background and its result is dropped. No hedge is sent while every
+        worker is busy: it would only queue behind the requests it should race.
+        """
+        hedge = self._hedge
+        assert hedge is not None
+        args = (method, url, headers, data, timeout)
+        primary = self._submit_hedged(args)
+        try:
+            return primary.result(timeout=hedge.delay(url))
+        except FutureTimeoutError:
+            pass
+        with self._hedge_pool_lock:
+            idle = self._hedge_busy < self._hedge_workers
+        if not idle or not hedge.try_spend():
+            return primary.result()
+        backup = self._submit_hedged(args)
+        for future in as_completed((primary, backup)):
+            if future.exception() is None:
+                self._metrics.observe_hedge(url, won=future is backup)
+                return future.result()
+        self._metrics.observe_hedge(url, won=False)
+        return primary.result()  # raises the primary's error
+
+    def _submit_hedged(self, args: Tuple[Any, ...]) -> Future[Any]:
+        with self._hedge_pool_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(
+                    max_workers=self._hedge_workers, thread_name_prefix="gbizinfo-hedge"
                 )
+            self._hedge_busy += 1
+            pool = self._hedge_pool
+        future = pool.submit(self._timed_send, *args)
+        future.add_done_callback(self._release_hedge_worker)
+        return future
+
+    def _release_hedge_worker(self, future: Future[Any]) -> None:  # noqa: ARG002
+        with self._hedge_pool_lock:
+            self._hedge_busy -= 1
 
-            raise ApiServerError(response.status_code, message, id=err_id, details=details)
+    def stream_json(self, url: str, decoder: JsonArrayItemDecoder) -> Iterator[Any]:
+        """GET ``url`` and yield the items ``decoder`` extracts while the body downloads.
 
+        Error responses are read in full and raise ``ApiServerError`` like ``request``.
+        Streamed bodies are not shared with the single-flight layer.
+        """
+        timeout = (settings.connect_timeout_seconds, settings.request_timeout_seconds)
+        started = time.perf_counter()
+        response, retries = self._open("GET", url, build_headers(), None, timeout, stream=True)
+        status = response.status_code
+        received = 0
+        try:
+            with response:
+                content_type = (response.headers.get("content-type") or "").lower()
+                if not 200 <= response.status_code < 400 or not content_type.startswith(
+                    "application/json"
+                ):
+                    received = len(response.content or b"")
+                    parse_response(
+                        response.status_code,
+                        content_type,
+                        response.text or "",
+                        url=url,
+                        debug=self._debug,
+                    )
+                    raise ApiServerError(
+                        response.status_code, f"expected JSON, got {content_type!r}"
+                    )
+                for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+                    received += len(chunk)
+                    yield from decoder.feed(chunk)
+                yield from decoder.close()
+        finally:
+            self._metrics.observe_request(
+                url,
+                status=status,
+                seconds=time.perf_counter() - started,
+                bytes_received=received,
+                retries=retries,
+            )
+
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def check_circuit(
+    breakers: Optional[CircuitBreakers], url: str, metrics: MetricsRegistry
+) -> Optional[CircuitBreaker]:
+    """The breaker guarding ``url``; raises ``CircuitOpenError`` if it refuses the call."""
+    if breakers is None:
+        return None
+    breaker = breakers.for_url(url)
+    retry_in = breaker.allow()
+    if retry_in is not None:
+        endpoint = endpoint_template(url)
+        metrics.count_circuit_rejection(endpoint)
+        raise CircuitOpenError(endpoint, retry_in)
+    return breaker
+
+
+def record_outcome(breaker: Optional[CircuitBreaker], status: int) -> None:
+    # any answer below 500 (including 429) shows the endpoint is up
+    if breaker is None:
+        return
+    if status >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+def is_coalescible(method: str, options: HttpRequestOptions) -> bool:
+    # only plain idempotent reads can safely share one upstream response
+    return method.upper() == "GET" and options.body is None and not options.headers
+
+
+def build_headers(extra: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+    headers: Dict[str, str] = {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+        "User-Agent": settings.user_agent,
+        AUTH_HEADER_NAME: settings.gbizinfo_api_token,
+    }
+    if extra:
+        headers.update(dict(extra))
+    return headers
+
+
+def encode_body(body: Any) -> Optional[str]:
+    if body is None:
+        return None
+    return json.dumps(body, ensure_ascii=False)
+
+
+def log_request(method: str, url: str, headers: Mapping[str, str], data: Optional[str]) -> None:
+    logging.getLogger(__name__).error(
+        "http_request %s %s headers=%s bodyBytes=%s",
+        method,
+        url,
+        _redact_headers(headers),
+        len(data.encode("utf-8")) if isinstance(data, str) else 0,
+    )
+
+
+def parse_response(
+    status_code: int, content_type: str, text: str, *, url: str, debug: bool = False
+) -> Any:
+    """Map a raw HTTP response to a JSON value / text, raising ``ApiServerError`` on failure.
+
+    Shared by the blocking and asyncio clients so both surface identical errors.
+    """
+    if not 200 <= status_code < 400:
+        message = f"HTTP {status_code}"
+        err_id: Optional[str] = None
+        details: Any = None
         if content_type.startswith("application/json"):
-            if self._debug:
-                logging.getLogger(__name__).error(
-                    "http_response_ok status=%s url=%s contentType=%s preview=%s",
-                    response.status_code,
-                    url,
-                    content_type,
-                    (text[:500] if text else ""),
-                )
-            return response.json() if text else None
-        return text
+            try:
+                payload = json.loads(text) if text else None
+                if isinstance(payload, dict):
+                    if payload.get("message"):
+                        message = str(payload["message"])
+                    if payload.get("id"):
+                        err_id = str(payload["id"])
+                    if payload.get("errors"):
+                        details = payload.get("errors")
+            except ValueError:
+                # ignore invalid JSON
+                pass
+        else:
+            if text:
+                message = f"{message}: {text[:500]}"
+        if debug:
+            logging.getLogger(__name__).error(
+                "http_response_error %s url=%s status=%s id=%s preview=%s",
+                message,
+                url,
+                status_code,
+                err_id,
+                (text[:500] if text else ""),
+            )
+
+        raise ApiServerError(status_code, message, id=err_id, details=details)
+
+    if content_type.startswith("application/json"):
+        if debug:
+            logging.getLogger(__name__).error(
+                "http_response_ok status=%s url=%s contentType=%s preview=%s",
+                status_code,
+                url,
+                content_type,
+                (text[:500] if text else ""),
+            )
+        return json.loads(text) if text else None
+    return text
 
 
 def _redact_headers(headers: Mapping[str, str]) -> Dict[str, str]:
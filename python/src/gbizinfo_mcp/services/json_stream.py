@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Dict, List, Optional
+
+_WHITESPACE = " \t\r\n"
+_INCOMPLETE = object()
+
+
+class JsonArrayItemDecoder:
+    """Incrementally decode the items of one array member of a top-level JSON object.
+
+    Bytes are pushed with ``feed`` as they arrive; each call returns the array
+    items completed so far, so only the undecoded tail is ever buffered. The
+    other top-level members are collected in ``meta``. Push-based so the
+    blocking and asyncio clients can share it.
+    """
+
+    def __init__(self, key: str = "hojin-infos") -> None:
+        self._key = key
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._member: Optional[str] = None
+        self.meta: Dict[str, Any] = {}
+
+    def feed(self, data: bytes) -> List[Any]:
+        self._buf = self._buf[self._pos :] + self._utf8.decode(data)
+        self._pos = 0
+        return self._drain(eof=False)
+
+    def close(self) -> List[Any]:
+        self._buf = self._buf[self._pos :] + self._utf8.decode(b"", final=True)
+        self._pos = 0
+        items = self._drain(eof=True)
+        if self._state != "done":
+            raise ValueError("truncated JSON document")
+        return items
+
+    def _drain(self, *, eof: bool) -> List[Any]:
+        items: List[Any] = []
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos >= len(self._buf):
+                return items
+            ch = self._buf[self._pos]
+            state = self._state
+            if state == "start":
+                if ch != "{":
+                    raise ValueError("expected a JSON object")
+                self._pos += 1
+                self._state = "member"
+            elif state == "member":
+                if ch == "}":
+                    self._pos += 1
+                    self._state = "done"
+                elif ch == ",":
+                    self._pos += 1
+                else:
+                    key = self._decode(eof=eof)
+                    if key is _INCOMPLETE:
+                        return items
+                    self._member = key
+                    self._state = "colon"
+            elif state == "colon":
+                if ch != ":":
+                    raise ValueError("expected ':' after object key")
+                self._pos += 1
+                self._state = "value"
+            elif state == "value":
+                if self._member == self._key and ch == "[":
+                    self._pos += 1
+                    self._state = "item"
+                else:
+                    value = self._decode(eof=eof)
+                    if value is _INCOMPLETE:
+                        return items
+                    self.meta[str(self._member)] = value
+                    self._state = "member"
+            elif state == "item":
+                if ch == "]":
+                    self._pos += 1
+                    self._state = "member"
+                elif ch == ",":
+                    self._pos += 1
+                else:
+                    item = self._decode(eof=eof)
+                    if item is _INCOMPLETE:
+                        return items
+                    items.append(item)
+            else:
+                raise ValueError("unexpected data after the JSON document")
+
+    def _decode(self, *, eof: bool) -> Any:
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            return _INCOMPLETE
+        if end >= len(self._buf) and not eof:
+            # a number or literal may continue in the next chunk
+            return _INCOMPLETE
+        self._pos = end
+        return value
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from ..model.company import Company
+from ..utils.jis import PREFECTURES, city_of_location, prefecture_of_location
+from ..utils.normalize import to_optional_str
+
+# Index over the mirrored basic-info and finance payloads. Kept in the mirror
+# database so that a record and its index row are always written together.
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    corporate_number TEXT PRIMARY KEY,
+    name TEXT,
+    kana TEXT,
+    location TEXT,
+    postal_code TEXT,
+    prefecture TEXT,
+    city TEXT,
+    has_activity INTEGER,
+    founding_year INTEGER,
+    date_of_establishment TEXT,
+    capital_stock INTEGER,
+    employee_number INTEGER,
+    business_items TEXT,
+    net_sales INTEGER,
+    net_income_loss INTEGER,
+    total_assets INTEGER,
+    operating_revenue1 INTEGER,
+    operating_revenue2 INTEGER,
+    ordinary_income_loss INTEGER,
+    ordinary_income INTEGER
+);
+CREATE INDEX IF NOT EXISTS companies_prefecture ON companies (prefecture, city);
+CREATE INDEX IF NOT EXISTS companies_capital_stock ON companies (capital_stock);
+CREATE INDEX IF NOT EXISTS companies_employee_number ON companies (employee_number);
+"""
+
+# trigram tokenizer: Japanese names have no word boundaries
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS companies_fts USING fts5(
+    corporate_number UNINDEXED, name, kana, location, tokenize='trigram'
+);
+"""
+
+# index column -> ManagementIndex field of the latest period
+_FINANCE_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("net_sales", "net_sales_summary_of_business_results"),
+    ("net_income_loss", "net_income_loss_summary_of_business_results"),
+    ("total_assets", "total_assets_summary_of_business_results"),
+    ("operating_revenue1", "operating_revenue1_summary_of_business_results"),
+    ("operating_revenue2", "operating_revenue2_summary_of_business_results"),
+    ("ordinary_income_loss", "ordinary_income_loss_summary_of_business_results"),
+    ("ordinary_income", "ordinary_income_summary_of_business_results"),
+)
+
+# search_companies keyword prefix -> index column for "<prefix>_from" / "<prefix>_to"
+_RANGE_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    *((column, column) for column, _ in _FINANCE_COLUMNS),
+    ("capital_stock", "capital_stock"),
+    ("employee_number", "employee_number"),
+    ("establishment", "date_of_establishment"),
+)
+
+# filters the mirrored payloads carry no data for. HojinInfo has no corporate
+# type, and guessing it from the name misses 101-499 and misreads foreign
+# companies named 株式会社, so corporate_type goes upstream too.
+LOCAL_UNSUPPORTED: Tuple[str, ...] = (
+    "corporate_type",
+    "industry",
+    "sales_area",
+    "unified_qualification",
+    "unified_qualification_sub01",
+    "unified_qualification_sub02",
+    "unified_qualification_sub03",
+    "unified_qualification_sub04",
+    "name_major_shareholders",
+    "average_continuous_service_years",
+    "average_age",
+    "month_average_predetermined_overtime_hours",
+    "female_workers_proportion",
+    "year",
+    "ministry",
+    "source",
+)
+
+
+class UnsupportedLocalQueryError(ValueError):
+    def __init__(self, fields: List[str]) -> None:
+        super().__init__("not searchable locally: " + ", ".join(fields))
+        self.fields = fields
+
+
+def _first_item(payload: Any) -> Optional[Dict[str, Any]]:
+    if not isinstance(payload, dict):
+        return None
+    items = payload.get("hojin-infos")
+    if isinstance(items, list) and items and isinstance(items[0], dict):
+        return items[0]
+    return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value is not None and value != "" else None
+    except (TypeError, ValueError):
+        return None
+
+
+def basic_index_row(payload: Any) -> Optional[Dict[str, Any]]:
+    """Index columns derived from a basic-info payload (``None`` if it has no record)."""
+    item = _first_item(payload)
+    if item is None:
+        return None
+    location = to_optional_str(item.get("location"))
+    established = to_optional_str(item.get("date_of_establishment"))
+    business_items = item.get("business_items")
+    return {
+        "name": to_optional_str(item.get("name")),
+        "kana": to_optional_str(item.get("kana")),
+        "location": location,
+        "postal_code": to_optional_str(item.get("postal_code")),
+        "prefecture": to_optional_str(item.get("prefecture_code"))
+        or prefecture_of_location(location),
+        "city": city_of_location(location),
+        "has_activity": 1 if (_to_int(item.get("number_of_activity")) or 0) > 0 else 0,
+        "founding_year": _to_int(item.get("founding_year")),
+        "date_of_establishment": established[:10] if established else None,
+        "capital_stock": _to_int(item.get("capital_stock")),
+        "employee_number": _to_int(item.get("employee_number")),
+        "business_items": (
+            "," + ",".join(str(b) for b in business_items) + ","
+            if isinstance(business_items, list) and business_items
+            else None
+        ),
+    }
+
+
+def finance_index_row(payload: Any) -> Optional[Dict[str, Any]]:
+    """Index columns from the latest ``management_index`` period of a finance payload."""
+    item = _first_item(payload)
+    if item is None:
+        return None
+    finance = item.get("finance") or {}
+    indexes = [i for i in (finance.get("management_index") or []) if isinstance(i, dict)]
+    latest: Mapping[str, Any] = (
+        max(indexes, key=lambda i: str(i.get("period") or "")) if indexes else {}
+    )
+    return {column: _to_int(latest.get(field)) for column, field in _FINANCE_COLUMNS}
+
+
+def build_local_where(options: Mapping[str, Any], *, fts: bool) -> Tuple[str, List[Any]]:
+    """Translate ``search_companies`` keyword arguments into a WHERE clause on ``companies``.
+
+    Raises ``UnsupportedLocalQueryError`` when a filter cannot be answered from the index.
+    """
+    unsupported = [key for key in LOCAL_UNSUPPORTED if options.get(key)]
+    if str(options.get("city") or "").isdigit():
+        # payloads carry no JIS X 0402 code; the index only has the city name
+        unsupported.append("city")
+    if unsupported:
+        raise UnsupportedLocalQueryError(unsupported)
+
+    clauses: List[str] = []
+    params: List[Any] = []
+    name = options.get("name")
+    if name:
+        if fts and len(name) >= 3:
+            clauses.append(
+                "corporate_number IN (SELECT corporate_number FROM companies_fts"
+                " WHERE companies_fts MATCH ?)"
+            )
+            params.append('{name kana} : "' + name.replace('"', '""') + '"')
+        else:
+            clauses.append("(name LIKE ? OR kana LIKE ?)")
+            params.extend([f"%{name}%", f"%{name}%"])
+    if options.get("corporate_number"):
+        clauses.append("corporate_number = ?")
+        params.append(options["corporate_number"])
+    if options.get("exist_flg") is not None:
+        clauses.append("has_activity = ?")
+        params.append(1 if options["exist_flg"] else 0)
+    if options.get("founded_year"):
+        years = [int(v) for v in str(options["founded_year"]).split(",") if v]
+        clauses.append(f"founding_year IN ({','.join('?' * len(years))})")
+        params.extend(years)
+    if options.get("business_item"):
+        codes = [c for c in str(options["business_item"]).split(",") if c]
+        clauses.append("(" + " OR ".join("business_items LIKE ?" for _ in codes) + ")")
+        params.extend(f"%,{code},%" for code in codes)
+    prefecture = options.get("prefecture")
+    if prefecture:
+        if prefecture.isdigit():
+            clauses.append("prefecture = ?")
+            params.append(prefecture)
+        else:
+            clauses.append("location LIKE ?")
+            params.append(f"%{prefecture}%")
+    if options.get("city"):
+        clauses.append("location LIKE ?")
+        params.append(f"%{options['city']}%")
+    if options.get("address"):
+        clauses.append("location LIKE ?")
+        params.append(f"%{options['address']}%")
+    for prefix, column in _RANGE_COLUMNS:
+        low, high = options.get(f"{prefix}_from"), options.get(f"{prefix}_to")
+        if low is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(low)
+        if high is not None:
+            clauses.append(f"{column} <= ?")
+            params.append(high)
+    return (" AND ".join(clauses) or "1"), params
+
+
+def row_to_company(row: Mapping[str, Any]) -> Company:
+    return Company(
+        corporate_number=row["corporate_number"],
+        name=row["name"] or "",
+        prefecture=PREFECTURES.get(row["prefecture"] or ""),
+        city=row["city"],
+        address=row["location"],
+        postal_code=row["postal_code"],
+        industry=None,
+    )
+
+
+def index_columns(sub_path: Optional[str], payload: Any) -> Optional[Dict[str, Any]]:
+    """Index columns contributed by one mirrored section, or ``None`` if it adds none."""
+    if sub_path is None:
+        return basic_index_row(payload)
+    if sub_path == "finance":
+        return finance_index_row(payload)
+    return None
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import re
+import threading
+from bisect import bisect_left
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..config import settings
+
+# seconds; the last bucket (+Inf) is implicit
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_CORPORATE_NUMBER_SEGMENT = re.compile(r"/[0-9]{13}(?=/|$)")
+
+
+def endpoint_template(url: str) -> str:
+    """Reduce a request URL to its endpoint, e.g. ``/{corporate_number}/finance``.
+
+    The base URL path and the query are dropped; the search endpoint is ``/``.
+    """
+    path = urlsplit(url).path
+    base = urlsplit(settings.gbizinfo_base_url).path.rstrip("/")
+    if base and path.startswith(base):
+        path = path[len(base) :]
+    path = _CORPORATE_NUMBER_SEGMENT.sub("/{corporate_number}", path.rstrip("/"))
+    return path or "/"
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        out: List[Tuple[str, int]] = []
+        for bound, n in zip((*map(repr, LATENCY_BUCKETS), "+Inf"), self.counts, strict=True):
+            total += n
+            out.append((bound, total))
+        return out
+
+
+class _Endpoint:
+    __slots__ = ("latency", "statuses", "retries", "bytes_received")
+
+    def __init__(self) -> None:
+        self.latency = _Histogram()
+        self.statuses: Dict[str, int] = {}
+        self.retries = 0
+        self.bytes_received = 0
+
+
+class MetricsRegistry:
+    """Thread-safe counters for upstream requests, keyed by endpoint template.
+
+    Recording is a lock plus a few integer updates; everything is aggregated
+    only when a snapshot or the Prometheus text is requested.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _Endpoint] = {}
+        self._rate_limit_waits = 0
+        self._rate_limit_wait_seconds = 0.0
+        self._lookups: Dict[str, int] = {}
+        self._circuit_rejections: Dict[str, int] = {}
+        self._hedges: Dict[str, List[int]] = {}  # endpoint -> [sent, won]
+
+    def observe_request(
+        self,
+        url: str,
+        *,
+        status: Optional[int],
+        seconds: float,
+        bytes_received: int = 0,
+        retries: int = 0,
+    ) -> None:
+        """Record one logical request; ``status`` is ``None`` when no response arrived."""
+        endpoint = endpoint_template(url)
+        label = str(status) if status is not None else "error"
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None:
+                entry = self._endpoints[endpoint] = _Endpoint()
+            entry.latency.observe(seconds)
+            entry.statuses[label] = entry.statuses.get(label, 0) + 1
+            entry.retries += retries
+            entry.bytes_received += bytes_received
+
+    def observe_rate_limit_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._rate_limit_waits += 1
+            self._rate_limit_wait_seconds += seconds
+
+    def count_lookup(self, source: str) -> None:
+        """Count where a detail lookup was answered from (memory, mirror, disk, upstream)."""
+        with self._lock:
+            self._lookups[source] = self._lookups.get(source, 0) + 1
+
+    def count_circuit_rejection(self, endpoint: str) -> None:
+        """Count a call refused by the open circuit breaker of ``endpoint`` (a template)."""
+        with self._lock:
+            self._circuit_rejections[endpoint] = self._circuit_rejections.get(endpoint, 0) + 1
+
+    def observe_hedge(self, url: str, *, won: bool) -> None:
+        """Record a hedge request and whether it answered before the primary."""
+        endpoint = endpoint_template(url)
+        with self._lock:
+            counts = self._hedges.setdefault(endpoint, [0, 0])
+            counts[0] += 1
+            counts[1] += int(won)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+            self._lookups.clear()
+            self._circuit_rejections.clear()
+            self._hedges.clear()
+            self._rate_limit_waits = 0
+            self._rate_limit_wait_seconds = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = {
+                name: {
+                    "requests": e.latency.count,
+                    "latency_seconds_sum": e.latency.sum,
+                    "latency_buckets": dict(e.latency.cumulative()),
+                    "statuses": dict(e.statuses),
+                    "retries": e.retries,
+                    "bytes_received": e.bytes_received,
+                }
+                for name, e in sorted(self._endpoints.items())
+            }
+            return {
+                "endpoints": endpoints,
+                "rate_limit": {
+                    "acquisitions": self._rate_limit_waits,
+                    "wait_seconds": self._rate_limit_wait_seconds,
+                },
+                "detail_lookups": dict(self._lookups),
+                "circuit_rejections": dict(sorted(self._circuit_rejections.items())),
+                "hedges": {
+                    name: {"sent": sent, "won": won}
+                    for name, (sent, won) in sorted(self._hedges.items())
+                },
+            }
+
+
+_default_metrics = MetricsRegistry()
+
+
+def default_metrics() -> MetricsRegistry:
+    """The process-wide registry shared by the HTTP clients and services."""
+    return _default_metrics
+
+
+_BREAKER_STATES = {"closed": 0, "half_open": 0.5, "open": 1}
+
+
+def _labels(**labels: str) -> str:
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def cache_snapshot(stats: Any) -> Dict[str, Any]:
+    """A cache stats dataclass as a dict, with its hit ratio."""
+    out = asdict(stats)
+    lookups = out["hits"] + out["misses"]
+    out["hit_ratio"] = out["hits"] / lookups if lookups else 0.0
+    return out
+
+
+def prometheus_text(snapshot: Mapping[str, Any]) -> str:
+    """Render a metrics snapshot in the Prometheus text exposition format.
+
+    Takes ``MetricsRegistry.snapshot()``, optionally extended with ``caches``
+    (name -> ``cache_snapshot``), ``coalesced_requests``, ``circuit_breakers``
+    (endpoint -> ``CircuitBreaker.snapshot()``), ``connection_pool`` (the HTTP
+    client's ``pool_snapshot()``) and ``projection``.
+    """
+    lines: List[str] = []
+
+    def family(name: str, kind: str, help_text: str, samples: Iterable[str]) -> None:
+        samples = list(samples)
+        if samples:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+
+    endpoints: Mapping[str, Mapping[str, Any]] = snapshot.get("endpoints", {})
+    latency: List[str] = []
+    for name, e in endpoints.items():
+        for bound, n in e["latency_buckets"].items():
+            latency.append(
+                f"gbizinfo_request_duration_seconds_bucket{_labels(endpoint=name, le=bound)} {n}"
+            )
+        latency.append(
+            f"gbizinfo_request_duration_seconds_sum{_labels(endpoint=name)} "
+            f"{e['latency_seconds_sum']}"
+        )
+        latency.append(
+            f"gbizinfo_request_duration_seconds_count{_labels(endpoint=name)} {e['requests']}"
+        )
+    family(
+        "gbizinfo_request_duration_seconds",
+        "histogram",
+        "Upstream request latency by endpoint template.",
+        latency,
+    )
+    family(
+        "gbizinfo_responses_total",
+        "counter",
+        "Upstream responses by endpoint and status code.",
+        (
+            f"gbizinfo_responses_total{_labels(endpoint=name, status=status)} {n}"
+            for name, e in endpoints.items()
+            for status, n in sorted(e["statuses"].items())
+        ),
+    )
+    family(
+        "gbizinfo_retries_total",
+        "counter",
+        "Retries performed by the HTTP client.",
+        (
+            f"gbizinfo_retries_total{_labels(endpoint=n)} {e['retries']}"
+            for n, e in endpoints.items()
+        ),
+    )
+    family(
+        "gbizinfo_received_bytes_total",
+        "counter",
+        "Response body bytes received.",
+        (
+            f"gbizinfo_received_bytes_total{_labels(endpoint=n)} {e['bytes_received']}"
+            for n, e in endpoints.items()
+        ),
+    )
+    rate_limit = snapshot.get("rate_limit", {})
+    family(
+        "gbizinfo_rate_limit_wait_seconds_total",
+        "counter",
+        "Time spent waiting for the rate limiter.",
+        [f"gbizinfo_rate_limit_wait_seconds_total {rate_limit.get('wait_seconds', 0.0)}"],
+    )
+    family(
+        "gbizinfo_detail_lookups_total",
+        "counter",
+        "Detail lookups by the layer that answered them.",
+        (
+            f"gbizinfo_detail_lookups_total{_labels(source=source)} {n}"
+            for source, n in sorted(snapshot.get("detail_lookups", {}).items())
+        ),
+    )
+    family(
+        "gbizinfo_coalesced_requests_total",
+        "counter",
+        "Requests answered by joining an identical in-flight request.",
+        [f"gbizinfo_coalesced_requests_total {snapshot.get('coalesced_requests', 0)}"],
+    )
+    breakers: Mapping[str, Mapping[str, Any]] = snapshot.get("circuit_breakers", {})
+    family(
+        "gbizinfo_circuit_breaker_open",
+        "gauge",
+        "1 while the endpoint's circuit breaker refuses calls, 0.5 half-open, 0 closed.",
+        (
+            f"gbizinfo_circuit_breaker_open{_labels(endpoint=n)} {_BREAKER_STATES[b['state']]}"
+            for n, b in breakers.items()
+        ),
+    )
+    family(
+        "gbizinfo_circuit_breaker_opened_total",
+        "counter",
+        "Times the endpoint's circuit breaker opened.",
+        (
+            f"gbizinfo_circuit_breaker_opened_total{_labels(endpoint=n)} {b['times_opened']}"
+            for n, b in breakers.items()
+        ),
+    )
+    family(
+        "gbizinfo_circuit_breaker_rejections_total",
+        "counter",
+        "Calls failed fast by an open circuit breaker.",
+        (
+            f"gbizinfo_circuit_breaker_rejections_total{_labels(endpoint=n)} {count}"
+            for n, count in snapshot.get("circuit_rejections", {}).items()
+        ),
+    )
+    hedges: Mapping[str, Mapping[str, int]] = snapshot.get("hedges", {})
+    family(
+        "gbizinfo_hedged_requests_total",
+        "counter",
+        "Second requests sent for slow GETs.",
+        (
+            f"gbizinfo_hedged_requests_total{_labels(endpoint=n)} {h['sent']}"
+            for n, h in hedges.items()
+        ),
+    )
+    family(
+        "gbizinfo_hedge_wins_total",
+        "counter",
+        "Hedged requests that answered before the original.",
+        (f"gbizinfo_hedge_wins_total{_labels(endpoint=n)} {h['won']}" for n, h in hedges.items()),
+    )
+    pool: Mapping[str, int] = snapshot.get("connection_pool", {})
+    for field, help_text in (("in_use", "checked out"), ("idle", "kept alive, unused")):
+        family(
+            f"gbizinfo_pool_connections_{field}",
+            "gauge",
+            f"HTTP connections currently {help_text}.",
+            [f"gbizinfo_pool_connections_{field} {pool[field]}"] if field in pool else [],
+        )
+    for field, help_text in (
+        ("created", "opened"),
+        ("reused", "reused for another request"),
+        ("discarded", "closed because the pool was full"),
+        ("reaped", "closed after idling too long"),
+    ):
+        family(
+            f"gbizinfo_pool_connections_{field}_total",
+            "counter",
+            f"HTTP connections {help_text}.",
+            [f"gbizinfo_pool_connections_{field}_total {pool[field]}"] if field in pool else [],
+        )
+    projection = snapshot.get("projection")
+    if projection:
+        family(
+            "gbizinfo_projection_saved_bytes_total",
+            "counter",
+            "Response bytes saved by `fields` projection (estimated from sampled calls).",
+            [f"gbizinfo_projection_saved_bytes_total {projection['bytes_saved']}"],
+        )
+    stats: Mapping[str, Mapping[str, Any]] = snapshot.get("caches", {})
+    for field in ("hits", "misses", "evictions"):
+        family(
+            f"gbizinfo_cache_{field}_total",
+            "counter",
+            f"Cache {field} by cache.",
+            (
+                f"gbizinfo_cache_{field}_total{_labels(cache=c)} {s[field]}"
+                for c, s in stats.items()
+            ),
+        )
+    for field in ("hit_ratio", "entries", "bytes"):
+        family(
+            f"gbizinfo_cache_{field}",
+            "gauge",
+            f"Current cache {field} by cache.",
+            (f"gbizinfo_cache_{field}{_labels(cache=c)} {s[field]}" for c, s in stats.items()),
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,470 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..config import settings
+from ..model.company import Company
+from ..model.pagination import PaginatedResult
+from .disk_cache import extract_update_date
+from .local_search import (
+    FTS_SCHEMA,
+    INDEX_SCHEMA,
+    build_local_where,
+    index_columns,
+    row_to_company,
+)
+
+# updateInfo feeds polled by the sync engine; ``None`` is the basic-info feed.
+# Each feed reports changes to the detail endpoint with the same sub path.
+MIRROR_FEEDS: Tuple[Optional[str], ...] = (
+    None,
+    "certification",
+    "commendation",
+    "finance",
+    "patent",
+    "procurement",
+    "subsidy",
+    "workplace",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS watched (
+    corporate_number TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS records (
+    corporate_number TEXT NOT NULL,
+    section TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    update_date TEXT,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (corporate_number, section)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    feed TEXT PRIMARY KEY,
+    watermark TEXT,
+    run_from TEXT,
+    run_to TEXT,
+    next_page INTEGER
+);
+CREATE TABLE IF NOT EXISTS retries (
+    corporate_number TEXT NOT NULL,
+    section TEXT NOT NULL,
+    error TEXT,
+    PRIMARY KEY (corporate_number, section)
+);
+"""
+
+
+@dataclass(frozen=True)
+class FeedCheckpoint:
+    """Persisted progress of one updateInfo feed.
+
+    ``watermark`` is the ``to`` date of the last completed run. While a run is in
+    progress ``run_from``/``run_to``/``next_page`` record where to resume.
+    """
+
+    watermark: Optional[str] = None
+    run_from: Optional[str] = None
+    run_to: Optional[str] = None
+    next_page: Optional[int] = None
+
+
+@dataclass
+class SyncReport:
+    feeds: int = 0
+    pages: int = 0
+    changed: int = 0
+    refreshed: int = 0
+    retried: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def _section(sub_path: Optional[str]) -> str:
+    return sub_path or ""
+
+
+class MirrorStore:
+    """SQLite-backed local copy of the detail payloads of watched companies.
+
+    Besides the raw payloads (zlib-compressed, keyed by corporate number and
+    detail sub path) it keeps the set of watched corporate numbers, the sync
+    checkpoints and the refreshes that failed, which the next run retries. Like
+    ``DiskCache`` the database is opened lazily.
+
+    Basic-info and finance payloads also feed a local search index (FTS5 with
+    the trigram tokenizer where available) that ``search`` queries.
+    """
+
+    def __init__(self, path: str, *, clock: Callable[[], float] = time.time) -> None:
+        self._path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._fts = False
+
+    def _connection(self) -> sqlite3.Connection:
+        # caller holds self._lock
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self._path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            conn.executescript(INDEX_SCHEMA)
+            try:
+                conn.executescript(FTS_SCHEMA)
+                self._fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5 / trigram: name search falls back to LIKE
+                self._fts = False
+            self._conn = conn
+        return self._conn
+
+    def watch(self, corporate_numbers: Iterable[str]) -> None:
+        with self._lock:
+            self._connection().executemany(
+                "INSERT OR IGNORE INTO watched (corporate_number) VALUES (?)",
+                [(n,) for n in corporate_numbers],
+            )
+
+    def unwatch(self, corporate_numbers: Iterable[str]) -> None:
+        numbers = [(n,) for n in corporate_numbers]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("DELETE FROM watched WHERE corporate_number = ?", numbers)
+            conn.executemany("DELETE FROM retries WHERE corporate_number = ?", numbers)
+
+    def watched(self) -> List[str]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT corporate_number FROM watched ORDER BY corporate_number"
+            )
+            return [r[0] for r in rows]
+
+    def filter_watched(self, corporate_numbers: Iterable[str]) -> List[str]:
+        """Return the watched subset of ``corporate_numbers``, keeping their order."""
+        numbers = list(dict.fromkeys(corporate_numbers))
+        if not numbers:
+            return []
+        with self._lock:
+            conn = self._connection()
+            found: set[str] = set()
+            # stay well below SQLite's bound-parameter limit
+            for start in range(0, len(numbers), 500):
+                chunk = numbers[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    "SELECT corporate_number FROM watched"
+                    f" WHERE corporate_number IN ({placeholders})",
+                    chunk,
+                )
+                found.update(r[0] for r in rows)
+        return [n for n in numbers if n in found]
+
+    def upsert(self, corporate_number: str, sub_path: Optional[str], payload: Any) -> None:
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        columns = index_columns(sub_path, payload)
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO records"
+                    " (corporate_number, section, payload, update_date, synced_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (
+                        corporate_number,
+                        _section(sub_path),
+                        zlib.compress(raw),
+                        extract_update_date(payload),
+                        self._clock(),
+                    ),
+                )
+                if columns:
+                    self._index(conn, corporate_number, columns)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _index(
+        self, conn: sqlite3.Connection, corporate_number: str, columns: Dict[str, Any]
+    ) -> None:
+        # caller holds self._lock inside a transaction
+        names = list(columns)
+        conn.execute(
+            f"INSERT INTO companies (corporate_number, {', '.join(names)})"
+            f" VALUES (?, {', '.join('?' * len(names))})"
+            " ON CONFLICT (corporate_number) DO UPDATE SET "
+            + ", ".join(f"{n} = excluded.{n}" for n in names),
+            [corporate_number, *columns.values()],
+        )
+        if self._fts and "name" in columns:
+            conn.execute(
+                "DELETE FROM companies_fts WHERE corporate_number = ?", (corporate_number,)
+            )
+            conn.execute(
+                "INSERT INTO companies_fts (corporate_number, name, kana, location)"
+                " VALUES (?, ?, ?, ?)",
+                (corporate_number, columns["name"], columns["kana"], columns["location"]),
+            )
+
+    def reindex(self) -> int:
+        """Rebuild the search index from the stored basic-info and finance records."""
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(
+                "SELECT corporate_number, section, payload FROM records"
+                " WHERE section IN ('', 'finance') ORDER BY section"
+            ).fetchall()
+            conn.execute("BEGIN")
+            try:
+                conn.execute("DELETE FROM companies")
+                if self._fts:
+                    conn.execute("DELETE FROM companies_fts")
+                for corporate_number, section, blob in rows:
+                    payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+                    columns = index_columns(section or None, payload)
+                    if columns:
+                        self._index(conn, corporate_number, columns)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def search(
+        self, options: Mapping[str, Any], *, page: int = 1, limit: int = 1000
+    ) -> PaginatedResult[Company]:
+        """Answer ``search_companies`` keyword arguments from the local index.
+
+        Unlike the upstream API there is no page cap. Raises ``UnsupportedLocalQueryError``
+        for filters the index has no data for.
+        """
+        with self._lock:
+            conn = self._connection()
+            where, params = build_local_where(options, fts=self._fts)
+            total = int(
+                conn.execute(f"SELECT COUNT(*) FROM companies WHERE {where}", params).fetchone()[0]
+            )
+            cursor = conn.execute(
+                "SELECT corporate_number, name, location, postal_code, prefecture, city"
+                f" FROM companies WHERE {where} ORDER BY corporate_number LIMIT ? OFFSET ?",
+                [*params, limit, (page - 1) * limit],
+            )
+            names = [d[0] for d in cursor.description]
+            rows = [dict(zip(names, row, strict=True)) for row in cursor]
+        return PaginatedResult[Company](
+            items=[row_to_company(r) for r in rows],
+            total=total,
+            from_=page,
+            size=limit,
+            source="mirror",
+        )
+
+    def get(self, corporate_number: str, sub_path: Optional[str] = None) -> Any:
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT payload FROM records WHERE corporate_number = ? AND section = ?",
+                    (corporate_number, _section(sub_path)),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+        try:
+            return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+        except (zlib.error, ValueError):
+            return None
+
+    def checkpoint(self, feed: Optional[str]) -> FeedCheckpoint:
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT watermark, run_from, run_to, next_page FROM sync_state WHERE feed = ?",
+                    (_section(feed),),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return FeedCheckpoint()
+        return FeedCheckpoint(*row)
+
+    def save_checkpoint(self, feed: Optional[str], state: FeedCheckpoint) -> None:
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO sync_state"
+                " (feed, watermark, run_from, run_to, next_page) VALUES (?, ?, ?, ?, ?)",
+                (_section(feed), state.watermark, state.run_from, state.run_to, state.next_page),
+            )
+
+    def add_retries(self, sub_path: Optional[str], failures: Mapping[str, str]) -> None:
+        """Record refreshes of ``sub_path`` that failed (corporate number -> error)."""
+        with self._lock:
+            self._connection().executemany(
+                "INSERT OR REPLACE INTO retries (corporate_number, section, error)"
+                " VALUES (?, ?, ?)",
+                [(n, _section(sub_path), error) for n, error in failures.items()],
+            )
+
+    def retries(self, sub_path: Optional[str]) -> List[str]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT corporate_number FROM retries WHERE section = ? ORDER BY corporate_number",
+                (_section(sub_path),),
+            )
+            return [r[0] for r in rows]
+
+    def clear_retries(self, sub_path: Optional[str], corporate_numbers: Iterable[str]) -> None:
+        with self._lock:
+            self._connection().executemany(
+                "DELETE FROM retries WHERE corporate_number = ? AND section = ?",
+                [(n, _section(sub_path)) for n in corporate_numbers],
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def default_mirror_store() -> Optional[MirrorStore]:
+    # opened lazily on first access; this never touches the disk
+    if not settings.mirror_path:
+        return None
+    return MirrorStore(settings.mirror_path)
+
+
+class MirrorSync:
+    """Incremental sync of a ``MirrorStore`` driven by the updateInfo change feeds.
+
+    Each run polls every feed from its watermark up to today and re-fetches,
+    through the detail endpoints, only the watched companies reported as
+    changed. Progress is checkpointed after every page, so a crashed run resumes
+    at the page it was on instead of starting over. Refreshes that fail are kept
+    in the store and retried first by the next run, since the watermark moves
+    past the page that reported them.
+    """
+
+    def __init__(
+        self,
+        service: Any,
+        store: MirrorStore,
+        *,
+        feeds: Tuple[Optional[str], ...] = MIRROR_FEEDS,
+        max_workers: Optional[int] = None,
+        today: Callable[[], date] = date.today,
+    ) -> None:
+        self._service = service
+        self._store = store
+        self._feeds = feeds
+        self._max_workers = max(1, max_workers or settings.bulk_max_workers)
+        self._today = today
+
+    def run(self, *, start: Optional[str] = None) -> SyncReport:
+        """Sync every feed; ``start`` (yyyyMMdd) is used for feeds without a watermark."""
+        report = SyncReport()
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            for feed in self._feeds:
+                self._sync_feed(feed, start, pool, report)
+                report.feeds += 1
+        return report
+
+    def _initial_from(self, start: Optional[str]) -> str:
+        if start:
+            return start
+        lookback = timedelta(days=max(0, settings.mirror_lookback_days))
+        return (self._today() - lookback).strftime("%Y%m%d")
+
+    def _sync_feed(
+        self,
+        feed: Optional[str],
+        start: Optional[str],
+        pool: ThreadPoolExecutor,
+        report: SyncReport,
+    ) -> None:
+        retries = self._store.retries(feed)
+        if retries:
+            watched = set(self._store.filter_watched(retries))
+            self._store.clear_retries(feed, [n for n in retries if n not in watched])
+            report.retried += len(watched)
+            self._refresh_all([n for n in retries if n in watched], feed, pool, report)
+        state = self._store.checkpoint(feed)
+        if state.run_from and state.run_to and state.next_page:
+            from_, to, page = state.run_from, state.run_to, state.next_page
+        else:
+            # the previous ``to`` day is polled again: updates made later that day
+            # would otherwise be missed, and re-fetching is idempotent
+            from_ = state.watermark or self._initial_from(start)
+            to, page = self._today().strftime("%Y%m%d"), 1
+        total_page = page
+        while page <= total_page:
+            self._store.save_checkpoint(feed, FeedCheckpoint(state.watermark, from_, to, page))
+            result = self._service.refresh_update_info_page(feed, from_=from_, to=to, page=page)
+            total_page = result.totalPage
+            changed = self._store.filter_watched(c.corporate_number for c in result.items)
+            report.changed += len(changed)
+            self._refresh_all(changed, feed, pool, report)
+            report.pages += 1
+            page += 1
+        self._store.save_checkpoint(feed, FeedCheckpoint(watermark=to))
+
+    def _refresh_all(
+        self,
+        corporate_numbers: List[str],
+        feed: Optional[str],
+        pool: ThreadPoolExecutor,
+        report: SyncReport,
+    ) -> None:
+        # failures go to the retry table before the checkpoint moves past them
+        failures: Dict[str, str] = {}
+        for number, outcome in zip(
+            corporate_numbers,
+            pool.map(lambda n: self._refresh(n, feed), corporate_numbers),
+            strict=True,
+        ):
+            if isinstance(outcome, Exception):
+                failures[number] = report.errors[f"{number}/{_section(feed)}"] = str(outcome)
+            else:
+                report.refreshed += 1
+        self._store.clear_retries(feed, [n for n in corporate_numbers if n not in failures])
+        if failures:
+            self._store.add_retries(feed, failures)
+
+    def _refresh(self, corporate_number: str, sub_path: Optional[str]) -> Any:
+        try:
+            payload = self._service.refresh_detail(corporate_number, sub_path)
+        except Exception as e:  # noqa: BLE001
+            return e
+        if isinstance(payload, dict):
+            self._store.upsert(corporate_number, sub_path, payload)
+        return payload
+
+    def seed(self, corporate_numbers: Iterable[str]) -> SyncReport:
+        """Watch ``corporate_numbers`` and fetch every section of them once."""
+        numbers = list(dict.fromkeys(corporate_numbers))
+        self._store.watch(numbers)
+        report = SyncReport()
+        jobs = [(n, feed) for n in numbers for feed in self._feeds]
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            outcomes = pool.map(lambda job: self._refresh(*job), jobs)
+            for (number, feed), outcome in zip(jobs, outcomes, strict=True):
+                if isinstance(outcome, Exception):
+                    report.errors[f"{number}/{_section(feed)}"] = str(outcome)
+                else:
+                    report.refreshed += 1
+        return report
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Type
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# connections opened at once while warming up
+_WARMUP_WORKERS = 8
+
+
+class PoolStats:
+    """Thread-safe connection counters shared by the pools of one client."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self.reaped = 0
+        self.in_use = 0
+
+    def add(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_use": self.in_use,
+                "created": self.created,
+                "reused": self.reused,
+                "discarded": self.discarded,
+                "reaped": self.reaped,
+            }
+
+
+class _CountingPool:
+    """Mixin for urllib3 connection pools that reports to a ``PoolStats``."""
+
+    stats: PoolStats
+    pool: Any
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        conn = super()._get_conn(timeout)  # type: ignore[misc]
+        # urllib3 closes dropped connections on checkout, so a live socket means reuse
+        if getattr(conn, "sock", None) is not None:
+            self.stats.add(reused=1, in_use=1)
+        else:
+            self.stats.add(created=1, in_use=1)
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        if conn is not None:
+            conn.gbizinfo_idle_since = time.monotonic()
+            if self.pool is not None and self.pool.full():
+                self.stats.add(discarded=1)
+        self.stats.add(in_use=-1)
+        super()._put_conn(conn)  # type: ignore[misc]
+
+    def idle_connections(self) -> int:
+        queue = self.pool
+        if queue is None:
+            return 0
+        with queue.mutex:
+            return sum(1 for c in queue.queue if c is not None and c.sock is not None)
+
+    def reap_idle(self, max_idle: float) -> int:
+        """Close pooled connections that have been idle longer than ``max_idle`` seconds."""
+        queue = self.pool
+        if queue is None:
+            return 0
+        now = time.monotonic()
+        reaped = 0
+        with queue.mutex:
+            for conn in queue.queue:
+                if conn is None or conn.sock is None:
+                    continue
+                if now - getattr(conn, "gbizinfo_idle_since", now) > max_idle:
+                    conn.close()
+                    reaped += 1
+        if reaped:
+            self.stats.add(reaped=reaped)
+        return reaped
+
+
+def _counting(base: Type[HTTPConnectionPool], stats: PoolStats) -> Type[HTTPConnectionPool]:
+    return type(f"Counting{base.__name__}", (_CountingPool, base), {"stats": stats})
+
+
+class PooledAdapter(HTTPAdapter):
+    """``HTTPAdapter`` whose pools count connections and close idle ones.
+
+    Idle connections are reaped before requests, at most once per
+    ``_REAP_INTERVAL``; ``idle_seconds <= 0`` keeps them until the server
+    drops them.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        idle_seconds: float = 0.0,
+        stats: Optional[PoolStats] = None,
+    ) -> None:
+        self.stats = stats or PoolStats()
+        self.idle_seconds = idle_seconds
+        self._next_reap = 0.0
+        super().__init__(pool_maxsize=pool_maxsize, pool_block=pool_block)
+
+    @classmethod
+    def from_settings(cls) -> PooledAdapter:
+        return cls(
+            pool_maxsize=settings.http_pool_maxsize,
+            pool_block=settings.http_pool_block,
+            idle_seconds=settings.http_pool_idle_seconds,
+        )
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting(HTTPConnectionPool, self.stats),
+            "https": _counting(HTTPSConnectionPool, self.stats),
+        }
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> Any:
+        if self.idle_seconds > 0 and time.monotonic() >= self._next_reap:
+            self._next_reap = time.monotonic() + _REAP_INTERVAL
+            self.reap_idle()
+        return super().send(request, *args, **kwargs)
+
+    def _pools(self) -> List[_CountingPool]:
+        pools = self.poolmanager.pools
+        found = (pools.get(key) for key in pools.keys())
+        return [p for p in found if isinstance(p, _CountingPool)]
+
+    def reap_idle(self) -> int:
+        return sum(pool.reap_idle(self.idle_seconds) for pool in self._pools())
+
+    def snapshot(self) -> Dict[str, int]:
+        """Connection counters plus the idle connections currently pooled."""
+        snapshot = self.stats.snapshot()
+        snapshot["idle"] = sum(pool.idle_connections() for pool in self._pools())
+        return snapshot
+
+    def warm_up(
+        self,
+        url: str,
+        count: int,
+        *,
+        verify: Any = True,
+        cert: Any = None,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """Open up to ``count`` keep-alive connections to ``url``'s host; returns how many are open.
+
+        The connections are checked out of the pool requests itself uses for
+        ``url`` (which depends on ``verify`` and ``cert``, as in ``send``),
+        connected concurrently and put back idle.
+        """
+        request = requests.Request("GET", url).prepare()
+        pool = self.get_connection_with_tls_context(request, verify, cert=cert)
+        count = min(count, pool.pool.maxsize if pool.pool is not None else 0)
+        if count <= 0:
+            return 0
+        conns = []
+        try:
+            for _ in range(count):
+                try:
+                    conns.append(pool._get_conn(timeout=0))  # noqa: SLF001
+                except EmptyPoolError:  # a blocking pool with every connection busy
+                    break
+            with ThreadPoolExecutor(
+                max_workers=min(_WARMUP_WORKERS, max(1, count)),
+                thread_name_prefix="gbizinfo-warmup",
+            ) as executor:
+                opened = list(executor.map(lambda c: _connect(c, timeout), conns))
+        finally:
+            for conn in conns:
+                pool._put_conn(conn)  # noqa: SLF001
+        return sum(opened)
+
+
+# minimum seconds between two sweeps for idle connections
+_REAP_INTERVAL = 1.0
+
+
+def _connect(conn: Any, timeout: Optional[float]) -> bool:
+    if conn.sock is not None:
+        return True
+    if timeout is not None:
+        conn.timeout = timeout
+    try:
+        conn.connect()
+    except OSError as exc:
+        logger.warning("connection warm-up to %s failed: %s", conn.host, exc)
+        return False
+    return True
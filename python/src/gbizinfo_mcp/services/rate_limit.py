@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
+from ..config import settings
+
+try:  # POSIX only; other platforms fall back to the in-process bucket
+    import fcntl
+except ImportError:  # pragma: no cover - platform dependent
+    fcntl = None  # type: ignore[assignment]
+
+_STATE = struct.Struct("<dd")  # (tokens, last refill timestamp)
+
+
+class TokenBucket:
+    """In-process token bucket with burst capacity.
+
+    ``reserve`` takes a token immediately and returns how long the caller must
+    wait before using it, so no lock is held while sleeping. ``try_acquire`` is
+    the non-blocking variant and never goes into debt.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._last: Optional[float] = None
+
+    def _transact(self, update: Callable[[float, float], Tuple[float, float]]) -> float:
+        # update(tokens_after_refill, now) -> (new_tokens, result)
+        with self._lock:
+            now = self._clock()
+            tokens = self._refill(self._tokens, self._last, now)
+            self._tokens, result = update(tokens, now)
+            self._last = now
+            return result
+
+    def _refill(self, tokens: float, last: Optional[float], now: float) -> float:
+        if last is None:
+            return self.capacity
+        return min(self.capacity, tokens + max(0.0, now - last) * self.rate)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` now and return the delay (seconds) before they may be used."""
+
+        def update(available: float, _now: float) -> Tuple[float, float]:
+            remaining = available - tokens
+            return remaining, max(0.0, -remaining / self.rate)
+
+        return self._transact(update)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        def update(available: float, _now: float) -> Tuple[float, float]:
+            if available >= tokens:
+                return available - tokens, 1.0
+            return available, 0.0
+
+        return bool(self._transact(update))
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available; returns the time spent waiting."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        wait = await self._reserve_async(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    async def _reserve_async(self, tokens: float) -> float:
+        # the in-process lock is only held for a few arithmetic operations
+        return self.reserve(tokens)
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket whose state lives in a small file guarded by ``flock``.
+
+    Every process on the host that points at the same file draws from one
+    shared budget. Timestamps use wall-clock time so they are comparable
+    across processes.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        path: str,
+        *,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if fcntl is None:
+            raise RuntimeError("file-based rate limiting requires fcntl (POSIX)")
+        super().__init__(rate, capacity, clock=clock)
+        self._path = path
+        self._fd: Optional[int] = None
+
+    def _open(self) -> int:
+        # caller holds self._lock
+        if self._fd is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+            self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        return self._fd
+
+    def _transact(self, update: Callable[[float, float], Tuple[float, float]]) -> float:
+        with self._lock:
+            fd = self._open()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                raw = os.pread(fd, _STATE.size, 0)
+                now = self._clock()
+                if len(raw) == _STATE.size:
+                    stored, last = _STATE.unpack(raw)
+                    tokens = self._refill(stored, last, now)
+                else:
+                    tokens = self.capacity
+                tokens, result = update(tokens, now)
+                os.pwrite(fd, _STATE.pack(tokens, now), 0)
+                return result
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    async def _reserve_async(self, tokens: float) -> float:
+        # flock and the state file I/O may block, so they run off the event loop
+        return await asyncio.to_thread(self.reserve, tokens)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+def _default_state_path() -> str:
+    # one budget per API token and endpoint, matching how gBizINFO applies quotas
+    digest = hashlib.sha256(
+        f"{settings.gbizinfo_base_url}\0{settings.gbizinfo_api_token}".encode("utf-8")
+    ).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"gbizinfo-mcp-rate-{digest}")
+
+
+@lru_cache(maxsize=1)
+def default_rate_limiter() -> Optional[TokenBucket]:
+    """Limiter shared by every client in this process (``None`` when unlimited)."""
+    rate = settings.rate_limit_per_sec
+    if not rate:
+        return None
+    capacity = settings.rate_limit_burst or 1.0
+    if settings.rate_limit_backend == "file":
+        if fcntl is not None:
+            return FileTokenBucket(
+                rate, capacity, settings.rate_limit_state_path or _default_state_path()
+            )
+        logging.getLogger(__name__).warning(
+            "RATE_LIMIT_BACKEND=file is not supported on this platform; "
+            "falling back to a per-process limiter"
+        )
+    return TokenBucket(rate, capacity)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+from ..config import settings
+from .metrics import endpoint_template
+
+RETRY_STATUSES: FrozenSet[int] = frozenset((429, 500, 502, 503, 504))
+
+
+def parse_retry_after(value: Optional[str], *, now: Optional[float] = None) -> Optional[float]:
+    """Seconds to wait per a ``Retry-After`` header (delta seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        return None
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how long to wait before retrying a request.
+
+    Without ``Retry-After`` the wait is drawn uniformly from
+    ``[0, min(backoff_max_seconds, backoff_seconds * 2 ** (attempt - 1))]``
+    ("full jitter"), so clients that failed together do not retry together.
+    A ``Retry-After`` longer than ``retry_after_max_seconds`` is not waited
+    for: the response is returned to the caller instead.
+    """
+
+    retries: int = 1
+    backoff_seconds: float = 0.5
+    backoff_max_seconds: float = 8.0
+    retry_after_max_seconds: float = 30.0
+    statuses: FrozenSet[int] = RETRY_STATUSES
+
+    @classmethod
+    def from_settings(cls) -> RetryPolicy:
+        return cls(
+            retries=settings.retries,
+            backoff_seconds=settings.retry_backoff_seconds,
+            backoff_max_seconds=settings.retry_backoff_max_seconds,
+            retry_after_max_seconds=settings.retry_after_max_seconds,
+        )
+
+    def backoff(self, attempt: int, *, rand: Callable[[], float] = random.random) -> float:
+        """Jittered wait before retry number ``attempt`` (1-based)."""
+        ceiling = min(self.backoff_max_seconds, self.backoff_seconds * 2 ** (attempt - 1))
+        return rand() * ceiling
+
+    def delay(self, retries_done: int, status: int, retry_after: Optional[str]) -> Optional[float]:
+        """Seconds to wait before retrying a ``status`` response, or ``None`` to give up."""
+        if status not in self.statuses or retries_done >= self.retries:
+            return None
+        wait = parse_retry_after(retry_after)
+        if wait is None:
+            return self.backoff(retries_done + 1)
+        return wait if wait <= self.retry_after_max_seconds else None
+
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one endpoint.
+
+    ``threshold`` failures in a row open the breaker; calls are then refused
+    for ``reset_seconds``, after which one probe is let through (half-open).
+    A successful probe closes the breaker, a failed one opens it again. A
+    probe that never reports back is replaced after another ``reset_seconds``.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        reset_seconds: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if threshold < 1:
+            raise ValueError("threshold must be >= 1")
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_at: Optional[float] = None
+        self._times_opened = 0
+
+    def _state(self, now: float) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        return OPEN if now - self._opened_at < self.reset_seconds else HALF_OPEN
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state(self._clock())
+
+    def allow(self) -> Optional[float]:
+        """``None`` if a call may proceed, else the seconds until it might."""
+        with self._lock:
+            now = self._clock()
+            state = self._state(now)
+            if state == CLOSED:
+                return None
+            if state == OPEN:
+                return self.reset_seconds - (now - self._opened_at)  # type: ignore[operator]
+            if self._probe_at is not None and now - self._probe_at < self.reset_seconds:
+                return self.reset_seconds - (now - self._probe_at)
+            self._probe_at = now
+            return None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = self._clock()
+            self._failures += 1
+            self._probe_at = None
+            if self._opened_at is not None or self._failures >= self.threshold:
+                if self._state(now) != OPEN:
+                    self._times_opened += 1
+                self._opened_at = now
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = self._clock()
+            state = self._state(now)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "times_opened": self._times_opened,
+                "retry_in_seconds": (
+                    self.reset_seconds - (now - self._opened_at)  # type: ignore[operator]
+                    if state == OPEN
+                    else 0.0
+                ),
+            }
+
+
+class CircuitBreakers:
+    """One ``CircuitBreaker`` per endpoint template, created on first use."""
+
+    def __init__(self, threshold: int, reset_seconds: float) -> None:
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    @classmethod
+    def from_settings(cls) -> Optional[CircuitBreakers]:
+        """Breakers configured by the settings, or ``None`` when disabled."""
+        if settings.circuit_breaker_threshold <= 0:
+            return None
+        return cls(settings.circuit_breaker_threshold, settings.circuit_breaker_reset_seconds)
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        endpoint = endpoint_template(url)
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(
+                    self.threshold, self.reset_seconds
+                )
+            return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = sorted(self._breakers.items())
+        return {endpoint: breaker.snapshot() for endpoint, breaker in breakers}
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from gbizinfo_mcp.services.adapters.gbizinfo_adapter import (
+    companies_to_dicts,
+    map_api_companies_to_domain,
+    map_api_company_records,
+    map_api_company_to_domain,
+)
+
+ITEMS = [
+    {
+        "corporate_number": "1234567890123",
+        "name": " サンプル株式会社 ",
+        "prefecture_name": "東京都",
+        "city_name": "千代田区",
+        "address": "丸の内1-1-1",
+        "postal_code": 1000000,
+        "sic": "製造業",
+    },
+    {"corporateNumber": "9876543210987", "nameJp": "テスト", "location": "大阪府", "zip": ""},
+    {"corporate_number": "1111111111111", "name": "", "name_jp": "代替名", "city": None},
+    {},
+]
+
+
+def test_bulk_mapping_matches_per_item_mapping():
+    expected = [map_api_company_to_domain(i).model_dump() for i in ITEMS]
+    assert map_api_company_records(ITEMS) == expected
+    companies = map_api_companies_to_domain(ITEMS)
+    assert [c.model_dump() for c in companies] == expected
+    assert companies_to_dicts(companies) == expected
+
+
+def test_bulk_mapping_keeps_or_chain_fallbacks():
+    items = [
+        {"corporate_number": "1", "name": 0, "sic": None, "industry": 0},
+        {"corporate_number": "2", "name": "", "name_jp": None, "nameJp": 0},
+    ]
+    expected = [map_api_company_to_domain(i).model_dump() for i in items]
+    assert map_api_company_records(items) == expected
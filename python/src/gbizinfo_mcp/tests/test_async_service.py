@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from gbizinfo_mcp.config import settings
+from gbizinfo_mcp.services.async_gbizinfo_service import AsyncGBizInfoService
+from gbizinfo_mcp.services.async_http import AsyncHttpClient
+from gbizinfo_mcp.services.gbizinfo_service import ApiCommunicationError
+from gbizinfo_mcp.services.http import ApiServerError
+
+
+def _client(handler) -> AsyncHttpClient:
+    return AsyncHttpClient(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+def test_async_get_basic_info_returns_model():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["X-hojinInfo-api-token"]
+        return httpx.Response(
+            200,
+            json={"hojin-infos": [{"corporate_number": "1234567890123", "name": "テスト会社"}]},
+        )
+
+    async def run() -> None:
+        service = AsyncGBizInfoService(http_client=_client(handler))
+        res = await service.get_basic_info("1234567890123")
+        assert res.hojin_infos[0].corporate_number == "1234567890123"
+        await service.aclose()
+
+    asyncio.run(run())
+
+
+def test_async_search_companies_builds_same_query():
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(str(request.url))
+        return httpx.Response(
+            200,
+            json={"hojin-infos": [{"corporate_number": "1234567890123", "name": "サンプル"}]},
+        )
+
+    async def run() -> None:
+        service = AsyncGBizInfoService(http_client=_client(handler))
+        result = await service.search_companies(name="サンプル", exist_flg=True, page=2, limit=10)
+        assert result.total == 1
+        assert result.from_ == 2
+        assert result.items[0].name == "サンプル"
+
+    asyncio.run(run())
+    assert "exist_flg=true" in seen[0]
+    assert "page=2" in seen[0] and "limit=10" in seen[0]
+
+
+def test_async_client_maps_json_errors():
+    def handler(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        return httpx.Response(404, json={"id": "E404", "message": "not found"})
+
+    async def run() -> None:
+        with pytest.raises(ApiServerError) as info:
+            await _client(handler).request("https://example.invalid/hojin")
+        assert info.value.status_code == 404
+        assert info.value.id == "E404"
+        assert str(info.value) == "not found"
+
+        service = AsyncGBizInfoService(http_client=_client(handler))
+        with pytest.raises(ApiCommunicationError):
+            await service.get_finance("1234567890123")
+
+    asyncio.run(run())
+
+
+def test_async_client_retries_server_errors(monkeypatch):
+    monkeypatch.setattr(settings, "retry_backoff_seconds", 0.0)
+    calls = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return httpx.Response(503, text="busy")
+        return httpx.Response(200, json={"ok": True})
+
+    async def run() -> None:
+        assert await _client(handler).request("https://example.invalid/hojin") == {"ok": True}
+
+    asyncio.run(run())
+    assert calls["n"] == 2
+
+
+def test_get_company_profile_merges_sections_concurrently(monkeypatch):
+    monkeypatch.setattr(settings, "retry_backoff_seconds", 0.0)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.1)
+        section = request.url.path.rsplit("/", 1)[-1]
+        if section == "patent":
+            return httpx.Response(500, json={"message": "patent backend down"})
+        info: dict = {"corporate_number": "1234567890123"}
+        if section == "1234567890123":
+            info["name"] = "テスト会社"
+        elif section == "finance":
+            info["finance"] = {"accounting_standards": "Japan GAAP"}
+        elif section == "workplace":
+            info["workplace_info"] = {"base_infos": {"average_age": 40.5}}
+        return httpx.Response(200, json={"hojin-infos": [info]})
+
+    async def run() -> float:
+        service = AsyncGBizInfoService(http_client=_client(handler))
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        profile = await service.get_company_profile("1234567890123")
+        elapsed = loop.time() - started
+        assert profile.hojin_info is not None
+        assert profile.hojin_info.name == "テスト会社"
+        assert profile.hojin_info.finance.accounting_standards == "Japan GAAP"
+        assert profile.hojin_info.workplace_info.base_infos.average_age == 40.5
+        assert set(profile.errors) == {"patent"}
+        assert "patent backend down" in profile.errors["patent"]
+        return elapsed
+
+    # eight 100 ms requests (plus one retry) run side by side, not back to back
+    assert asyncio.run(run()) < 0.6
+
+
+def test_async_iter_basic_info_bulk_yields_in_completion_order():
+    delays = {"9111111111111": 0.15, "9222222222222": 0.0, "9333333333333": 0.05}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        number = request.url.path.rsplit("/", 1)[-1]
+        await asyncio.sleep(delays.get(number, 0.0))
+        if number == "9333333333333":
+            return httpx.Response(404, json={"message": "not found"})
+        return httpx.Response(200, json={"hojin-infos": [{"corporate_number": number}]})
+
+    async def run() -> list:
+        service = AsyncGBizInfoService(http_client=_client(handler))
+        numbers = ["9111111111111", "9222222222222", "9333333333333", "9222222222222", "x"]
+        return [r async for r in service.iter_basic_info_bulk(numbers, max_workers=3)]
+
+    results = asyncio.run(run())
+    assert [(r.corporate_number, r.status) for r in results] == [
+        ("x", "invalid"),
+        ("9222222222222", "ok"),
+        ("9333333333333", "error"),
+        ("9111111111111", "ok"),
+    ]
+
+
+def test_async_iter_update_info_fetches_pages_concurrently_in_order():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        # later pages answer first; items must still come out in page order
+        await asyncio.sleep(0.1 if page == 2 else 0.02)
+        return httpx.Response(
+            200,
+            json={
+                "hojin-infos": [{"corporate_number": f"{page:013d}"}],
+                "pageNumber": page,
+                "totalPage": 4,
+            },
+        )
+
+    async def run() -> list:
+        service = AsyncGBizInfoService(http_client=_client(handler))
+        return [
+            c.corporate_number
+            async for c in service.iter_update_info(from_="20240101", to="20240131", window=3)
+        ]
+
+    assert asyncio.run(run()) == [f"{p:013d}" for p in range(1, 5)]
+
+
+def test_async_iter_search_exhaustive_fetches_remaining_pages():
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(str(request.url))
+        page = int(request.url.params.get("page", "1"))
+        item = {"corporate_number": f"{page:013d}", "name": f"p{page}"}
+        return httpx.Response(200, json={"hojin-infos": [item], "total": 12000})
+
+    async def run() -> list:
+        service = AsyncGBizInfoService(http_client=_client(handler))
+        return [c.corporate_number async for c in service.iter_search_exhaustive(name="x")]
+
+    assert sorted(asyncio.run(run())) == [f"{p:013d}" for p in (1, 2, 3)]
+    assert len(seen) == 3
+
+
+def test_async_stream_search_companies_maps_items():
+    body = json.dumps(
+        {
+            "hojin-infos": [
+                {"corporate_number": f"{i:013d}", "name": f"会社{i}"} for i in range(3)
+            ],
+            "total": 3,
+        },
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+    def handler(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        return httpx.Response(200, headers={"content-type": "application/json"}, content=body)
+
+    async def run() -> tuple:
+        service = AsyncGBizInfoService(http_client=_client(handler))
+        stream = service.stream_search_companies(name="会社", limit=3)
+        names = [c.name async for c in stream]
+        return names, stream.total
+
+    names, total = asyncio.run(run())
+    assert names == ["会社0", "会社1", "会社2"]
+    assert total == 3
+
+
+def test_async_stream_raises_mapped_errors():
+    def handler(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        return httpx.Response(500, json={"message": "boom"})
+
+    async def run() -> None:
+        service = AsyncGBizInfoService(http_client=_client(handler))
+        with pytest.raises(ApiCommunicationError, match="boom"):
+            [c async for c in service.stream_search_companies(name="x")]
+
+    asyncio.run(run())
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from gbizinfo_mcp.services.cache import TTLCache, ttl_for
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_hit_and_miss_counters():
+    cache = TTLCache(max_entries=10, max_bytes=1024, default_ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", {"x": 1})
+    assert cache.get("a") == {"x": 1}
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.entries == 1
+    assert stats.hit_ratio == 0.5
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=10, max_bytes=1024, default_ttl=60, clock=clock)
+    cache.set("short", 1, ttl=5)
+    cache.set("long", 2)
+    clock.now = 10
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert cache.stats().expirations == 1
+
+
+def test_ttl_cache_evicts_least_recently_used_by_count():
+    cache = TTLCache(max_entries=2, max_bytes=1024, default_ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" becomes least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats().evictions == 1
+
+
+def test_ttl_cache_evicts_by_bytes():
+    cache = TTLCache(max_entries=10, max_bytes=10, default_ttl=60)
+    cache.set("a", "x", size=6)
+    cache.set("b", "y", size=6)
+    assert cache.get("a") is None
+    assert cache.get("b") == "y"
+    assert cache.stats().bytes == 6
+    # larger than the whole budget is never stored
+    cache.set("c", "z", size=11)
+    assert cache.get("c") is None
+
+
+def test_ttl_for_overrides():
+    overrides = {"basic": 10.0, "finance": 20.0}
+    assert ttl_for(None, 60.0, overrides) == 10.0
+    assert ttl_for("finance", 60.0, overrides) == 20.0
+    assert ttl_for("patent", 60.0, overrides) == 60.0
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Dict
+
+from gbizinfo_mcp.services.async_gbizinfo_service import AsyncGBizInfoService
+from gbizinfo_mcp.services.disk_cache import DiskCache
+from gbizinfo_mcp.services.gbizinfo_service import GBizInfoService
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _payload(update_date: str = "2025-01-01T00:00:00+09:00") -> Dict[str, Any]:
+    return {
+        "hojin-infos": [
+            {"corporate_number": "1234567890123", "name": "テスト会社", "update_date": update_date}
+        ]
+    }
+
+
+def test_disk_cache_is_opened_lazily(tmp_path):
+    path = tmp_path / "cache" / "store.sqlite3"
+    DiskCache(str(path), max_bytes=1024 * 1024, ttl=60)
+    assert not os.path.exists(path)
+
+
+def test_disk_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    cache = DiskCache(path, max_bytes=1024 * 1024, ttl=60)
+    cache.set("detail:1234567890123/", _payload(), update_date="2025-01-01T00:00:00+09:00")
+    cache.close()
+
+    reopened = DiskCache(path, max_bytes=1024 * 1024, ttl=60)
+    entry = reopened.get_entry("detail:1234567890123/")
+    assert entry is not None
+    assert entry.payload == _payload()
+    assert entry.update_date == "2025-01-01T00:00:00+09:00"
+    assert reopened.stats().hits == 1
+
+
+def test_disk_cache_expires_entries(tmp_path):
+    clock = FakeClock()
+    cache = DiskCache(str(tmp_path / "store.sqlite3"), max_bytes=1024 * 1024, ttl=60, clock=clock)
+    cache.set("k", {"a": 1})
+    clock.now += 61
+    assert cache.get("k") is None
+
+
+def test_disk_cache_evicts_least_recently_accessed(tmp_path):
+    clock = FakeClock()
+    cache = DiskCache(str(tmp_path / "store.sqlite3"), max_bytes=100, ttl=600, clock=clock)
+    for i in range(3):
+        clock.now += 1
+        cache.set(f"k{i}", {"payload": f"value-{i}-" + "x" * 40})
+    clock.now += 1
+    cache.get("k0")
+    clock.now += 1
+    cache.set("k3", {"payload": "value-3-" + "y" * 40})
+    assert cache.stats().bytes <= 100
+    assert cache.stats().evictions >= 1
+    assert cache.get("k0") is not None
+    assert cache.get("k1") is None
+
+
+class CountingHttp:
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        self._payload = payload
+        self.calls = 0
+
+    def request(self, url: str, options: Any | None = None) -> Any:  # noqa: ARG002
+        self.calls += 1
+        return self._payload
+
+
+def test_service_reads_through_disk_cache(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    first = CountingHttp(_payload())
+    service = GBizInfoService(
+        http_client=first, disk_cache=DiskCache(path, max_bytes=1024 * 1024, ttl=60)
+    )
+    service.get_basic_info("1234567890123")
+    assert first.calls == 1
+
+    # a fresh service (e.g. after a restart) is answered from disk
+    second = CountingHttp(_payload())
+    restarted = GBizInfoService(
+        http_client=second, disk_cache=DiskCache(path, max_bytes=1024 * 1024, ttl=60)
+    )
+    res = restarted.get_basic_info("1234567890123")
+    assert second.calls == 0
+    assert res.hojin_infos[0].corporate_number == "1234567890123"
+
+
+def test_update_pages_share_caching_rules(tmp_path):
+    def _page(items: list) -> Dict[str, Any]:
+        return {"hojin-infos": items, "totalCount": len(items), "totalPage": 1}
+
+    rng = {"from_": "20250101", "to": "20250102"}
+    disk = DiskCache(str(tmp_path / "store.sqlite3"), max_bytes=1024 * 1024, ttl=60)
+    empty = CountingHttp(_page([]))
+    service = GBizInfoService(http_client=empty, disk_cache=disk)
+    service.get_update_info_page(**rng)
+    service.get_update_info_page(**rng)
+    assert empty.calls == 2  # empty pages are not kept
+
+    full = CountingHttp(_page(_payload()["hojin-infos"]))
+    service = GBizInfoService(http_client=full, disk_cache=disk)
+    service.get_update_info_page(**rng)
+    service.get_update_info_page(**rng)
+    assert full.calls == 1
+    service.refresh_update_info_page(**rng)
+    assert full.calls == 2
+
+    class AsyncCountingHttp(CountingHttp):
+        async def request(self, url: str, options: Any | None = None) -> Any:
+            return super().request(url, options)
+
+    async def run() -> None:
+        empty_async = AsyncCountingHttp(_page([]))
+        service = AsyncGBizInfoService(http_client=empty_async, disk_cache=disk)
+        await service.get_update_info_page(category="finance", **rng)
+        await service.get_update_info_page(category="finance", **rng)
+        assert empty_async.calls == 2
+
+        full_async = AsyncCountingHttp(_page(_payload()["hojin-infos"]))
+        service = AsyncGBizInfoService(http_client=full_async, disk_cache=disk)
+        await service.get_update_info_page(category="finance", **rng)
+        await service.get_update_info_page(category="finance", **rng)
+        assert full_async.calls == 1
+        await service.refresh_update_info_page(category="finance", **rng)
+        assert full_async.calls == 2
+
+    asyncio.run(run())
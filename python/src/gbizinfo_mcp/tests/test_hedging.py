@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+import httpx
+import requests
+
+from gbizinfo_mcp.config import settings
+from gbizinfo_mcp.services.async_http import AsyncHttpClient
+from gbizinfo_mcp.services.hedging import HedgePolicy
+from gbizinfo_mcp.services.http import HttpClient
+from gbizinfo_mcp.services.metrics import MetricsRegistry
+
+BASE = "https://info.gbiz.go.jp/hojin/v1/hojin"
+URL = f"{BASE}/1234567890123"
+
+
+def _eager() -> HedgePolicy:
+    # hedge after 50 ms, with budget for every request
+    return HedgePolicy(initial_delay=0.05, min_delay=0.0, budget_ratio=1.0)
+
+
+def test_hedge_delay_follows_recent_percentile():
+    policy = HedgePolicy(percentile=90.0, initial_delay=2.0, min_delay=0.1)
+    assert policy.delay(URL) == 2.0
+    for i in range(100):
+        policy.record(URL, i / 100)
+    assert policy.delay(URL) == 0.9
+    assert policy.delay(f"{BASE}/2222222222222") == 0.9  # same endpoint template
+    assert policy.delay(f"{BASE}/1234567890123/patent") == 2.0
+
+
+def test_hedge_budget_caps_extra_requests():
+    policy = HedgePolicy(budget_ratio=0.25)
+    spent = 0
+    for _ in range(40):
+        policy.delay(URL)
+        spent += policy.try_spend()
+    assert spent == 10
+
+
+def test_sync_client_uses_the_faster_hedge():
+    calls = {"n": 0}
+    lock = threading.Lock()
+
+    class SlowFirst:
+        def request(self, **kwargs: Any) -> requests.Response:  # noqa: ARG002
+            with lock:
+                calls["n"] += 1
+                first = calls["n"] == 1
+            if first:
+                time.sleep(0.5)
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["Content-Type"] = "application/json"
+            response._content = b'{"from": "%s"}' % (b"primary" if first else b"hedge")  # noqa: SLF001
+            response._content_consumed = True  # noqa: SLF001
+            return response
+
+    metrics = MetricsRegistry()
+    client = HttpClient(hedge_policy=_eager(), metrics=metrics)
+    client._session = SlowFirst()  # type: ignore[assignment]  # noqa: SLF001
+    started = time.perf_counter()
+    assert client.request(URL) == {"from": "hedge"}
+    assert time.perf_counter() - started < 0.4
+    assert metrics.snapshot()["hedges"] == {"/{corporate_number}": {"sent": 1, "won": 1}}
+
+
+def test_sync_client_does_not_hedge_without_a_free_worker(monkeypatch):
+    calls = {"n": 0}
+
+    class Slow:
+        def request(self, **kwargs: Any) -> requests.Response:  # noqa: ARG002
+            calls["n"] += 1
+            time.sleep(0.2)
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["Content-Type"] = "application/json"
+            response._content = b'{"ok": 1}'  # noqa: SLF001
+            response._content_consumed = True  # noqa: SLF001
+            return response
+
+    monkeypatch.setattr(settings, "http_pool_maxsize", 1)
+    metrics = MetricsRegistry()
+    client = HttpClient(hedge_policy=_eager(), metrics=metrics)
+    client._session = Slow()  # type: ignore[assignment]  # noqa: SLF001
+    # the primary holds the only worker, so the hedge would just queue behind it
+    assert client.request(URL) == {"ok": 1}
+    assert calls["n"] == 1
+    assert "/{corporate_number}" not in metrics.snapshot()["hedges"]
+
+
+def test_async_client_hedges_and_cancels_the_loser():
+    calls = {"n": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        calls["n"] += 1
+        if calls["n"] == 1:
+            await asyncio.sleep(5)
+            return httpx.Response(200, json={"from": "primary"})
+        return httpx.Response(200, json={"from": "hedge"})
+
+    metrics = MetricsRegistry()
+
+    async def run() -> float:
+        client = AsyncHttpClient(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            hedge_policy=_eager(),
+            metrics=metrics,
+        )
+        started = time.perf_counter()
+        assert await client.request(URL) == {"from": "hedge"}
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) < 1.0
+    assert metrics.snapshot()["hedges"]["/{corporate_number}"] == {"sent": 1, "won": 1}
+
+
+def test_fast_answers_are_not_hedged():
+    calls = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        calls["n"] += 1
+        return httpx.Response(200, json={"ok": 1})
+
+    async def run() -> None:
+        client = AsyncHttpClient(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            hedge_policy=HedgePolicy(initial_delay=1.0, budget_ratio=1.0),
+        )
+        for _ in range(5):
+            assert await client.request(URL) == {"ok": 1}
+
+    asyncio.run(run())
+    assert calls["n"] == 5
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from gbizinfo_mcp.services.json_stream import JsonArrayItemDecoder
+
+
+def _decode_in_chunks(raw: bytes, size: int) -> tuple[list, dict]:
+    decoder = JsonArrayItemDecoder("hojin-infos")
+    items: list = []
+    for start in range(0, len(raw), size):
+        items.extend(decoder.feed(raw[start : start + size]))
+    items.extend(decoder.close())
+    return items, decoder.meta
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 4096])
+def test_decoder_yields_items_across_chunk_boundaries(size):
+    document = {
+        "id": "x",
+        "hojin-infos": [{"corporate_number": f"{i:013d}", "name": "テスト会社"} for i in range(5)],
+        "total": 12345,
+    }
+    raw = json.dumps(document, ensure_ascii=False, indent=1).encode("utf-8")
+    items, meta = _decode_in_chunks(raw, size)
+    assert items == document["hojin-infos"]
+    assert meta == {"id": "x", "total": 12345}
+
+
+def test_decoder_returns_items_before_the_document_ends():
+    decoder = JsonArrayItemDecoder("hojin-infos")
+    assert decoder.feed(b'{"total": 2, "hojin-infos": [{"a": 1}, {"a"') == [{"a": 1}]
+    assert decoder.meta == {"total": 2}
+    assert decoder.feed(b": 2}]}") == [{"a": 2}]
+    assert decoder.close() == []
+
+
+def test_decoder_rejects_truncated_documents():
+    decoder = JsonArrayItemDecoder("hojin-infos")
+    decoder.feed(b'{"hojin-infos": [{"a": 1}')
+    with pytest.raises(ValueError):
+        decoder.close()
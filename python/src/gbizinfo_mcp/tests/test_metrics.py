@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from gbizinfo_mcp.services.cache import TTLCache
+from gbizinfo_mcp.services.gbizinfo_service import GBizInfoService
+from gbizinfo_mcp.services.metrics import MetricsRegistry, endpoint_template, prometheus_text
+
+BASE = "https://info.gbiz.go.jp/hojin/v1/hojin"
+
+
+class FakeHttp:
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        self._payload = payload
+
+    def request(self, url: str, options: Any | None = None) -> Any:  # noqa: ARG002
+        return self._payload
+
+
+def test_endpoint_template():
+    assert endpoint_template(f"{BASE}/1234567890123/finance") == "/{corporate_number}/finance"
+    assert endpoint_template(f"{BASE}/1234567890123") == "/{corporate_number}"
+    assert endpoint_template(f"{BASE}/updateInfo/patent?from=20240101") == "/updateInfo/patent"
+    assert endpoint_template(f"{BASE}?name=x&page=1") == "/"
+
+
+def test_registry_snapshot_and_prometheus_text():
+    metrics = MetricsRegistry()
+    metrics.observe_request(f"{BASE}/1234567890123", status=200, seconds=0.02, bytes_received=10)
+    metrics.observe_request(f"{BASE}/1234567890123", status=503, seconds=3.0, retries=2)
+    metrics.observe_request(f"{BASE}/1234567890123", status=None, seconds=0.001)
+    metrics.observe_rate_limit_wait(0.5)
+
+    endpoint = metrics.snapshot()["endpoints"]["/{corporate_number}"]
+    assert endpoint["requests"] == 3
+    assert endpoint["statuses"] == {"200": 1, "503": 1, "error": 1}
+    assert endpoint["retries"] == 2
+    assert endpoint["latency_buckets"]["0.025"] == 2
+    assert endpoint["latency_buckets"]["+Inf"] == 3
+
+    text = prometheus_text(metrics.snapshot())
+    assert "# TYPE gbizinfo_request_duration_seconds histogram" in text
+    assert 'gbizinfo_responses_total{endpoint="/{corporate_number}",status="503"} 1' in text
+    assert "gbizinfo_rate_limit_wait_seconds_total 0.5" in text
+
+
+def test_service_counts_lookup_sources_and_cache_ratio():
+    metrics = MetricsRegistry()
+    service = GBizInfoService(
+        http_client=FakeHttp({"hojin-infos": [{"corporate_number": "1234567890123"}]}),
+        cache=TTLCache(max_entries=8, max_bytes=1 << 20, default_ttl=60.0),
+        metrics=metrics,
+    )
+    service.get_basic_info("1234567890123")
+    service.get_basic_info("1234567890123")
+
+    snapshot = service.metrics_snapshot()
+    assert snapshot["detail_lookups"] == {"upstream": 1, "memory": 1}
+    assert snapshot["caches"]["response"]["hit_ratio"] == 0.5
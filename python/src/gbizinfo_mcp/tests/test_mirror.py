@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from gbizinfo_mcp.errors import InputValidationError
+from gbizinfo_mcp.services.cache import TTLCache
+from gbizinfo_mcp.services.disk_cache import DiskCache
+from gbizinfo_mcp.services.gbizinfo_service import GBizInfoService
+from gbizinfo_mcp.services.local_search import UnsupportedLocalQueryError
+from gbizinfo_mcp.services.mirror import MirrorStore, MirrorSync
+
+WATCHED = "1111111111111"
+OTHER = "2222222222222"
+
+
+class FeedHttp:
+    """Serves two updateInfo pages per feed and a detail payload per company."""
+
+    def __init__(self) -> None:
+        self.urls: List[str] = []
+        self.fail_page: int | None = None
+        self.fail_detail = False
+        self.reported = WATCHED
+
+    def request(self, url: str, options: Any | None = None) -> Any:  # noqa: ARG002
+        self.urls.append(url)
+        parts = urlsplit(url)
+        if "/updateInfo" in parts.path:
+            page = int(parse_qs(parts.query)["page"][0])
+            if page == self.fail_page:
+                raise RuntimeError("upstream down")
+            number = self.reported if page == 1 else OTHER
+            return {"hojin-infos": [{"corporate_number": number}], "totalPage": 2}
+        if self.fail_detail:
+            raise RuntimeError("detail down")
+        info: Dict[str, Any] = {"corporate_number": WATCHED, "name": f"fetched {len(self.urls)}"}
+        return {"hojin-infos": [info]}
+
+
+def _sync(tmp_path, http: FeedHttp, feeds=(None, "finance")) -> tuple[MirrorStore, MirrorSync]:
+    store = MirrorStore(str(tmp_path / "mirror.sqlite3"))
+    service = GBizInfoService(http_client=http, mirror=store, cache=_no_cache())
+    return store, MirrorSync(service, store, feeds=feeds, today=lambda: date(2025, 1, 31))
+
+
+def _no_cache() -> TTLCache:
+    return TTLCache(max_entries=0, max_bytes=0, default_ttl=0)
+
+
+def test_sync_refetches_only_changed_watched_companies(tmp_path):
+    http = FeedHttp()
+    store, sync = _sync(tmp_path, http)
+    store.watch([WATCHED])
+    report = sync.run(start="20250101")
+    assert report.feeds == 2 and report.pages == 4
+    assert report.changed == 2 and report.refreshed == 2
+    detail_urls = [u for u in http.urls if "/updateInfo" not in u]
+    assert sorted(urlsplit(u).path.rsplit("/", 1)[-1] for u in detail_urls) == [
+        WATCHED,
+        "finance",
+    ]
+    assert store.get(WATCHED)["hojin-infos"][0]["corporate_number"] == WATCHED
+    assert store.get(WATCHED, "finance") is not None
+    assert store.get(OTHER) is None
+    assert store.checkpoint(None).watermark == "20250131"
+    assert store.checkpoint("finance").next_page is None
+
+
+def test_next_run_starts_from_watermark(tmp_path):
+    http = FeedHttp()
+    store, sync = _sync(tmp_path, http, feeds=(None,))
+    sync.run(start="20250101")
+    http.urls.clear()
+    sync.run()
+    assert "from=20250131" in http.urls[0]
+
+
+def test_crashed_run_resumes_at_checkpointed_page(tmp_path):
+    http = FeedHttp()
+    http.fail_page = 2
+    store, sync = _sync(tmp_path, http, feeds=(None,))
+    store.watch([WATCHED])
+    with pytest.raises(Exception, match="upstream down"):
+        sync.run(start="20250101")
+    state = store.checkpoint(None)
+    assert (state.run_from, state.run_to, state.next_page) == ("20250101", "20250131", 2)
+
+    http.fail_page = None
+    http.urls.clear()
+    report = sync.run()
+    assert report.pages == 1
+    assert "page=2" in http.urls[0] and "from=20250101" in http.urls[0]
+    assert store.checkpoint(None).watermark == "20250131"
+
+
+def test_failed_refresh_is_retried_by_next_run(tmp_path):
+    http = FeedHttp()
+    http.fail_detail = True
+    store, sync = _sync(tmp_path, http, feeds=(None,))
+    store.watch([WATCHED])
+    report = sync.run(start="20250101")
+    assert report.refreshed == 0 and list(report.errors) == [f"{WATCHED}/"]
+    assert store.checkpoint(None).watermark == "20250131"
+    assert store.get(WATCHED) is None
+
+    # the feed no longer reports the company, but the failed refresh is retried
+    http.fail_detail = False
+    http.reported = OTHER
+    report = sync.run()
+    assert (report.retried, report.refreshed, report.errors) == (1, 1, {})
+    assert store.get(WATCHED) is not None
+    assert store.retries(None) == []
+
+
+def test_same_day_repoll_bypasses_disk_cache(tmp_path):
+    http = FeedHttp()
+    store = MirrorStore(str(tmp_path / "mirror.sqlite3"))
+    disk = DiskCache(str(tmp_path / "cache.sqlite3"), max_bytes=1024 * 1024, ttl=86400)
+    service = GBizInfoService(http_client=http, mirror=store, cache=_no_cache(), disk_cache=disk)
+    sync = MirrorSync(service, store, feeds=(None,), today=lambda: date(2025, 1, 31))
+    store.watch([OTHER])
+    http.reported = WATCHED
+    sync.run(start="20250131")
+    store.watch([WATCHED])
+    http.urls.clear()
+    report = sync.run()
+    # the same from/to/page is fetched again and the company seen on page 1 is refreshed
+    assert sum("/updateInfo" in u for u in http.urls) == 2
+    assert report.changed == 2
+
+
+def test_service_reads_detail_from_mirror(tmp_path):
+    http = FeedHttp()
+    store, sync = _sync(tmp_path, http)
+    sync.seed([WATCHED])
+    http.urls.clear()
+    # a fresh service (no in-memory cache) is answered from the mirror
+    service = GBizInfoService(http_client=http, mirror=store, cache=_no_cache())
+    res = service.get_finance(WATCHED)
+    assert res.hojin_infos[0].corporate_number == WATCHED
+    assert http.urls == []
+
+
+def _basic(number: str, name: str, location: str, capital: int) -> Dict[str, Any]:
+    return {
+        "hojin-infos": [
+            {
+                "corporate_number": number,
+                "name": name,
+                "kana": "テスト",
+                "location": location,
+                "capital_stock": capital,
+                "date_of_establishment": "2001-04-01T00:00:00+09:00",
+            }
+        ]
+    }
+
+
+def _finance(number: str, net_sales: int) -> Dict[str, Any]:
+    indexes = [
+        {"period": "2022", "net_sales_summary_of_business_results": 1},
+        {"period": "2023", "net_sales_summary_of_business_results": net_sales},
+    ]
+    return {"hojin-infos": [{"corporate_number": number, "finance": {"management_index": indexes}}]}
+
+
+def _indexed_store(tmp_path) -> MirrorStore:
+    store = MirrorStore(str(tmp_path / "mirror.sqlite3"))
+    store.upsert(WATCHED, None, _basic(WATCHED, "サンプル商事株式会社", "東京都千代田区", 10_000))
+    store.upsert(OTHER, None, _basic(OTHER, "見本合同会社", "大阪府大阪市北区", 500))
+    store.upsert(WATCHED, "finance", _finance(WATCHED, 9_000_000))
+    return store
+
+
+def test_local_search_filters_on_index(tmp_path):
+    store = _indexed_store(tmp_path)
+    by_name = store.search({"name": "サンプル商事"})
+    assert [c.corporate_number for c in by_name.items] == [WATCHED]
+    assert (by_name.items[0].prefecture, by_name.items[0].city) == ("東京都", "千代田区")
+    assert store.search({"name": "見本"}).total == 1  # shorter than a trigram
+    assert store.search({"prefecture": "27"}).items[0].corporate_number == OTHER
+    assert store.search({"prefecture": "27", "city": "大阪市北区"}).total == 1
+    with pytest.raises(UnsupportedLocalQueryError):
+        store.search({"prefecture": "27", "city": "127"})
+    with pytest.raises(UnsupportedLocalQueryError):
+        store.search({"corporate_type": "301"})
+    assert store.search({"capital_stock_from": 1000}).total == 1
+    assert store.search({"net_sales_from": 5_000_000}).items[0].corporate_number == WATCHED
+    assert (
+        store.search({"establishment_from": "2001-04-01", "establishment_to": "2001-04-01"}).total
+        == 2
+    )
+
+
+def test_local_search_has_no_page_cap(tmp_path):
+    store = _indexed_store(tmp_path)
+    result = store.search({}, page=2, limit=1)
+    assert result.total == 2
+    assert [c.corporate_number for c in result.items] == [OTHER]
+
+
+def test_search_data_source_modes(tmp_path):
+    store = _indexed_store(tmp_path)
+    http = FeedHttp()
+    service = GBizInfoService(http_client=http, mirror=store)
+    local = service.search_companies(name="サンプル商事", data_source="local")
+    assert local.total == 1 and local.source == "mirror" and http.urls == []
+    # a corporate-number lookup is answered fully by the mirror (a real check digit this time)
+    store.upsert("9234567890123", None, _basic("9234567890123", "番号商事", "東京都港区", 1))
+    by_number = service.search_companies(corporate_number="9234567890123", data_source="auto")
+    assert by_number.total == 1 and by_number.source == "mirror" and http.urls == []
+    # the mirror holds only watched companies: a broad auto search goes upstream
+    assert service.search_companies(name="サンプル商事", data_source="auto").source == "remote"
+    assert len(http.urls) == 1
+    http.urls.clear()
+    with pytest.raises(InputValidationError):
+        service.search_companies(industry="製造業", data_source="local")
+    # auto goes upstream when the index cannot answer
+    service.search_companies(industry="製造業", data_source="auto")
+    assert len(http.urls) == 1
+
+
+def test_reindex_rebuilds_index_from_records(tmp_path):
+    store = _indexed_store(tmp_path)
+    assert store.reindex() == 3
+    assert store.search({"net_sales_from": 5_000_000}).total == 1
+    assert store.search({"name": "サンプル商事"}).total == 1
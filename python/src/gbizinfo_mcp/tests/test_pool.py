@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from gbizinfo_mcp.config import settings
+from gbizinfo_mcp.services.async_http import AsyncHttpClient
+from gbizinfo_mcp.services.http import HttpClient
+from gbizinfo_mcp.services.metrics import MetricsRegistry, prometheus_text
+from gbizinfo_mcp.services.pool import PooledAdapter
+from gbizinfo_mcp.services.retry import RetryPolicy
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+
+    def do_GET(self) -> None:
+        time.sleep(self.delay)
+        body = json.dumps({"ok": 1}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def base_url(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/hojin/v1/hojin"
+    monkeypatch.setattr(settings, "gbizinfo_base_url", url)
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+def _client(adapter: PooledAdapter) -> HttpClient:
+    return HttpClient(adapter=adapter, retry_policy=RetryPolicy(retries=0))
+
+
+def test_sync_pool_counts_reuse_and_warm_up(base_url: str):
+    client = _client(PooledAdapter(pool_maxsize=4))
+    for _ in range(3):
+        assert client.request(f"{base_url}/1234567890123") == {"ok": 1}
+    assert client.pool_snapshot() == {
+        "in_use": 0,
+        "idle": 1,
+        "created": 1,
+        "reused": 2,
+        "discarded": 0,
+        "reaped": 0,
+    }
+
+    assert client.warm_up(10) == 4  # capped at the pool size
+    snapshot = client.pool_snapshot()
+    assert (snapshot["idle"], snapshot["created"]) == (4, 4)
+    client.request(f"{base_url}/1234567890123")
+    assert client.pool_snapshot()["created"] == 4
+
+
+def test_full_pool_discards_and_idle_connections_are_reaped(base_url: str):
+    KeepAliveHandler.delay = 0.1
+    try:
+        adapter = PooledAdapter(pool_maxsize=1, idle_seconds=0.05)
+        client = _client(adapter)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            list(pool.map(lambda i: client.request(f"{base_url}/{i}"), range(3)))
+    finally:
+        KeepAliveHandler.delay = 0.0
+    snapshot = client.pool_snapshot()
+    assert (snapshot["created"], snapshot["discarded"], snapshot["idle"]) == (3, 2, 1)
+
+    time.sleep(0.1)
+    assert adapter.reap_idle() == 1
+    assert client.pool_snapshot()["idle"] == 0
+    client.request(f"{base_url}/1234567890123")
+    assert client.pool_snapshot()["created"] == 4
+
+
+def test_async_pool_snapshot_and_warm_up(base_url: str):
+    async def run() -> dict:
+        client = AsyncHttpClient(retry_policy=RetryPolicy(retries=0))
+        try:
+            assert await client.warm_up(2) == 2
+            for _ in range(3):
+                assert await client.request(f"{base_url}/1234567890123") == {"ok": 1}
+            return client.pool_snapshot()
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == {"in_use": 0, "idle": 2, "created": 2, "reused": 3}
+
+
+def test_pool_metrics_in_prometheus_text():
+    snapshot = MetricsRegistry().snapshot()
+    snapshot["connection_pool"] = {"in_use": 1, "idle": 2, "created": 3, "reused": 7}
+    text = prometheus_text(snapshot)
+    assert "gbizinfo_pool_connections_in_use 1" in text
+    assert "gbizinfo_pool_connections_idle 2" in text
+    assert "gbizinfo_pool_connections_reused_total 7" in text
+    assert "gbizinfo_pool_connections_reaped_total" not in text
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pytest
+
+from gbizinfo_mcp.model.hojin_info import HojinInfo
+from gbizinfo_mcp.model.lazy_hojin_info import LazyHojinInfoResponse
+from gbizinfo_mcp.utils.projection import ProjectionMetrics, check_fields, parse_fields, project
+
+
+def test_parse_fields_builds_tree_and_whole_values_win():
+    tree = parse_fields(
+        ["name", "finance.management_index.net_sales", "finance.accounting_standards"]
+    )
+    assert tree == {
+        "name": {},
+        "finance": {"management_index": {"net_sales": {}}, "accounting_standards": {}},
+    }
+    assert parse_fields(["patent.title", "patent"]) == {"patent": {}}
+    assert parse_fields(["patent", "patent.title"]) == {"patent": {}}
+    with pytest.raises(ValueError):
+        parse_fields(["finance..x"])
+
+
+def test_check_fields_walks_nested_models():
+    check_fields(
+        HojinInfo, parse_fields(["finance.management_index.net_sales_summary_of_business_results"])
+    )
+    with pytest.raises(ValueError, match="unknown field: finance.nope"):
+        check_fields(HojinInfo, parse_fields(["finance.nope"]))
+    with pytest.raises(ValueError, match="no sub-fields"):
+        check_fields(HojinInfo, parse_fields(["name.first"]))
+
+
+def test_project_maps_over_lists():
+    value = {
+        "name": "x",
+        "patent": [{"title": "a", "patent_type": "p"}, {"title": "b"}],
+        "kana": "k",
+    }
+    assert project(value, parse_fields(["name", "patent.title"])) == {
+        "name": "x",
+        "patent": [{"title": "a"}, {"title": "b"}],
+    }
+
+
+def test_lazy_dump_validates_only_selected_fields():
+    res = LazyHojinInfoResponse(
+        {"hojin-infos": [{"name": "テスト", "capital_stock": "100", "patent": [{"title": 1}]}]}
+    )
+    info = res.hojin_infos[0]
+    assert info.dump(parse_fields(["name", "capital_stock"])) == {
+        "name": "テスト",
+        "capital_stock": 100,
+    }
+
+
+def test_projection_metrics_accumulate():
+    metrics = ProjectionMetrics(len, sample_every=1)
+    metrics.record("x" * 100, "x" * 40)
+    metrics.record("x" * 50, "x" * 10)
+    stats = metrics.stats()
+    assert (stats.projections, stats.bytes_saved) == (2, 100)
+
+
+def test_projection_metrics_measure_only_sampled_calls():
+    sized = []
+    metrics = ProjectionMetrics(lambda value: sized.append(value) or len(value), sample_every=4)
+    for _ in range(8):
+        metrics.record("x" * 100, "x" * 40)
+    assert len(sized) == 4  # two sampled calls, full and projected each
+    stats = metrics.stats()
+    assert (stats.projections, stats.full_bytes, stats.bytes_saved) == (8, 800, 480)
+
+
+@pytest.mark.parametrize("output", ["typed", "raw"])
+def test_detail_output_keys_do_not_depend_on_fields(monkeypatch, output):
+    from gbizinfo_mcp import mcp_fastmcp
+    from gbizinfo_mcp.config import settings
+
+    monkeypatch.setattr(settings, "detail_output", output)
+    payload = {"hojin-infos": [{"name": "テスト", "capital_stock": "100"}], "id": "x"}
+    full = mcp_fastmcp._detail_output(LazyHojinInfoResponse(payload))
+    projected = mcp_fastmcp._detail_output(LazyHojinInfoResponse(payload), parse_fields(["name"]))
+    assert "hojin-infos" in full
+    assert set(projected) == set(full)
+    assert projected["hojin-infos"] == [{"name": "テスト"}]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from gbizinfo_mcp.services import rate_limit
+from gbizinfo_mcp.services.rate_limit import FileTokenBucket, TokenBucket
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_bursts_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_token_bucket_try_acquire_is_non_blocking():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=1, clock=clock)
+    assert bucket.try_acquire() is True
+    assert bucket.try_acquire() is False
+    clock.now += 1.0
+    assert bucket.try_acquire() is True
+
+
+def test_token_bucket_refills_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10.0, capacity=2, clock=clock)
+    bucket.reserve()
+    bucket.reserve()
+    clock.now += 60
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert bucket.try_acquire() is False
+
+
+@pytest.mark.skipif(rate_limit.fcntl is None, reason="requires fcntl")
+def test_file_token_bucket_shares_budget_between_instances(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / "bucket")
+    # two instances model two worker processes pointing at the same state file
+    first = FileTokenBucket(1.0, 2, path, clock=clock)
+    second = FileTokenBucket(1.0, 2, path, clock=clock)
+    assert first.try_acquire() is True
+    assert second.try_acquire() is True
+    assert first.try_acquire() is False
+    assert second.reserve() == pytest.approx(1.0)
+    clock.now += 3.0
+    assert first.try_acquire() is True
+    first.close()
+    second.close()
+
+
+def test_file_token_bucket_reserves_off_the_event_loop(tmp_path, monkeypatch):
+    clock = FakeClock()
+    threads: list[int] = []
+
+    def clock_on_thread() -> float:
+        threads.append(threading.get_ident())
+        return clock()
+
+    slept: list[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        slept.append(delay)
+
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", fake_sleep)
+    bucket = FileTokenBucket(1.0, 1, str(tmp_path / "bucket"), clock=clock_on_thread)
+
+    async def run() -> None:
+        assert await bucket.acquire_async() == 0.0
+        assert await bucket.acquire_async() == pytest.approx(1.0)
+
+    asyncio.run(run())
+    bucket.close()
+    # flock and the file I/O ran in a worker thread; the wait stayed an async sleep
+    assert threads and threading.get_ident() not in threads
+    assert slept == [pytest.approx(1.0)]
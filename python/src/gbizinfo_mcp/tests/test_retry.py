@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from email.utils import formatdate
+from typing import Any, List
+
+import httpx
+import pytest
+import requests
+
+from gbizinfo_mcp.services.async_http import AsyncHttpClient
+from gbizinfo_mcp.services.http import ApiServerError, CircuitOpenError, HttpClient
+from gbizinfo_mcp.services.metrics import MetricsRegistry, prometheus_text
+from gbizinfo_mcp.services.retry import (
+    CircuitBreaker,
+    CircuitBreakers,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+BASE = "https://info.gbiz.go.jp/hojin/v1/hojin"
+NO_WAIT = RetryPolicy(retries=2, backoff_seconds=0.0)
+
+
+def _response(status: int, payload: Any = None, **headers: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update({"Content-Type": "application/json", **headers})
+    response._content = json.dumps(payload or {}).encode("utf-8")  # noqa: SLF001
+    response._content_consumed = True  # noqa: SLF001
+    return response
+
+
+class FakeSession:
+    def __init__(self, responses: List[requests.Response]) -> None:
+        self.responses = responses
+        self.calls = 0
+
+    def request(self, **kwargs: Any) -> requests.Response:  # noqa: ARG002
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+def _client(session: FakeSession, **kwargs: Any) -> HttpClient:
+    client = HttpClient(retry_policy=NO_WAIT, **kwargs)
+    client._session = session  # type: ignore[assignment]  # noqa: SLF001
+    return client
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(formatdate(1_000_010, usegmt=True), now=1_000_000) == 10.0
+    assert parse_retry_after(formatdate(1_000_000, usegmt=True), now=1_000_010) == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_retry_policy_delay():
+    policy = RetryPolicy(retries=2, backoff_seconds=1.0, retry_after_max_seconds=5.0)
+    assert policy.delay(0, 429, "2") == 2.0
+    assert policy.delay(0, 503, "60") is None  # too long to wait for
+    assert 0.0 <= policy.delay(1, 500, None) <= 2.0
+    assert policy.delay(0, 404, None) is None
+    assert policy.delay(2, 500, None) is None  # retries used up
+    assert policy.backoff(10, rand=lambda: 1.0) == policy.backoff_max_seconds
+
+
+def test_circuit_breaker_opens_probes_and_closes():
+    now = [0.0]
+    breaker = CircuitBreaker(2, 10.0, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow() is None
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow() == 10.0
+
+    now[0] = 10.0
+    assert breaker.state == "half_open"
+    assert breaker.allow() is None  # the probe
+    assert breaker.allow() is not None  # everyone else waits for it
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    now[0] = 20.0
+    assert breaker.allow() is None
+    breaker.record_success()
+    assert breaker.snapshot() == {
+        "state": "closed",
+        "consecutive_failures": 0,
+        "times_opened": 2,
+        "retry_in_seconds": 0.0,
+    }
+
+
+def test_client_honours_retry_after_on_429():
+    session = FakeSession([_response(429, **{"Retry-After": "0"}), _response(200, {"ok": 1})])
+    metrics = MetricsRegistry()
+    assert _client(session, metrics=metrics).request(f"{BASE}/1234567890123") == {"ok": 1}
+    assert session.calls == 2
+    assert metrics.snapshot()["endpoints"]["/{corporate_number}"]["retries"] == 1
+
+
+def test_client_retries_connection_errors():
+    class Flaky(FakeSession):
+        def request(self, **kwargs: Any) -> requests.Response:
+            if self.calls == 0:
+                self.calls += 1
+                raise requests.ConnectionError("reset")
+            return super().request(**kwargs)
+
+    session = Flaky([_response(200, {"ok": 1})])
+    assert _client(session).request(f"{BASE}/1234567890123") == {"ok": 1}
+    assert session.calls == 2
+
+
+def test_open_breaker_fails_fast_per_endpoint():
+    session = FakeSession([_response(500) for _ in range(6)] + [_response(200, {"ok": 1})])
+    metrics = MetricsRegistry()
+    client = _client(session, metrics=metrics, circuit_breakers=CircuitBreakers(2, 60.0))
+    for _ in range(2):
+        with pytest.raises(ApiServerError):
+            client.request(f"{BASE}/1234567890123/finance")
+    assert session.calls == 6
+
+    with pytest.raises(CircuitOpenError) as info:
+        client.request(f"{BASE}/2222222222222/finance")
+    assert info.value.status_code == 503
+    assert session.calls == 6  # not sent
+    # other endpoints are unaffected
+    assert client.request(f"{BASE}/1234567890123") == {"ok": 1}
+
+    snapshot = metrics.snapshot()
+    snapshot["circuit_breakers"] = client.circuit_breakers.snapshot()
+    assert snapshot["circuit_rejections"] == {"/{corporate_number}/finance": 1}
+    assert snapshot["circuit_breakers"]["/{corporate_number}/finance"]["state"] == "open"
+    text = prometheus_text(snapshot)
+    assert 'gbizinfo_circuit_breaker_open{endpoint="/{corporate_number}/finance"} 1' in text
+    assert 'gbizinfo_circuit_breaker_open{endpoint="/{corporate_number}"} 0' in text
+
+
+def test_async_client_honours_retry_after_and_breaker():
+    calls = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["n"] += 1
+        if request.url.path.endswith("/patent"):
+            return httpx.Response(503, text="down")
+        if calls["n"] == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"ok": 1})
+
+    async def run() -> None:
+        client = AsyncHttpClient(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            retry_policy=NO_WAIT,
+            circuit_breakers=CircuitBreakers(1, 60.0),
+        )
+        assert await client.request(f"{BASE}/1234567890123") == {"ok": 1}
+        assert calls["n"] == 2
+        with pytest.raises(ApiServerError):
+            await client.request(f"{BASE}/1234567890123/patent")
+        with pytest.raises(CircuitOpenError):
+            await client.request(f"{BASE}/1234567890123/patent")
+        assert calls["n"] == 5
+
+    asyncio.run(run())
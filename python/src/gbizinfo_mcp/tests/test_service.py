@@ -1,8 +1,21 @@
 from __future__ import annotations
 
+import threading
 from typing import Any, Dict
 
-from gbizinfo_mcp.services.gbizinfo_service import GBizInfoService
+import pytest
+from pydantic import ValidationError
+
+from gbizinfo_mcp.services.cache import TTLCache
+from gbizinfo_mcp.services.gbizinfo_service import (
+    ApiCommunicationError,
+    GBizInfoService,
+    build_search_params,
+    canonical_search_query,
+    split_search_options,
+)
+from gbizinfo_mcp.services.http import ApiServerError
+from gbizinfo_mcp.services.metrics import MetricsRegistry
 
 
 class FakeHttp:
@@ -53,3 +66,247 @@ def test_get_basic_info_returns_model():
     # pydantic model
     assert hasattr(res, "hojin_infos")
     assert res.hojin_infos and res.hojin_infos[0].corporate_number == "1234567890123"
+
+
+def test_detail_response_validates_sections_on_access():
+    payload = {
+        "hojin-infos": [
+            {
+                "corporate_number": "1234567890123",
+                "name": "テスト会社",
+                "patent": [{"title": "発明"}, {"title": 1, "patent_type": ["broken"]}],
+                "finance": {"accounting_standards": "日本基準"},
+            }
+        ]
+    }
+    service = GBizInfoService(http_client=FakeHttp(payload))
+    res = service.get_finance("1234567890123")
+    assert res.raw is payload
+    info = res.hojin_infos[0]
+    # the malformed patent list is never looked at
+    assert info.name == "テスト会社"
+    assert info.finance.accounting_standards == "日本基準"
+    with pytest.raises(ValidationError):
+        _ = info.patent
+    with pytest.raises(ValidationError):
+        res.model()
+
+
+class CountingHttp(FakeHttp):
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        super().__init__(payload)
+        self.urls: list[str] = []
+
+    def request(self, url: str, options: Any | None = None) -> Any:
+        self.urls.append(url)
+        return super().request(url, options)
+
+
+def test_detail_responses_are_cached_per_sub_path():
+    payload = {"hojin-infos": [{"corporate_number": "1234567890123", "name": "テスト会社"}]}
+    http = CountingHttp(payload)
+    service = GBizInfoService(http_client=http)
+    service.get_finance("1234567890123")
+    service.get_finance("1234567890123")
+    service.get_patent("1234567890123")
+    assert len(http.urls) == 2
+    stats = service.cache_stats()
+    assert stats is not None and stats.hits == 1
+
+
+class MissingHttp:
+    """Knows no company: 404 for basic info, empty ``hojin-infos`` for sections."""
+
+    def __init__(self) -> None:
+        self.urls: list[str] = []
+
+    def request(self, url: str, options: Any | None = None) -> Any:  # noqa: ARG002
+        self.urls.append(url)
+        if url.endswith("/finance"):
+            return {"hojin-infos": []}
+        raise ApiServerError(404, "該当する法人が見つかりません")
+
+
+def test_not_found_and_empty_lookups_are_answered_by_the_negative_cache():
+    now = [0.0]
+    http = MissingHttp()
+    metrics = MetricsRegistry()
+    negative = TTLCache(max_entries=10, max_bytes=10_000, default_ttl=60, clock=lambda: now[0])
+    service = GBizInfoService(http_client=http, negative_cache=negative, metrics=metrics)
+    for _ in range(3):
+        with pytest.raises(ApiCommunicationError, match="見つかりません"):
+            service.get_basic_info("1234567890123")
+        assert service.get_finance("1234567890123").hojin_infos == []
+    assert len(http.urls) == 2
+    stats = service.negative_cache_stats()
+    assert stats is not None and (stats.hits, stats.entries) == (4, 2)
+    assert service.cache_stats().entries == 0  # not kept for the positive TTL
+    assert metrics.snapshot()["detail_lookups"]["negative"] == 4
+    assert "negative" in service.metrics_snapshot()["caches"]
+
+    now[0] = 61.0
+    service.get_finance("1234567890123")
+    assert len(http.urls) == 3
+
+
+def test_iter_basic_info_bulk_dedupes_and_reports_per_item_status():
+    payload = {"hojin-infos": [{"corporate_number": "9234567890123", "name": "テスト会社"}]}
+    http = CountingHttp(payload)
+    service = GBizInfoService(http_client=http)
+    # the last number fails the check digit and is never requested
+    numbers = ["9234567890123", "9234567890123", "123", "2876543210987", "1234567890123"]
+    results = list(service.iter_basic_info_bulk(numbers, max_workers=2))
+    by_number = {r.corporate_number: r for r in results}
+    assert len(results) == 4
+    assert by_number["123"].status == "invalid"
+    assert by_number["1234567890123"].status == "invalid"
+    assert by_number["9234567890123"].status == "ok"
+    assert by_number["2876543210987"].status == "ok"
+    assert len(http.urls) == 2
+
+
+class PagedUpdateHttp:
+    def __init__(self, total_page: int) -> None:
+        self.total_page = total_page
+        self.urls: list[str] = []
+
+    def request(self, url: str, options: Any | None = None) -> Any:  # noqa: ARG002
+        self.urls.append(url)
+        page = int(url.rsplit("page=", 1)[-1])
+        return {
+            "hojin-infos": [{"corporate_number": f"{page:013d}", "name": f"page {page}"}],
+            "pageNumber": page,
+            "totalCount": self.total_page,
+            "totalPage": self.total_page,
+        }
+
+
+def test_iter_update_info_yields_all_pages_in_order():
+    http = PagedUpdateHttp(total_page=5)
+    service = GBizInfoService(http_client=http)
+    items = list(service.iter_update_info("finance", from_="20240101", to="20240131", window=2))
+    assert [c.corporate_number for c in items] == [f"{p:013d}" for p in range(1, 6)]
+    assert len(http.urls) == 5
+    assert all("/updateInfo/finance?" in u for u in http.urls)
+
+
+def test_canonical_search_query_normalizes_equivalent_searches():
+    a = build_search_params({"name": "A&B 商事", "business_item": "206,101"}, page=1, limit=1000)
+    b = build_search_params(
+        {"business_item": "101,206,101", "name": "A&B 商事"}, page=1, limit=1000
+    )
+    assert canonical_search_query(a) == canonical_search_query(b)
+    assert canonical_search_query(a) == ("business_item=101%2C206&name=A%26B%20%E5%95%86%E4%BA%8B")
+    assert "page=2" in canonical_search_query(build_search_params({}, page=2, limit=1000))
+
+
+def test_search_results_are_cached_by_canonical_query():
+    http = CountingHttp({"hojin-infos": [{"corporate_number": "1234567890123", "name": "x"}]})
+    service = GBizInfoService(http_client=http)
+    service.search_companies(corporate_type="302,301")
+    service.search_companies(corporate_type="301,302", page=1, limit=1000)
+    assert len(http.urls) == 1
+    assert http.urls[0].endswith("?corporate_type=301%2C302")
+    stats = service.search_cache_stats()
+    assert stats is not None and stats.hits == 1
+
+
+def test_split_search_options_partitions_disjointly():
+    by_type = split_search_options({"name": "x"})
+    assert by_type is not None and len(by_type) == 10
+    assert {o["corporate_type"] for o in by_type} >= {"301", "302"}
+    by_pref = split_search_options({"corporate_type": "301"})
+    assert by_pref is not None and len(by_pref) == 47 and by_pref[12]["prefecture"] == "13"
+    bisected = split_search_options(
+        {
+            "corporate_type": "301",
+            "prefecture": "13",
+            "capital_stock_from": 0,
+            "capital_stock_to": 9,
+        }
+    )
+    assert bisected is not None
+    assert [(o["capital_stock_from"], o["capital_stock_to"]) for o in bisected] == [(0, 4), (5, 9)]
+    open_ended = split_search_options(
+        {"corporate_type": "301", "prefecture": "13", "employee_number_from": 10}
+    )
+    assert open_ended is not None
+    assert [(o["employee_number_from"], o["employee_number_to"]) for o in open_ended] == [
+        (10, 21),
+        (22, None),
+    ]
+    assert split_search_options({"corporate_type": "301", "prefecture": "13"}) is None
+
+
+def test_split_search_options_keeps_entities_without_prefecture():
+    # foreign companies may have no prefecture: bisect a range instead, or give up
+    assert split_search_options({"corporate_type": "401"}) is None
+    foreign = split_search_options({"corporate_type": "401", "capital_stock_from": 0})
+    assert foreign is not None and all("prefecture" not in o for o in foreign)
+
+
+def _ranges(parts, prefix="net_income_loss"):
+    return [(o.get(f"{prefix}_from"), o.get(f"{prefix}_to")) for o in parts]
+
+
+@pytest.mark.parametrize(
+    "bounds, expected",
+    [
+        ((0, 1), [(0, 0), (1, 1)]),
+        ((None, 100), [(0, 50), (51, 100)]),
+        ((0, None), [(0, 1), (2, None)]),
+        ((3, None), [(3, 7), (8, None)]),
+    ],
+)
+def test_split_search_options_bisects_open_ranges_from_zero(bounds, expected):
+    low, high = bounds
+    options = {"corporate_type": "301", "prefecture": "13"}
+    options.update(
+        {
+            k: v
+            for k, v in (("net_income_loss_from", low), ("net_income_loss_to", high))
+            if v is not None
+        }
+    )
+    parts = split_search_options(options)
+    assert parts is not None and _ranges(parts) == expected
+    assert all(v is None or v >= 0 for part in parts for v in part.values() if isinstance(v, int))
+
+
+def test_split_search_options_cannot_split_single_value_range():
+    options = {"corporate_type": "301", "prefecture": "13", "net_income_loss_to": 0}
+    assert split_search_options(options) is None
+
+
+class PartitionedSearchHttp:
+    """Reports more results than paging can reach unless a corporate_type is given."""
+
+    def __init__(self) -> None:
+        self.urls: list[str] = []
+        self._lock = threading.Lock()
+
+    def request(self, url: str, options: Any | None = None) -> Any:  # noqa: ARG002
+        with self._lock:
+            self.urls.append(url)
+        if "corporate_type=" not in url:
+            return {
+                "hojin-infos": [{"corporate_number": "3000000000001", "name": "a"}],
+                "total": 60000,
+            }
+        if "corporate_type=301" in url:
+            items = [
+                {"corporate_number": "3000000000001", "name": "a"},
+                {"corporate_number": "3000000000002", "name": "b"},
+            ]
+            return {"hojin-infos": items, "total": 2}
+        return {"hojin-infos": [], "total": 0}
+
+
+def test_iter_search_exhaustive_splits_capped_search_and_dedupes():
+    http = PartitionedSearchHttp()
+    service = GBizInfoService(http_client=http)
+    numbers = [c.corporate_number for c in service.iter_search_exhaustive(name="x", max_workers=3)]
+    assert sorted(numbers) == ["3000000000001", "3000000000002"]
+    # one probe plus one sub-search per corporate type
+    assert len(http.urls) == 1 + 10
+    assert all("limit=5000" in u for u in http.urls)
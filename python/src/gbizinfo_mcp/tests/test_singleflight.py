@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gbizinfo_mcp.services.singleflight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    canonical_request_key,
+)
+
+
+def test_canonical_request_key_ignores_param_order():
+    a = canonical_request_key("get", "https://example.com/v1/hojin?b=2&a=1")
+    b = canonical_request_key("GET", "https://example.com/v1/hojin?a=1&b=2#frag")
+    assert a == b
+    assert a != canonical_request_key("GET", "https://example.com/v1/hojin?a=1&b=3")
+
+
+def test_single_flight_shares_one_call_between_threads():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn() -> dict:
+        calls.append(1)
+        release.wait(timeout=5)
+        return {"ok": True}
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, "k", fn) for _ in range(4)]
+        # let the followers join before the leader returns
+        while flight.coalesced < 3:
+            threading.Event().wait(0.01)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.coalesced == 3
+
+
+def test_single_flight_propagates_errors_and_forgets_key():
+    flight = SingleFlight()
+
+    def boom() -> None:
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("k", boom)
+    # a finished call is not reused
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.coalesced == 0
+
+
+def test_async_single_flight_shares_one_call():
+    calls = []
+
+    async def fn() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def run() -> None:
+        flight = AsyncSingleFlight()
+        results = await asyncio.gather(*(flight.do("k", fn) for _ in range(5)))
+        assert results == ["done"] * 5
+        assert flight.coalesced == 4
+        assert await flight.do("k", fn) == "done"
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_async_single_flight_survives_waiter_cancellation():
+    async def fn() -> str:
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def run() -> None:
+        flight = AsyncSingleFlight()
+        first = asyncio.ensure_future(flight.do("k", fn))
+        second = asyncio.ensure_future(flight.do("k", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "done"
+
+    asyncio.run(run())
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+_PROBE = """
+import json, sys
+import gbizinfo_mcp.mcp_fastmcp
+print(json.dumps(sorted(m for m in sys.modules if m.startswith(("gbizinfo_mcp", "requests")))))
+"""
+
+
+def test_import_does_not_build_settings_or_service():
+    # no API token: settings must not be validated at import time
+    env = {k: v for k, v in os.environ.items() if k.upper() != "GBIZINFO_API_TOKEN"}
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    loaded = json.loads(out.strip().splitlines()[-1])
+    assert "gbizinfo_mcp.services.async_gbizinfo_service" not in loaded
+    assert "gbizinfo_mcp.model.hojin_info" not in loaded
+    assert "requests" not in loaded
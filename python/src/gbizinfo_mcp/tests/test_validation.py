@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+from typing import Any
+
 import pytest
 
+from gbizinfo_mcp.errors import InputValidationError
 from gbizinfo_mcp.model.search import CompanySearchQuery
+from gbizinfo_mcp.services.gbizinfo_service import GBizInfoService
+from gbizinfo_mcp.utils.jis import city_code_error, city_of_location
+from gbizinfo_mcp.utils.preflight import PreflightError, check_search, check_update_range
 from gbizinfo_mcp.utils.validation import validate_corporate_number, validate_yyyymmdd
 
 
 def test_validate_corporate_number_ok():
-    assert validate_corporate_number("1234567890123") == "1234567890123"
+    assert validate_corporate_number("7000012050002") == "7000012050002"  # 国税庁
+    assert validate_corporate_number("1180301018771") == "1180301018771"
 
 
 def test_validate_corporate_number_ng():
     with pytest.raises(ValueError):
         validate_corporate_number("123")
+    with pytest.raises(ValueError, match="check digit"):
+        validate_corporate_number("1234567890123")
 
 
 def test_validate_yyyymmdd_ok():
@@ -22,6 +31,8 @@ def test_validate_yyyymmdd_ok():
 def test_validate_yyyymmdd_ng():
     with pytest.raises(ValueError):
         validate_yyyymmdd("2025-01-01")
+    with pytest.raises(ValueError):
+        validate_yyyymmdd("20250230")
 
 
 def test_company_search_query_page_limit_bounds():
@@ -39,3 +50,89 @@ def test_company_search_query_page_limit_bounds():
 def test_company_search_query_city_requires_prefecture():
     with pytest.raises(Exception):  # noqa: B017
         CompanySearchQuery(city="123")
+
+
+def test_company_search_query_csv_filters():
+    q = CompanySearchQuery(corporate_type="301,305", unified_qualification="A,B")
+    assert q.corporate_type == "301,305"
+    with pytest.raises(ValueError):
+        CompanySearchQuery(corporate_type="301,x")
+    with pytest.raises(ValueError):
+        CompanySearchQuery(unified_qualification="A,E")
+
+
+def test_check_search_reports_every_problem():
+    issues = check_search(
+        {
+            "corporate_number": "1234567890123",
+            "prefecture": "48",
+            "city": "101",
+            "capital_stock_from": 10,
+            "capital_stock_to": 5,
+            "employee_number_from": 1,
+            "employee_number_to": 1,
+            "establishment_from": "2001-02-30",
+            "establishment_to": "2000-01-01",
+        }
+    )
+    assert [i.field for i in issues] == [
+        "corporate_number",
+        "prefecture",  # the city is not checked against an unknown prefecture
+        "establishment_from",
+        "capital_stock_from",
+    ]
+    assert check_search({"prefecture": "13", "city": "101", "net_sales_from": 0}) == []
+    # names are passed through, as CompanySearchQuery accepts them
+    assert check_search({"prefecture": "大阪府", "city": "大阪市北区"}) == []
+    assert check_search({"prefecture": "27", "city": "大阪市北区"}) == []
+
+
+def test_city_code_structure():
+    assert city_code_error("13", "101") is None  # 千代田区
+    assert city_code_error("02", "201") is None  # 青森市
+    assert city_code_error("02", "101") is not None  # no wards in 青森県
+    assert city_code_error("13", "000") is not None
+    assert city_code_error("13", "1") is not None
+
+
+def test_check_update_range():
+    assert check_update_range("20240101", "20240131") == []
+    assert [i.field for i in check_update_range("20240131", "20240101")] == ["from"]
+    assert [i.field for i in check_update_range("20240132", "2024-02-01")] == ["from", "to"]
+
+
+def test_service_rejects_impossible_requests_before_any_request():
+    class NoNetwork:
+        def request(self, url: str, options: Any = None) -> Any:  # noqa: ARG002
+            raise AssertionError(f"unexpected request to {url}")
+
+    service = GBizInfoService(http_client=NoNetwork())  # type: ignore[arg-type]
+    with pytest.raises(PreflightError) as info:
+        service.search_companies(prefecture="99", net_sales_from=2, net_sales_to=1)
+    assert info.value.details() == [
+        {"field": "prefecture", "message": "99 is not a JIS X 0401 code"},
+        {"field": "net_sales_from", "message": "net_sales_from must be <= net_sales_to"},
+    ]
+    assert isinstance(info.value, InputValidationError)
+    with pytest.raises(PreflightError):
+        service.get_update_info(from_="20240201", to="20240101")
+    with pytest.raises(PreflightError):
+        next(service.iter_search_exhaustive(city="101"))
+
+
+@pytest.mark.parametrize(
+    "location, city",
+    [
+        ("東京都千代田区丸の内1-1", "千代田区"),
+        ("神奈川県横浜市中区本町1", "横浜市中区"),
+        ("三重県四日市市諏訪町1", "四日市市"),
+        ("東京都東村山市本町", "東村山市"),
+        ("北海道余市郡余市町黒川町", "余市郡余市町"),
+        ("奈良県大和郡山市北郡山町", "大和郡山市"),
+        ("東京都新宿区市谷本村町", "新宿区"),
+        ("東京都大島町元町", "大島町"),
+        ("Somewhere 1-1", None),
+    ],
+)
+def test_city_of_location(location, city):
+    assert city_of_location(location) == city
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Optional
+
+# JIS X 0401 prefecture codes
+PREFECTURES: Dict[str, str] = {
+    "01": "北海道",
+    "02": "青森県",
+    "03": "岩手県",
+    "04": "宮城県",
+    "05": "秋田県",
+    "06": "山形県",
+    "07": "福島県",
+    "08": "茨城県",
+    "09": "栃木県",
+    "10": "群馬県",
+    "11": "埼玉県",
+    "12": "千葉県",
+    "13": "東京都",
+    "14": "神奈川県",
+    "15": "新潟県",
+    "16": "富山県",
+    "17": "石川県",
+    "18": "福井県",
+    "19": "山梨県",
+    "20": "長野県",
+    "21": "岐阜県",
+    "22": "静岡県",
+    "23": "愛知県",
+    "24": "三重県",
+    "25": "滋賀県",
+    "26": "京都府",
+    "27": "大阪府",
+    "28": "兵庫県",
+    "29": "奈良県",
+    "30": "和歌山県",
+    "31": "鳥取県",
+    "32": "島根県",
+    "33": "岡山県",
+    "34": "広島県",
+    "35": "山口県",
+    "36": "徳島県",
+    "37": "香川県",
+    "38": "愛媛県",
+    "39": "高知県",
+    "40": "福岡県",
+    "41": "佐賀県",
+    "42": "長崎県",
+    "43": "熊本県",
+    "44": "大分県",
+    "45": "宮崎県",
+    "46": "鹿児島県",
+    "47": "沖縄県",
+}
+
+# Prefectures whose JIS X 0402 municipality codes include 1xx: the wards of
+# designated cities (政令指定都市) and Tokyo's special wards (特別区)
+WARD_PREFECTURES = frozenset(
+    ("01", "04", "11", "12", "13", "14", "15", "22", "23", "26", "27", "28", "33", "34", "40", "43")
+)
+
+
+def city_code_error(prefecture: str, city: str) -> Optional[str]:
+    """Why ``city`` cannot be a JIS X 0402 municipality of ``prefecture``, or ``None``.
+
+    Checks the structure of the 3-digit code (100-199 wards, 201- cities,
+    then towns and villages) rather than a list of every municipality.
+    """
+    if len(city) != 3 or not city.isdigit():
+        return "city must be a 3-digit JIS X 0402 code"
+    if city < "100" or "199" < city < "201":
+        return f"{city} is not a municipality code"
+    if city < "200" and prefecture not in WARD_PREFECTURES:
+        return f"prefecture {prefecture} has no wards (1xx codes)"
+    return None
+
+
+# 政令指定都市: their addresses continue with the ward
+_DESIGNATED_CITIES = (
+    "札幌",
+    "仙台",
+    "さいたま",
+    "千葉",
+    "横浜",
+    "川崎",
+    "相模原",
+    "新潟",
+    "静岡",
+    "浜松",
+    "名古屋",
+    "京都",
+    "大阪",
+    "堺",
+    "神戸",
+    "岡山",
+    "広島",
+    "北九州",
+    "福岡",
+    "熊本",
+)
+
+# municipality at the start of an address without its prefecture, tried in order:
+# a designated city with its ward, names the general rules would cut short, a
+# town or village of a 郡, a city or Tokyo ward, then an island town or village
+_CITY_PATTERN = re.compile(
+    "(?:" + "|".join(_DESIGNATED_CITIES) + ")市.{1,4}?区"
+    "|(?:四日|廿日|野々)市市|大和郡山市"
+    "|(?:[^市区]|市(?=郡)){1,5}?郡(?:大町町|[^区]{1,4}?[町村])"
+    "|.{1,6}?[市区]"
+    "|.{1,6}?[町村]"
+)
+
+
+def city_of_location(location: Optional[str]) -> Optional[str]:
+    """Return the municipality name (e.g. ``横浜市中区``) of an address, if it can be found.
+
+    Best effort from the address text alone; payloads carry no JIS X 0402 code.
+    """
+    prefecture = prefecture_of_location(location)
+    if location is None or prefecture is None:
+        return None
+    match = _CITY_PATTERN.match(location.strip(), len(PREFECTURES[prefecture]))
+    return match.group(0) if match else None
+
+
+def prefecture_of_location(location: Optional[str]) -> Optional[str]:
+    """Return the JIS X 0401 code of the prefecture an address starts with, if any."""
+    if not location:
+        return None
+    text = location.strip()
+    for code, name in PREFECTURES.items():
+        if text.startswith(name):
+            return code
+    return None
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Tuple
+
+from ..errors import InputValidationError
+from .jis import PREFECTURES, city_code_error
+from .validation import validate_corporate_number, validate_iso_date, validate_yyyymmdd
+
+# search filters sent as <name>_from / <name>_to
+RANGE_FILTERS: Tuple[str, ...] = (
+    "net_sales",
+    "net_income_loss",
+    "total_assets",
+    "operating_revenue1",
+    "operating_revenue2",
+    "ordinary_income_loss",
+    "ordinary_income",
+    "capital_stock",
+    "employee_number",
+    "establishment",
+)
+
+
+@dataclass(frozen=True)
+class PreflightIssue:
+    field: str
+    message: str
+
+
+class PreflightError(InputValidationError):
+    """A request the API would reject, found without contacting it.
+
+    ``issues`` lists every problem, not only the first.
+    """
+
+    def __init__(self, issues: List[PreflightIssue]) -> None:
+        super().__init__(
+            "; ".join(f"{i.field}: {i.message}" for i in issues), field=issues[0].field
+        )
+        self.issues = issues
+
+    def details(self) -> List[Dict[str, str]]:
+        return [{"field": i.field, "message": i.message} for i in self.issues]
+
+
+def check_search(options: Mapping[str, Any]) -> List[PreflightIssue]:
+    """Problems of ``search_companies`` keyword arguments (empty when the search is possible)."""
+    issues: List[PreflightIssue] = []
+    number = options.get("corporate_number")
+    if number:
+        try:
+            validate_corporate_number(number)
+        except ValueError as e:
+            issues.append(PreflightIssue("corporate_number", str(e)))
+    # names (e.g. 大阪府, 北区) are accepted as the API takes them; codes are checked
+    prefecture = options.get("prefecture")
+    if prefecture and prefecture.isdigit() and prefecture not in PREFECTURES:
+        issues.append(PreflightIssue("prefecture", f"{prefecture} is not a JIS X 0401 code"))
+    city = options.get("city")
+    if city:
+        if not prefecture:
+            issues.append(PreflightIssue("city", "city requires prefecture"))
+        elif prefecture in PREFECTURES and city.isdigit():
+            error = city_code_error(prefecture, city)
+            if error is not None:
+                issues.append(PreflightIssue("city", error))
+    for name in ("establishment_from", "establishment_to"):
+        value = options.get(name)
+        if value:
+            try:
+                validate_iso_date(value)
+            except ValueError as e:
+                issues.append(PreflightIssue(name, str(e)))
+    failed = {i.field for i in issues}
+    for name in RANGE_FILTERS:
+        low, high = options.get(f"{name}_from"), options.get(f"{name}_to")
+        if low is None or high is None or low == "" or high == "":
+            continue
+        if f"{name}_from" in failed or f"{name}_to" in failed:
+            continue
+        if low > high:
+            issues.append(PreflightIssue(f"{name}_from", f"{name}_from must be <= {name}_to"))
+    return issues
+
+
+def check_update_range(from_: str, to: str) -> List[PreflightIssue]:
+    """Problems of an updateInfo ``from`` / ``to`` pair (``yyyyMMdd``, in order)."""
+    issues: List[PreflightIssue] = []
+    for name, value in (("from", from_), ("to", to)):
+        try:
+            validate_yyyymmdd(value)
+        except ValueError as e:
+            issues.append(PreflightIssue(name, str(e)))
+    if not issues and from_ > to:
+        issues.append(PreflightIssue("from", "from must be <= to"))
+    return issues
+
+
+def preflight(issues: List[PreflightIssue]) -> None:
+    """Raise ``PreflightError`` if there are any issues."""
+    if issues:
+        raise PreflightError(issues)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+import typing
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Type
+
+from pydantic import BaseModel
+
+# field name -> nested projection; an empty dict keeps the whole value
+FieldTree = Dict[str, "FieldTree"]
+
+
+@dataclass(frozen=True)
+class ProjectionStats:
+    projections: int
+    full_bytes: int
+    projected_bytes: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.full_bytes - self.projected_bytes
+
+
+class ProjectionMetrics:
+    """Thread-safe running totals of payload sizes before and after projection.
+
+    Sizing a payload serializes it, which is the cost projection saves, so only
+    one projection in ``sample_every`` is measured with ``sizeof``; the byte
+    totals are extrapolated from those samples.
+    """
+
+    def __init__(self, sizeof: Callable[[Any], int], sample_every: int = 16) -> None:
+        self._lock = threading.Lock()
+        self._sizeof = sizeof
+        self._sample_every = max(1, sample_every)
+        self._projections = 0
+        self._sampled = 0
+        self._full_bytes = 0
+        self._projected_bytes = 0
+
+    def record(self, full: Any, projected: Any) -> None:
+        with self._lock:
+            self._projections += 1
+            if (self._projections - 1) % self._sample_every:
+                return
+        full_bytes, projected_bytes = self._sizeof(full), self._sizeof(projected)
+        with self._lock:
+            self._sampled += 1
+            self._full_bytes += full_bytes
+            self._projected_bytes += projected_bytes
+
+    def stats(self) -> ProjectionStats:
+        with self._lock:
+            scale = self._projections / self._sampled if self._sampled else 0.0
+            return ProjectionStats(
+                self._projections,
+                round(self._full_bytes * scale),
+                round(self._projected_bytes * scale),
+            )
+
+
+def parse_fields(fields: Iterable[str]) -> FieldTree:
+    """Turn dotted paths such as ``finance.management_index.net_sales`` into a ``FieldTree``.
+
+    A path that selects a whole value wins over deeper paths below it.
+    """
+    tree: FieldTree = {}
+    for path in fields:
+        parts = [p.strip() for p in str(path).split(".")]
+        if not all(parts):
+            raise ValueError(f"invalid field path: {path!r}")
+        node = tree
+        for i, part in enumerate(parts):
+            last = i == len(parts) - 1
+            if part in node and not node[part]:
+                break  # already selected whole
+            if last:
+                node[part] = {}
+            else:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def _nested_model(annotation: Any) -> Optional[Type[BaseModel]]:
+    # unwrap Optional[...] / List[...] down to a model class, if there is one
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        model = _nested_model(arg)
+        if model is not None:
+            return model
+    return None
+
+
+def check_fields(model: Type[BaseModel], tree: FieldTree, prefix: str = "") -> None:
+    """Raise ``ValueError`` for paths that name no field of ``model`` (or its sub-models)."""
+    for name, sub in tree.items():
+        field = model.model_fields.get(name)
+        if field is None:
+            raise ValueError(f"unknown field: {prefix}{name}")
+        if sub:
+            nested = _nested_model(field.annotation)
+            if nested is None:
+                raise ValueError(f"field has no sub-fields: {prefix}{name}")
+            check_fields(nested, sub, f"{prefix}{name}.")
+
+
+def project(value: Any, tree: FieldTree) -> Any:
+    """Keep only the selected fields of a JSON-like value; lists are projected per element."""
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [project(v, tree) for v in value]
+    if isinstance(value, dict):
+        return {name: project(value[name], sub) for name, sub in tree.items() if name in value}
+    return value
@@ -1,18 +1,48 @@
 from __future__ import annotations
 
 import re
+from datetime import date
 
 _CN_PATTERN = re.compile(r"^[0-9]{13}$")
 _YMD_PATTERN = re.compile(r"^[0-9]{8}$")
+_ISO_DATE_PATTERN = re.compile(r"^[0-9]{4}-[0-9]{2}-[0-9]{2}$")
+
+
+def corporate_number_check_digit(body: str) -> int:
+    """Check digit of the last 12 digits of a 法人番号.
+
+    9 - (sum of the digits weighted 1, 2, 1, 2, ... from the right) mod 9,
+    per the 国税庁 specification; the check digit is the first of the 13.
+    """
+    total = sum(int(d) for d in body[-1::-2]) + 2 * sum(int(d) for d in body[-2::-2])
+    return 9 - total % 9
 
 
 def validate_corporate_number(value: str) -> str:
     if not isinstance(value, str) or not _CN_PATTERN.fullmatch(value):
         raise ValueError("corporate_number must be 13 digits")
+    if int(value[0]) != corporate_number_check_digit(value[1:]):
+        raise ValueError("corporate_number has an invalid check digit")
     return value
 
 
 def validate_yyyymmdd(value: str) -> str:
     if not isinstance(value, str) or not _YMD_PATTERN.fullmatch(value):
         raise ValueError("date must be yyyyMMdd (8 digits)")
+    _calendar_date(int(value[:4]), int(value[4:6]), int(value[6:]))
+    return value
+
+
+def validate_iso_date(value: str) -> str:
+    """``YYYY-MM-DD`` with a real calendar date."""
+    if not isinstance(value, str) or not _ISO_DATE_PATTERN.fullmatch(value):
+        raise ValueError("date must be YYYY-MM-DD")
+    _calendar_date(int(value[:4]), int(value[5:7]), int(value[8:]))
     return value
+
+
+def _calendar_date(year: int, month: int, day: int) -> date:
+    try:
+        return date(year, month, day)
+    except ValueError:
+        raise ValueError("date does not exist") from None